@@ -0,0 +1,130 @@
+import hashlib
+import inspect
+import math
+from typing import Optional
+
+from jose import JWTError, jwt
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import ADMISSION_REJECTED_TOTAL, PIPELINE_JOBS_QUEUED
+from app.utils.rate_limit import KeyedTokenBuckets, RedisTokenBuckets
+
+logger = get_logger("admission")
+
+# Endpoints that enqueue pipeline work; they get the ingest limits and load shedding
+INGEST_PATHS = {
+    f"{settings.API_V1_STR}/orchestrator/webhook/ingest",
+    f"{settings.API_V1_STR}/orchestrator/upload",
+    f"{settings.API_V1_STR}/orchestrator/bulk",
+}
+# Called by mail clients and providers rather than our users
+EXEMPT_PREFIXES = (
+    f"{settings.API_V1_STR}/track/",
+    f"{settings.API_V1_STR}/webhooks/",
+)
+
+
+class PipelineBacklog:
+    """Pipeline jobs accepted by this worker and not yet finished."""
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self) -> None:
+        self.value += 1
+        PIPELINE_JOBS_QUEUED.inc()
+
+    def dec(self) -> None:
+        self.value -= 1
+        PIPELINE_JOBS_QUEUED.dec()
+
+
+pipeline_backlog = PipelineBacklog()
+
+
+def build_limiter(per_minute: int, burst: Optional[int] = None, prefix: str = "ratelimit"):
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisTokenBuckets(settings.REDIS_URL, per_minute, burst, prefix=prefix)
+    return KeyedTokenBuckets(per_minute, burst)
+
+
+def client_key(scope: Scope) -> str:
+    """Rate-limit identity: the signed-in user, a known API key, else the client IP."""
+    headers = Headers(scope=scope)
+    authorization = headers.get("authorization", "")
+    if authorization[:7].lower() == "bearer ":
+        try:
+            subject = jwt.decode(
+                authorization[7:], settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            ).get("sub")
+        except JWTError:
+            subject = None
+        if subject:
+            return f"user:{subject}"
+    api_key = headers.get("x-api-key")
+    if api_key and api_key in settings.RATE_LIMIT_API_KEYS:
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class AdmissionMiddleware:
+    """Per-client token buckets for the API plus load shedding for pipeline ingestion.
+
+    Ingest endpoints get their own, smaller buckets, and are refused outright
+    while this worker's pipeline backlog is at ``PIPELINE_MAX_BACKLOG`` so
+    queueing delay stays bounded under overload. Rejections are 429 with a
+    ``Retry-After``. If the Redis backend is unreachable requests are let
+    through rather than failing the API.
+    """
+
+    def __init__(self, app: ASGIApp, api_limiter=None, ingest_limiter=None, max_backlog: Optional[int] = None):
+        self.app = app
+        self.api_limiter = api_limiter or build_limiter(settings.API_RATE_LIMIT_PER_MINUTE)
+        self.ingest_limiter = ingest_limiter or build_limiter(
+            settings.INGEST_RATE_LIMIT_PER_MINUTE, settings.INGEST_RATE_LIMIT_BURST
+        )
+        self.max_backlog = settings.PIPELINE_MAX_BACKLOG if max_backlog is None else max_backlog
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or not path.startswith(settings.API_V1_STR)
+            or path.startswith(EXEMPT_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        ingest = path in INGEST_PATHS
+        if ingest and self.max_backlog and pipeline_backlog.value >= self.max_backlog:
+            await self._reject(scope, receive, send, "backlog", settings.PIPELINE_SHED_RETRY_AFTER_SECONDS)
+            return
+
+        limiter = self.ingest_limiter if ingest else self.api_limiter
+        try:
+            wait = limiter.try_acquire(client_key(scope))
+            if inspect.isawaitable(wait):
+                wait = await wait
+        except Exception:
+            logger.warning("Rate limiter unavailable, admitting request", path=path)
+            wait = 0.0
+        if wait > 0:
+            await self._reject(scope, receive, send, "rate_limit", wait)
+            return
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, reason: str, retry_after: float) -> None:
+        ADMISSION_REJECTED_TOTAL.labels(reason).inc()
+        detail = "Too many requests" if reason == "rate_limit" else "Pipeline is busy, retry later"
+        response = JSONResponse(
+            {"detail": detail},
+            status_code=429,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+        await response(scope, receive, send)
@@ -10,6 +10,18 @@ class Settings(BaseSettings):
     
     DATABASE_URL: str
     SQLALCHEMY_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Read-only endpoints use these replicas while their lag is within the limit
+    DATABASE_REPLICA_URLS: List[str] = []
+    DB_REPLICA_POOL_SIZE: int = 5
+    DB_REPLICA_MAX_OVERFLOW: int = 10
+    DB_REPLICA_POOL_RECYCLE_SECONDS: int = 1800
+    DB_REPLICA_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_LAG_CHECK_SECONDS: float = 5.0
     
     AUTH0_DOMAIN: str
     AUTH0_CLIENT_ID: str
@@ -27,26 +39,146 @@ class Settings(BaseSettings):
     
     HUNTER_IO_API_KEY: str = ""
     SENDGRID_API_KEY: str = ""
+    # Shared secret expected as ?token= on provider event webhooks (disabled when empty)
+    SENDGRID_WEBHOOK_TOKEN: str = ""
     OPENAI_API_KEY: str = ""
     # Hugging Face Inference API
     HF_MCP_URL: str = "https://api-inference.huggingface.co/models"
     HF_MCP_TOKEN: str = ""
     HF_MODEL_ID: str = "mistralai/Mistral-7B-Instruct-v0.3"
+    # Long resumes are split into section-aware chunks extracted in parallel
+    HF_CHUNK_MAX_TOKENS: int = 750
+    HF_MAX_CHUNKS: int = 4
+    HF_CHUNK_CONCURRENCY: int = 4
+    # Fail fast to the local fallback after consecutive 429/5xx/network errors (0 disables)
+    HF_BREAKER_FAILURE_THRESHOLD: int = 5
+    HF_BREAKER_RECOVERY_SECONDS: float = 30.0
+    HF_BREAKER_HALF_OPEN_CALLS: int = 1
+    # Send a second request when a call outlives this percentile of recent latencies
+    HF_HEDGE_ENABLED: bool = False
+    HF_HEDGE_PERCENTILE: float = 95.0
+    HF_HEDGE_MIN_SAMPLES: int = 20
+
+    # Job ranking: scrape a wider pool, keep the best matches above a floor
+    RANKING_CANDIDATE_POOL: int = 50
+    RANKING_TOP_K: int = 3
+    RANKING_MIN_SCORE: float = 0.1
+    RANKING_HASH_FEATURES: int = 2 ** 18
+
+    # Applications drafted and sent concurrently per pipeline job
+    APPLY_CONCURRENCY: int = 3
+    APPLY_TIMEOUT_SECONDS: float = 60.0
 
     # Rate limiting and scraping
     RATE_LIMIT_PER_MINUTE: int = 60
     SCRAPER_CONCURRENCY: int = 3
     PROXY_LIST: List[str] = []
+    LINKEDIN_JOBS_SEARCH_URL: str = "https://www.linkedin.com/jobs/search"
+    # Every extracted position is searched across these locations and result pages
+    SEARCH_LOCATIONS: List[str] = []
+    SEARCH_PAGES: int = 1
+    SEARCH_MAX_URLS: int = 8
 
     # SMTP / Email settings
     SMTP_HOST: str = ""
     SMTP_PORT: int = 587
     SMTP_USER: str = ""
     SMTP_PASSWORD: str = ""
+    SMTP_START_TLS: bool = True
     EMAIL_FROM: str = ""
+    # "smtp" or "sendgrid" (HTTP batch API)
+    EMAIL_TRANSPORT: str = "smtp"
+    SENDGRID_API_URL: str = "https://api.sendgrid.com/v3/mail/send"
+    SENDGRID_BATCH_SIZE: int = 1000
+
+    # Outbox dispatcher for pending email_logs
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_LEASE_SECONDS: int = 300
+    OUTBOX_POLL_INTERVAL_MS: int = 1000
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    # Throughput caps (0 disables); shared by all dispatchers with the redis
+    # RATE_LIMIT_BACKEND, otherwise enforced by each dispatcher process on its own
+    OUTBOX_PER_USER_PER_MINUTE: int = 60
+    OUTBOX_PER_DOMAIN_PER_MINUTE: int = 30
+
+    # Admission control: token buckets per user / API key / client IP (0 disables)
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "redis" (shared)
+    REDIS_URL: str = "redis://localhost:6379/0"
+    # Keys accepted in X-API-Key to give an integration (e.g. n8n) its own bucket
+    RATE_LIMIT_API_KEYS: List[str] = []
+    API_RATE_LIMIT_PER_MINUTE: int = 600
+    INGEST_RATE_LIMIT_PER_MINUTE: int = 30
+    INGEST_RATE_LIMIT_BURST: int = 10
+    # Shed new pipeline jobs once this many are queued on a worker (0 disables)
+    PIPELINE_MAX_BACKLOG: int = 100
+    PIPELINE_SHED_RETRY_AFTER_SECONDS: int = 30
+    # Repeated ingests (same Idempotency-Key, else same text + email) reuse the original job
+    IDEMPOTENCY_BACKEND: str = "memory"  # "memory" (per worker) or "redis" (shared)
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+
+    # Bulk NDJSON / ZIP ingestion
+    BULK_WORKERS: int = 4
+    BULK_QUEUE_SIZE: int = 32
+    BULK_PIPELINE_CONCURRENCY: int = 20
+    BULK_MAX_RECORD_BYTES: int = 5 * 1024 * 1024
+    BULK_MAX_UPLOAD_BYTES: int = 2 * 1024 * 1024 * 1024
+
+    # Pipeline job progress streams (SSE)
+    JOB_EVENTS_POLL_SECONDS: float = 2.0
+    JOB_EVENTS_KEEPALIVE_SECONDS: float = 15.0
+
+    # Campaigns with more contacts + email logs than this are deleted by a batched background purge
+    CAMPAIGN_PURGE_INLINE_ROWS: int = 1000
+    CAMPAIGN_PURGE_BATCH_SIZE: int = 1000
+    CAMPAIGN_PURGE_PAUSE_SECONDS: float = 0.05
+
+    # Email bodies are stored compressed; finished logs older than this move to email_logs_archive
+    EMAIL_BODY_COMPRESS_LEVEL: int = 6
+    EMAIL_ARCHIVE_AFTER_DAYS: int = 90
+    EMAIL_ARCHIVE_BATCH_SIZE: int = 1000
+    EMAIL_ARCHIVE_PAUSE_SECONDS: float = 0.05
+    # Unreferenced bodies younger than this are kept: a launch may be about to commit logs using them
+    EMAIL_BODY_ORPHAN_GRACE_MINUTES: int = 60
+
+    # Per-user suppression list: bounced, replied and already contacted addresses are skipped
+    SUPPRESS_CONTACTED: bool = True
+    SUPPRESSION_BLOOM_CAPACITY: int = 10000
+    SUPPRESSION_BLOOM_ERROR_RATE: float = 0.01
+    SUPPRESSION_CACHE_USERS: int = 1000
+    # How stale a worker's view of entries written by other workers may get
+    SUPPRESSION_REFRESH_SECONDS: float = 30.0
+    # Entries committed this long after their created_at are still picked up by other workers
+    SUPPRESSION_SYNC_OVERLAP_SECONDS: float = 300.0
+
+    # Scheduled campaign launches (leader-elected timer per deployment)
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_LEADER_CHECK_SECONDS: int = 30
+
+    # Open/click tracking (write-behind buffer)
+    TRACKING_FLUSH_INTERVAL_MS: int = 500
+    TRACKING_FLUSH_MAX_EVENTS: int = 1000
+    # While the database is failing: drop new hits beyond this many batches, and retry
+    # flushes with exponential backoff up to the given delay
+    TRACKING_MAX_PENDING_BATCHES: int = 10
+    TRACKING_RETRY_MAX_SECONDS: float = 30.0
+
+    # Compress responses at least this large (bytes); level 1-9
+    GZIP_MIN_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 5
 
     # Logging
     LOG_LEVEL: str = "INFO"
+
+    # Cold start: load lazy imports/templates and open DB connections before serving
+    WARMUP_ON_STARTUP: bool = False
+    WARMUP_DB_CONNECTIONS: int = 2
+
+    # Admin endpoints (disabled while empty) and live profiling
+    ADMIN_API_TOKEN: str = ""
+    PROFILER_SAMPLE_INTERVAL_MS: int = 5
+    # Capture a profile for any request slower than this (0 disables)
+    PROFILER_SLOW_REQUEST_MS: int = 0
+    PROFILER_MAX_CAPTURES: int = 50
     
     class Config:
         env_file = ".env"
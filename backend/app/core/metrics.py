@@ -0,0 +1,204 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional
+from urllib.parse import urlparse
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Buckets sized for the pipeline: sub-millisecond DB waits up to minute-long LLM calls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "referralflow_pipeline_stage_seconds",
+    "Time spent in each process_resume_job stage",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+PIPELINE_JOBS_QUEUED = Gauge(
+    "referralflow_pipeline_jobs_queued",
+    "Resume pipeline jobs accepted but not yet finished",
+    multiprocess_mode="livesum",
+)
+JOB_EVENT_STREAMS = Gauge(
+    "referralflow_job_event_streams",
+    "Open pipeline job progress (SSE) streams",
+    multiprocess_mode="livesum",
+)
+PIPELINE_DUPLICATES_TOTAL = Counter(
+    "referralflow_pipeline_duplicates_total",
+    "Ingest requests answered with an existing job instead of a new run",
+    ["source"],
+)
+SCRAPER_FETCH_SECONDS = Histogram(
+    "referralflow_scraper_fetch_seconds",
+    "Latency of scraper page fetches",
+    ["host", "proxy", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+HF_REQUESTS_TOTAL = Counter(
+    "referralflow_hf_requests_total",
+    "Hugging Face inference calls by HTTP status",
+    ["status"],
+)
+HF_REQUEST_SECONDS = Histogram(
+    "referralflow_hf_request_seconds",
+    "Latency of Hugging Face inference calls",
+    buckets=LATENCY_BUCKETS,
+)
+HF_RETRIES_TOTAL = Counter(
+    "referralflow_hf_retries_total",
+    "Hugging Face inference retries scheduled by tenacity",
+)
+HF_CIRCUIT_STATE = Gauge(
+    "referralflow_hf_circuit_state",
+    "Hugging Face circuit breaker state (0 closed, 1 half-open, 2 open)",
+    multiprocess_mode="max",
+)
+HF_CIRCUIT_REJECTED_TOTAL = Counter(
+    "referralflow_hf_circuit_rejected_total",
+    "Hugging Face calls failed fast because the circuit was open",
+)
+HF_HEDGED_REQUESTS_TOTAL = Counter(
+    "referralflow_hf_hedged_requests_total",
+    "Hedged second requests sent after a slow Hugging Face call",
+)
+SMTP_SEND_SECONDS = Histogram(
+    "referralflow_smtp_send_seconds",
+    "Latency of SMTP sends",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "referralflow_db_pool_checkout_seconds",
+    "Time spent waiting for a pooled DB connection",
+    ["engine"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_IN_USE = Gauge(
+    "referralflow_db_pool_in_use",
+    "DB connections checked out of the pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "referralflow_db_pool_capacity",
+    "DB pool size plus overflow (utilization = in_use / capacity)",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "referralflow_db_replica_lag_seconds",
+    "Replication lag last measured on each read replica",
+    ["engine"],
+    multiprocess_mode="max",
+)
+DB_READ_FALLBACK_TOTAL = Counter(
+    "referralflow_db_read_fallback_total",
+    "Read-only sessions sent to the primary because no replica was usable",
+    ["reason"],
+)
+CAMPAIGN_PURGE_ROWS_TOTAL = Counter(
+    "referralflow_campaign_purge_rows_total",
+    "Rows deleted by batched campaign purges",
+    ["table"],
+)
+EMAIL_LOGS_ARCHIVED_TOTAL = Counter(
+    "referralflow_email_logs_archived_total",
+    "Email logs moved from email_logs to email_logs_archive",
+)
+EMAIL_BODIES_SWEPT_TOTAL = Counter(
+    "referralflow_email_bodies_swept_total",
+    "Stored email bodies deleted because nothing referenced them any more",
+)
+SUPPRESSION_CHECKS_TOTAL = Counter(
+    "referralflow_suppression_checks_total",
+    "Addresses checked against suppression lists (clear = Bloom filter miss)",
+    ["outcome"],
+)
+TRACKING_EVENTS_DROPPED_TOTAL = Counter(
+    "referralflow_tracking_events_dropped_total",
+    "Open/click hits dropped because the tracking buffer was full",
+    ["kind"],
+)
+ADMISSION_REJECTED_TOTAL = Counter(
+    "referralflow_admission_rejected_total",
+    "Requests rejected with 429 by admission control",
+    ["reason"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "referralflow_http_request_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def observe_stage(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PIPELINE_STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+def proxy_label(proxy: Optional[str]) -> str:
+    # Never export proxy credentials as label values
+    if not proxy:
+        return "direct"
+    return urlparse(proxy).hostname or "unknown"
+
+
+def count_hf_retry(retry_state) -> None:
+    HF_RETRIES_TOTAL.inc()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency by route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            ).observe(time.perf_counter() - start)
+
+
+def render_metrics() -> tuple:
+    """Return (body, content type) for the /metrics endpoint."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Aggregate across uvicorn/gunicorn worker processes
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,166 @@
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from typing import Deque, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger("profiling")
+
+PROFILE_REQUEST_HEADER = "x-profile-request"
+ADMIN_TOKEN_HEADER = "x-admin-token"
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    return bool(settings.ADMIN_API_TOKEN) and hmac.compare_digest(token or "", settings.ADMIN_API_TOKEN)
+
+
+def _fold(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class StackSampler:
+    """Samples Python stacks of one thread (or all threads) from a daemon thread.
+
+    Samples are kept as (monotonic time, folded stack) so a window can be
+    cut out later; ``folded()`` renders the collapsed format flamegraph.pl
+    and speedscope read directly.
+    """
+
+    def __init__(self, interval: float, thread_id: Optional[int] = None, maxlen: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.samples: Deque[Tuple[float, str]] = deque(maxlen=maxlen)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            now = time.monotonic()
+            for tid, frame in sys._current_frames().items():
+                if tid == own or (self.thread_id is not None and tid != self.thread_id):
+                    continue
+                self.samples.append((now, _fold(frame)))
+
+    def folded(self, since: float = 0.0, until: float = float("inf")) -> str:
+        counts = Counter(stack for ts, stack in list(self.samples) if since <= ts <= until)
+        return "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
+
+
+class ProfileStore:
+    """Bounded store of captured request profiles, newest last."""
+
+    def __init__(self, max_captures: int):
+        self.max_captures = max_captures
+        self._captures: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def add(self, method: str, path: str, duration_ms: float, folded: str, reason: str,
+            capture_id: Optional[str] = None) -> str:
+        capture_id = capture_id or uuid.uuid4().hex
+        self._captures[capture_id] = {
+            "id": capture_id,
+            "method": method,
+            "path": path,
+            "duration_ms": round(duration_ms, 1),
+            "reason": reason,
+            "captured_at": time.time(),
+            "samples": sum(int(line.rsplit(" ", 1)[1]) for line in folded.splitlines()),
+            "folded": folded,
+        }
+        while len(self._captures) > self.max_captures:
+            self._captures.popitem(last=False)
+        return capture_id
+
+    def get(self, capture_id: str) -> Optional[Dict]:
+        return self._captures.get(capture_id)
+
+    def list(self):
+        return [{k: v for k, v in c.items() if k != "folded"} for c in reversed(self._captures.values())]
+
+
+profile_store = ProfileStore(settings.PROFILER_MAX_CAPTURES)
+
+
+class ProfilingMiddleware:
+    """Profiles requests on demand and captures slow requests automatically.
+
+    Admins can profile a single request by sending ``X-Profile-Request: 1``
+    with their ``X-Admin-Token``; the capture id comes back in
+    ``X-Profile-Id``. With ``PROFILER_SLOW_REQUEST_MS`` set, a background
+    sampler watches the event-loop thread and the window of any request over
+    the threshold is saved. Samples from requests interleaved on the same
+    loop land in the same window, which is usually what you want when
+    chasing a latency spike.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.interval = settings.PROFILER_SAMPLE_INTERVAL_MS / 1000.0
+        self.slow_threshold = settings.PROFILER_SLOW_REQUEST_MS / 1000.0
+        self._background: Optional[StackSampler] = None
+
+    def _background_sampler(self) -> StackSampler:
+        if self._background is None:
+            # Keep roughly a minute of history for the loop thread
+            maxlen = int(60 / self.interval) if self.interval else None
+            self._background = StackSampler(self.interval, threading.get_ident(), maxlen).start()
+        return self._background
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        on_demand = False
+        if settings.ADMIN_API_TOKEN:
+            headers = Headers(scope=scope)
+            on_demand = headers.get(PROFILE_REQUEST_HEADER) == "1" and is_admin_token(headers.get(ADMIN_TOKEN_HEADER))
+        if not on_demand and not self.slow_threshold:
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(self.interval, threading.get_ident()).start() if on_demand else self._background_sampler()
+        capture_id = uuid.uuid4().hex if on_demand else None
+        start = time.monotonic()
+
+        async def send_wrapper(message: Message) -> None:
+            if capture_id and message["type"] == "http.response.start":
+                message.setdefault("headers", []).append((b"x-profile-id", capture_id.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper if on_demand else send)
+        finally:
+            end = time.monotonic()
+            duration = end - start
+            if on_demand:
+                sampler.stop()
+                profile_store.add(scope["method"], scope["path"], duration * 1000, sampler.folded(),
+                                  "on_demand", capture_id=capture_id)
+            elif duration >= self.slow_threshold:
+                profile_store.add(scope["method"], scope["path"], duration * 1000, sampler.folded(start, end), "slow")
+                logger.warning("Slow request profiled", path=scope["path"], duration_ms=round(duration * 1000))
@@ -1,15 +1,180 @@
-from sqlalchemy import create_engine
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import (
+    DB_POOL_CAPACITY,
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_IN_USE,
+    DB_READ_FALLBACK_TOTAL,
+    DB_REPLICA_LAG_SECONDS,
+)
+
+logger = get_logger("database")
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection and how many are in use."""
+
+    engine_name = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(self.engine_name).observe(time.perf_counter() - start)
+            DB_POOL_IN_USE.labels(self.engine_name).set(self.checkedout())
+
+    def _do_return_conn(self, record):
+        try:
+            super()._do_return_conn(record)
+        finally:
+            DB_POOL_IN_USE.labels(self.engine_name).set(self.checkedout())
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.engine_name = self.engine_name
+        return pool
 
-engine = create_engine(
+
+def build_engine(url: str, name: str, pool_size: int, max_overflow: int, pool_recycle: int,
+                 pool_timeout: float) -> Engine:
+    options = {}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle,
+            pool_timeout=pool_timeout,
+        )
+    built = create_engine(url, echo=settings.SQLALCHEMY_ECHO, pool_pre_ping=True, **options)
+    if built.dialect.name == "sqlite":
+        # SQLite ignores ON DELETE CASCADE unless foreign keys are switched on per connection
+        event.listen(built, "connect", lambda connection, _: connection.execute("PRAGMA foreign_keys=ON"))
+    if isinstance(built.pool, InstrumentedQueuePool):
+        built.pool.engine_name = name
+        DB_POOL_CAPACITY.labels(name).set(pool_size + max(max_overflow, 0))
+    return built
+
+
+engine = build_engine(
     settings.DATABASE_URL,
-    echo=settings.SQLALCHEMY_ECHO,
-    pool_pre_ping=True,
+    "primary",
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# pg_last_xact_replay_timestamp() stops advancing while the primary is idle,
+# so a replica that has replayed everything it received counts as caught up
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaRouter:
+    """Picks the engine for a read-only session.
+
+    Replicas are used round-robin while their replication lag is within
+    ``max_lag_seconds``. Lag is measured at most every ``check_seconds``
+    per replica, so routing costs one small query per interval rather than
+    one per request. A lagging or unreachable replica is skipped until its
+    next check; with none usable, reads fall back to the primary.
+    """
+
+    def __init__(self, primary: Engine, replicas: List[Engine], max_lag_seconds: float, check_seconds: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self._order = itertools.cycle(range(len(replicas))) if replicas else None
+        self._checked_at: Dict[int, float] = {}
+        self._usable: Dict[int, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def _measure_lag(self, replica: Engine) -> float:
+        with replica.connect() as connection:
+            return float(connection.execute(REPLICA_LAG_SQL).scalar() or 0)
+
+    def _problem(self, index: int) -> Optional[str]:
+        """None if replica ``index`` may serve reads, else why not ("lagging"/"unavailable")."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at.get(index, float("-inf")) < self.check_seconds:
+                return self._usable[index]
+            # Claim the check so concurrent requests keep using the cached verdict
+            self._checked_at[index] = now
+            self._usable.setdefault(index, None)
+        replica = self.replicas[index]
+        name = getattr(replica.pool, "engine_name", f"replica{index}")
+        try:
+            lag = self._measure_lag(replica)
+        except Exception:
+            logger.opt(exception=True).warning("Replica lag check failed", replica=name)
+            problem = "unavailable"
+        else:
+            DB_REPLICA_LAG_SECONDS.labels(name).set(lag)
+            problem = "lagging" if lag > self.max_lag_seconds else None
+        with self._lock:
+            self._usable[index] = problem
+        return problem
+
+    def pick(self) -> Engine:
+        if not self.replicas:
+            return self.primary
+        reason = None
+        for _ in range(len(self.replicas)):
+            index = next(self._order)
+            problem = self._problem(index)
+            if problem is None:
+                return self.replicas[index]
+            reason = reason or problem
+        DB_READ_FALLBACK_TOTAL.labels(reason).inc()
+        return self.primary
+
+
+replica_engines = [
+    build_engine(
+        url,
+        f"replica{index}",
+        pool_size=settings.DB_REPLICA_POOL_SIZE,
+        max_overflow=settings.DB_REPLICA_MAX_OVERFLOW,
+        pool_recycle=settings.DB_REPLICA_POOL_RECYCLE_SECONDS,
+        pool_timeout=settings.DB_REPLICA_POOL_TIMEOUT_SECONDS,
+    )
+    for index, url in enumerate(settings.DATABASE_REPLICA_URLS)
+]
+
+read_router = ReplicaRouter(
+    engine,
+    replica_engines,
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_seconds=settings.DB_REPLICA_LAG_CHECK_SECONDS,
+)
+
+
+def insert_ignoring_duplicates(db: Session, table, index_elements: List[str]):
+    """INSERT that skips rows conflicting on ``index_elements`` (Postgres or SQLite)."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table).on_conflict_do_nothing(index_elements=index_elements)
+
 
 def get_db() -> Session:
     db = SessionLocal()
@@ -17,3 +182,16 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+def get_read_db() -> Session:
+    """Session for read-only endpoints: a replica when one is fresh enough, else the primary.
+
+    Reads may trail writes by up to ``DB_REPLICA_MAX_LAG_SECONDS``; endpoints
+    that must see their own writes keep using ``get_db``.
+    """
+    db = SessionLocal(bind=read_router.pick())
+    try:
+        yield db
+    finally:
+        db.close()
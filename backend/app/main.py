@@ -1,15 +1,49 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from app.core.admission import AdmissionMiddleware
 from app.core.config import settings
-from app.routes import auth, campaigns, orchestrator
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.profiling import ProfilingMiddleware
+from app.routes import admin, auth, campaigns, orchestrator, suppressions, tracking, webhooks
+from app.services.campaign_purge import resume_purges
+from app.services.linkedin_scraper import close_shared_scraper
+from app.services.scheduler import campaign_scheduler
+from app.services.tracking import tracking_buffer
+from app.services.warmup import warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.WARMUP_ON_STARTUP:
+        await asyncio.to_thread(warm_up, settings.WARMUP_DB_CONNECTIONS)
+    tracking_buffer.start()
+    if settings.SCHEDULER_ENABLED:
+        campaign_scheduler.start()
+    await resume_purges()
+    yield
+    await campaign_scheduler.stop()
+    # Flush buffered open/click events before the worker exits
+    await tracking_buffer.stop()
+    await close_shared_scraper()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
-# Set all CORS enabled origins
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MIN_SIZE, compresslevel=settings.GZIP_COMPRESS_LEVEL)
+
+# Set all CORS enabled origins. Added last so it is outermost: responses
+# produced by the middleware above (e.g. 429s) carry the CORS headers too
 if settings.CORS_ORIGINS:
     app.add_middleware(
         CORSMiddleware,
@@ -26,6 +60,10 @@ import os
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(campaigns.router, prefix=f"{settings.API_V1_STR}/campaigns", tags=["campaigns"])
 app.include_router(orchestrator.router, prefix=f"{settings.API_V1_STR}/orchestrator", tags=["orchestrator"])
+app.include_router(suppressions.router, prefix=f"{settings.API_V1_STR}/suppressions", tags=["suppressions"])
+app.include_router(tracking.router, prefix=f"{settings.API_V1_STR}/track", tags=["tracking"])
+app.include_router(webhooks.router, prefix=f"{settings.API_V1_STR}/webhooks", tags=["webhooks"])
+app.include_router(admin.router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"])
 
 # Define the absolute path to the frontend directory
 frontend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "frontend"))
@@ -43,6 +81,12 @@ def health_check():
     return {"status": "ok", "app_name": settings.PROJECT_NAME}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
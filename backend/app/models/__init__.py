@@ -1,5 +1,8 @@
 from app.models.user import User, UserCredentials
-from app.models.campaign import Campaign, Contact, EmailLog, CampaignStatus
+from app.models.campaign import Campaign, Contact, EmailLog, ArchivedEmailLog, CampaignStatus
+from app.models.email_body import EmailBody
+from app.models.pipeline_job import PipelineJob, PipelineStage
+from app.models.suppression import Suppression
 
 __all__ = [
     "User",
@@ -7,5 +10,10 @@ __all__ = [
     "Campaign",
     "Contact",
     "EmailLog",
+    "ArchivedEmailLog",
+    "EmailBody",
     "CampaignStatus",
+    "PipelineJob",
+    "PipelineStage",
+    "Suppression",
 ]
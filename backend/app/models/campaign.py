@@ -14,6 +14,8 @@ class CampaignStatus(str, enum.Enum):
     ACTIVE = "active"
     PAUSED = "paused"
     COMPLETED = "completed"
+    # Hidden from the API while a background purge deletes it
+    DELETING = "deleting"
 
 
 class Campaign(Base):
@@ -38,15 +40,15 @@ class Campaign(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     user = relationship("User", back_populates="campaigns")
-    contacts = relationship("Contact", back_populates="campaign", cascade="all, delete-orphan")
-    email_logs = relationship("EmailLog", back_populates="campaign", cascade="all, delete-orphan")
+    contacts = relationship("Contact", back_populates="campaign", cascade="all, delete-orphan", passive_deletes=True)
+    email_logs = relationship("EmailLog", back_populates="campaign", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Contact(Base):
     __tablename__ = "contacts"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    campaign_id = Column(UUID(as_uuid=True), ForeignKey("campaigns.id"), nullable=False, index=True)
+    campaign_id = Column(UUID(as_uuid=True), ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False, index=True)
     
     email = Column(String, nullable=False)
     name = Column(String, nullable=True)
@@ -58,27 +60,38 @@ class Contact(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     campaign = relationship("Campaign", back_populates="contacts")
-    email_logs = relationship("EmailLog", back_populates="contact", cascade="all, delete-orphan")
+    email_logs = relationship("EmailLog", back_populates="contact", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class EmailLog(Base):
     __tablename__ = "email_logs"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    campaign_id = Column(UUID(as_uuid=True), ForeignKey("campaigns.id"), nullable=False, index=True)
-    contact_id = Column(UUID(as_uuid=True), ForeignKey("contacts.id"), nullable=False, index=True)
+    campaign_id = Column(UUID(as_uuid=True), ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False, index=True)
+    contact_id = Column(UUID(as_uuid=True), ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)
     
     email_subject = Column(String, nullable=False)
-    email_body = Column(Text, nullable=False)
+    # Bodies live in email_bodies; the inline column only holds rows written
+    # before that, until the archiver moves them out
+    email_body = Column(Text, nullable=True)
+    body_hash = Column(String(64), ForeignKey("email_bodies.hash"), nullable=True)
     sent_at = Column(DateTime, nullable=True)
-    status = Column(String, default="pending")
+    status = Column(String, default="pending", index=True)
+
+    # Outbox dispatch lease; on pending rows lease_expires_at means "not before"
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, default=0)
     
-    sendgrid_message_id = Column(String, nullable=True)
+    sendgrid_message_id = Column(String, nullable=True, index=True)
     is_opened = Column(Boolean, default=False)
     opened_at = Column(DateTime, nullable=True)
+    is_clicked = Column(Boolean, default=False)
+    clicked_at = Column(DateTime, nullable=True)
     is_replied = Column(Boolean, default=False)
     replied_at = Column(DateTime, nullable=True)
     reply_content = Column(Text, nullable=True)
+    reply_hash = Column(String(64), ForeignKey("email_bodies.hash"), nullable=True)
     
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -86,3 +99,37 @@ class EmailLog(Base):
     
     campaign = relationship("Campaign", back_populates="email_logs")
     contact = relationship("Contact", back_populates="email_logs")
+
+
+class ArchivedEmailLog(Base):
+    """Cold copy of an EmailLog that finished sending long ago.
+
+    Same identity and outcome columns, minus the outbox lease; kept out of
+    ``email_logs`` so the hot table stays small for the outbox and tracking.
+    """
+
+    __tablename__ = "email_logs_archive"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    campaign_id = Column(UUID(as_uuid=True), ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False, index=True)
+    contact_id = Column(UUID(as_uuid=True), ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    email_subject = Column(String, nullable=False)
+    body_hash = Column(String(64), ForeignKey("email_bodies.hash"), nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+    status = Column(String, nullable=True)
+    attempts = Column(Integer, default=0)
+    
+    sendgrid_message_id = Column(String, nullable=True)
+    is_opened = Column(Boolean, default=False)
+    opened_at = Column(DateTime, nullable=True)
+    is_clicked = Column(Boolean, default=False)
+    clicked_at = Column(DateTime, nullable=True)
+    is_replied = Column(Boolean, default=False)
+    replied_at = Column(DateTime, nullable=True)
+    reply_hash = Column(String(64), ForeignKey("email_bodies.hash"), nullable=True)
+    
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, index=True)
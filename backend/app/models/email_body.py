@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, DateTime, Integer, LargeBinary, ForeignKey
+from datetime import datetime
+
+from app.db.base import Base
+
+
+class EmailBody(Base):
+    """Compressed email text, stored once per distinct content (sha256 of the text)."""
+
+    __tablename__ = "email_bodies"
+    
+    hash = Column(String(64), primary_key=True)
+    # Body whose text was the zlib preset dictionary; bodies rendered from one
+    # template compress to little more than their template variables
+    base_hash = Column(String(64), ForeignKey("email_bodies.hash"), nullable=True)
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, String, DateTime, Text, JSON, Enum
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+import enum
+
+from app.db.base import Base
+
+
+class PipelineStage(str, enum.Enum):
+    QUEUED = "queued"
+    EXTRACTING = "extracting"
+    SEARCHING = "searching"
+    DRAFTING = "drafting"
+    SENDING = "sending"
+    DONE = "done"
+    FAILED = "failed"
+
+
+TERMINAL_STAGES = (PipelineStage.DONE, PipelineStage.FAILED)
+
+
+class PipelineJob(Base):
+    __tablename__ = "pipeline_jobs"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    email = Column(String, nullable=False, index=True)
+    stage = Column(Enum(PipelineStage), default=PipelineStage.QUEUED, nullable=False)
+    # Stage-specific figures, e.g. jobs found or applications sent
+    detail = Column(JSON, nullable=True)
+    error_message = Column(Text, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+
+from app.db.base import Base
+
+
+class Suppression(Base):
+    """An address or whole domain a user's campaigns must not email (stored hashed)."""
+
+    __tablename__ = "suppressions"
+    __table_args__ = (
+        UniqueConstraint("user_id", "value_hash", name="uq_suppressions_user_value"),
+        Index("ix_suppressions_user_created", "user_id", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # "email" or "domain"; value_hash is the sha256 of the lower-cased value
+    kind = Column(String, nullable=False)
+    value_hash = Column(String(64), nullable=False)
+    # bounce, reply, contacted or manual
+    reason = Column(String, nullable=False)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.profiling import StackSampler, is_admin_token, profile_store
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: str = Header(default="")) -> None:
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required",
+        )
+
+
+@router.post("/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=120),
+    interval_ms: float = Query(5, ge=1, le=1000),
+    all_threads: bool = False,
+):
+    """Sample this worker for ``seconds`` and return folded (flamegraph-ready) stacks."""
+    thread_id = None if all_threads else threading.get_ident()
+    sampler = StackSampler(interval_ms / 1000.0, thread_id).start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop()
+    return sampler.folded()
+
+
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    return profile_store.list()
+
+
+@router.get("/profiles/{capture_id}", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def get_profile(capture_id: str):
+    capture = profile_store.get(capture_id)
+    if not capture:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    return capture["folded"]
@@ -1,23 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.orm import Session
-from typing import List
-from uuid import UUID
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID, uuid4
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.db.database import get_db, get_read_db
 from app.core.security import get_current_user
 from app.schemas.campaign import (
     CampaignCreate,
     CampaignUpdate,
     CampaignResponse,
     ContactCreate,
+    ContactImportResponse,
     ContactResponse,
     EmailLogResponse,
 )
 from app.models.user import User
-from app.models.campaign import Campaign, Contact, EmailLog, CampaignStatus
+from app.models.campaign import Campaign, Contact, EmailLog, ArchivedEmailLog, CampaignStatus
+from app.services.campaign_purge import child_row_count, start_purge
+from app.services.scheduler import campaign_scheduler, publish_schedule_change
+from app.services.suppression import suppression_index
+from app.utils.etag import etag_matches, make_etag, not_modified, set_etag
+from app.utils.serialization import rows_response, schema_columns
 
 router = APIRouter(prefix="/api/v1/campaigns", tags=["campaigns"])
 
+# Campaigns being purged in the background are gone as far as the API is concerned
+NOT_DELETING = Campaign.status.is_distinct_from(CampaignStatus.DELETING)
+
+
+def _count_and_latest(model, column):
+    """Correlated (row count, latest timestamp) of a campaign's child rows."""
+    return (
+        select(func.count(model.id)).where(model.campaign_id == Campaign.id).scalar_subquery(),
+        select(func.max(column)).where(model.campaign_id == Campaign.id).scalar_subquery(),
+    )
+
+
+def _owned_campaign_version(db: Session, campaign_id: UUID, user_id, *columns) -> tuple:
+    """Check ownership and read version columns in one indexed query.
+
+    Cheap enough to run on every poll, so unchanged resources can answer
+    304 before loading or serializing anything.
+    """
+    row = db.execute(
+        select(Campaign.id, *columns).where(
+            Campaign.id == campaign_id,
+            Campaign.user_id == user_id,
+            NOT_DELETING,
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Campaign not found",
+        )
+    return tuple(row)
+
 
 @router.post("/", response_model=CampaignResponse)
 async def create_campaign(
@@ -37,33 +78,42 @@ async def create_campaign(
 
 @router.get("/", response_model=List[CampaignResponse])
 async def get_user_campaigns(
+    if_none_match: Optional[str] = Header(default=None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    campaigns = db.query(Campaign).filter(
-        Campaign.user_id == current_user.id
+    count, latest = db.execute(
+        select(func.count(Campaign.id), func.max(Campaign.updated_at)).where(
+            Campaign.user_id == current_user.id, NOT_DELETING
+        )
+    ).one()
+    etag = make_etag("campaigns", current_user.id, count, latest)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    rows = db.execute(
+        select(*schema_columns(CampaignResponse, Campaign)).where(Campaign.user_id == current_user.id, NOT_DELETING)
     ).all()
-    return campaigns
+    fast_response = rows_response(CampaignResponse, rows)
+    set_etag(fast_response, etag)
+    return fast_response
 
 
 @router.get("/{campaign_id}", response_model=CampaignResponse)
 async def get_campaign(
     campaign_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    campaign = db.query(Campaign).filter(
-        Campaign.id == campaign_id,
-        Campaign.user_id == current_user.id,
-    ).first()
-    
-    if not campaign:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Campaign not found",
-        )
-    
-    return campaign
+    version = _owned_campaign_version(db, campaign_id, current_user.id, Campaign.updated_at)
+    etag = make_etag("campaign", *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+    return db.get(Campaign, campaign_id)
 
 
 @router.put("/{campaign_id}", response_model=CampaignResponse)
@@ -76,6 +126,7 @@ async def update_campaign(
     campaign = db.query(Campaign).filter(
         Campaign.id == campaign_id,
         Campaign.user_id == current_user.id,
+        NOT_DELETING,
     ).first()
     
     if not campaign:
@@ -85,23 +136,35 @@ async def update_campaign(
         )
     
     update_data = campaign_update.dict(exclude_unset=True)
+    if update_data.get("status") == CampaignStatus.DELETING:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use DELETE to delete a campaign",
+        )
     for field, value in update_data.items():
         setattr(campaign, field, value)
     
+    schedule_changed = "status" in update_data or "scheduled_time" in update_data
+    if schedule_changed:
+        publish_schedule_change(db, campaign)
     db.commit()
     db.refresh(campaign)
+    if schedule_changed:
+        campaign_scheduler.on_campaign_changed(campaign.id, campaign.status, campaign.scheduled_time)
     return campaign
 
 
 @router.delete("/{campaign_id}")
 async def delete_campaign(
     campaign_id: UUID,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     campaign = db.query(Campaign).filter(
         Campaign.id == campaign_id,
         Campaign.user_id == current_user.id,
+        NOT_DELETING,
     ).first()
     
     if not campaign:
@@ -110,9 +173,41 @@ async def delete_campaign(
             detail="Campaign not found",
         )
     
-    db.delete(campaign)
+    # Small campaigns go in one statement (contacts and logs via ON DELETE
+    # CASCADE); large ones are hidden now and purged in batches
+    if child_row_count(db, campaign_id) <= settings.CAMPAIGN_PURGE_INLINE_ROWS:
+        db.execute(delete(Campaign).where(Campaign.id == campaign_id))
+        db.commit()
+        return {"status": "success", "message": "Campaign deleted"}
+
+    campaign.status = CampaignStatus.DELETING
+    publish_schedule_change(db, campaign)
     db.commit()
-    return {"status": "success", "message": "Campaign deleted"}
+    campaign_scheduler.on_campaign_changed(campaign_id, CampaignStatus.DELETING, None)
+    start_purge(campaign_id)
+    response.status_code = status.HTTP_202_ACCEPTED
+    # The campaign id is the job handle for GET /{campaign_id}/deletion
+    return {"status": "deleting", "job_id": str(campaign_id)}
+
+
+@router.get("/{campaign_id}/deletion")
+async def get_campaign_deletion(
+    campaign_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Progress of a background purge; a campaign that no longer exists reads as deleted."""
+    campaign_status = db.execute(
+        select(Campaign.status).where(Campaign.id == campaign_id, Campaign.user_id == current_user.id)
+    ).scalar_one_or_none()
+    if campaign_status is None:
+        return {"status": "deleted", "remaining_rows": 0}
+    if campaign_status != CampaignStatus.DELETING:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Campaign is not being deleted",
+        )
+    return {"status": "deleting", "remaining_rows": child_row_count(db, campaign_id)}
 
 
 @router.post("/{campaign_id}/contacts", response_model=ContactResponse)
@@ -125,6 +220,7 @@ async def add_contact_to_campaign(
     campaign = db.query(Campaign).filter(
         Campaign.id == campaign_id,
         Campaign.user_id == current_user.id,
+        NOT_DELETING,
     ).first()
     
     if not campaign:
@@ -133,6 +229,12 @@ async def add_contact_to_campaign(
             detail="Campaign not found",
         )
     
+    if suppression_index.suppressed(db, current_user.id, [contact.email]):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Contact is on your suppression list",
+        )
+    
     db_contact = Contact(
         **contact.dict(),
         campaign_id=campaign_id,
@@ -143,62 +245,89 @@ async def add_contact_to_campaign(
     return db_contact
 
 
+@router.post("/{campaign_id}/contacts/import", response_model=ContactImportResponse)
+async def import_campaign_contacts(
+    campaign_id: UUID,
+    contacts: List[ContactCreate],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Add many contacts at once, skipping suppressed addresses with one batched check."""
+    _owned_campaign_version(db, campaign_id, current_user.id)
+    blocked = suppression_index.suppressed(db, current_user.id, [contact.email for contact in contacts])
+    rows = [
+        {**contact.dict(), "id": uuid4(), "campaign_id": campaign_id, "created_at": datetime.utcnow()}
+        for contact in contacts
+        if contact.email not in blocked
+    ]
+    if rows:
+        db.execute(insert(Contact.__table__), rows)
+    db.commit()
+    return ContactImportResponse(added=len(rows), suppressed=sorted(blocked))
+
+
 @router.get("/{campaign_id}/contacts", response_model=List[ContactResponse])
 async def get_campaign_contacts(
     campaign_id: UUID,
+    if_none_match: Optional[str] = Header(default=None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    campaign = db.query(Campaign).filter(
-        Campaign.id == campaign_id,
-        Campaign.user_id == current_user.id,
-    ).first()
-    
-    if not campaign:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Campaign not found",
-        )
-    
-    contacts = db.query(Contact).filter(
-        Contact.campaign_id == campaign_id
+    # Contacts are insert-only, so count + newest created_at identifies the set
+    version = _owned_campaign_version(
+        db, campaign_id, current_user.id, *_count_and_latest(Contact, Contact.created_at)
+    )
+    etag = make_etag("contacts", *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    rows = db.execute(
+        select(*schema_columns(ContactResponse, Contact)).where(Contact.campaign_id == campaign_id)
     ).all()
-    return contacts
+    fast_response = rows_response(ContactResponse, rows)
+    set_etag(fast_response, etag)
+    return fast_response
 
 
 @router.get("/{campaign_id}/analytics", response_model=dict)
 async def get_campaign_analytics(
     campaign_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    campaign = db.query(Campaign).filter(
-        Campaign.id == campaign_id,
-        Campaign.user_id == current_user.id,
-    ).first()
-    
-    if not campaign:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Campaign not found",
-        )
-    
-    email_logs = db.query(EmailLog).filter(
-        EmailLog.campaign_id == campaign_id
-    ).all()
-    
-    total_sent = len([log for log in email_logs if log.sent_at])
-    total_opened = len([log for log in email_logs if log.is_opened])
-    total_replied = len([log for log in email_logs if log.is_replied])
+    version = _owned_campaign_version(
+        db, campaign_id, current_user.id,
+        *_count_and_latest(Contact, Contact.created_at),
+        *_count_and_latest(EmailLog, EmailLog.updated_at),
+        *_count_and_latest(ArchivedEmailLog, ArchivedEmailLog.archived_at),
+    )
+    etag = make_etag("analytics", *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    # Aggregated in SQL over hot and archived logs, without loading any rows
+    total_sent = total_opened = total_replied = 0
+    for model in (EmailLog, ArchivedEmailLog):
+        sent, opened, replied = db.execute(
+            select(
+                func.count(model.sent_at),
+                func.count().filter(model.is_opened.is_(True)),
+                func.count().filter(model.is_replied.is_(True)),
+            ).where(model.campaign_id == campaign_id)
+        ).one()
+        total_sent += sent
+        total_opened += opened
+        total_replied += replied
     
     open_rate = (total_opened / total_sent * 100) if total_sent > 0 else 0
     reply_rate = (total_replied / total_sent * 100) if total_sent > 0 else 0
     
     return {
         "campaign_id": str(campaign_id),
-        "total_contacts": db.query(Contact).filter(
-            Contact.campaign_id == campaign_id
-        ).count(),
+        "total_contacts": version[1],
         "total_sent": total_sent,
         "total_opened": total_opened,
         "total_replied": total_replied,
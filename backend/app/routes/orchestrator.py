@@ -1,37 +1,225 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
+import asyncio
+import json
 import os
 import shutil
 import tempfile
+import uuid
+from dataclasses import asdict
+from typing import Optional, Tuple
 from pydantic import BaseModel
+from app.core.admission import pipeline_backlog
+from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import PIPELINE_DUPLICATES_TOTAL, observe_stage
+from app.models.pipeline_job import TERMINAL_STAGES, PipelineStage
+from app.services.bulk_ingest import BulkIngestError, ingest, iter_ndjson, iter_zip
 from app.services.hf_mcp_client import extract_entities_from_text
+from app.services.idempotency import idempotency_store, request_key
+from app.services.pipeline_jobs import create_job, job_events, load_job_states, set_stage
 from app.services.resume_service import extract_text_from_file
 
 router = APIRouter()
 logger = get_logger("orchestrator")
 
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-seq"}
+ZIP_TYPES = {"application/zip", "application/x-zip-compressed"}
+
+# Pipeline runs started by bulk imports; the semaphore is what pushes back on the upload
+bulk_pipeline_slots = asyncio.Semaphore(settings.BULK_PIPELINE_CONCURRENCY)
+_bulk_jobs = set()
+
 
 class ResumeTextPayload(BaseModel):
     text: str
     email: str
 
 
+def enqueue_pipeline_job(background_tasks: BackgroundTasks, payload: dict, dedupe_key: Optional[str] = None) -> None:
+    pipeline_backlog.inc()
+    background_tasks.add_task(_run_pipeline_job, payload, dedupe_key)
+
+
+async def _run_pipeline_job(payload: dict, dedupe_key: Optional[str] = None) -> None:
+    status = "failed"
+    try:
+        if dedupe_key:
+            await idempotency_store.update(dedupe_key, status="running")
+        await process_resume_job(payload)
+        status = "completed"
+    except Exception as e:
+        logger.exception("Pipeline job crashed", job_id=payload.get("job_id"))
+        await set_stage(payload.get("job_id"), PipelineStage.FAILED, error=str(e))
+        raise
+    finally:
+        pipeline_backlog.dec()
+        if dedupe_key and status == "failed":
+            # Only queued, running and completed jobs coalesce; a retry of a failed one runs again
+            await idempotency_store.release(dedupe_key)
+        elif dedupe_key:
+            await idempotency_store.update(dedupe_key, status=status)
+
+
+async def _claim_pipeline_job(payload: dict, idempotency_key: Optional[str]) -> Tuple[str, str, Optional[dict]]:
+    """Claim the request's dedupe key; returns (key, new job id, existing job record or None).
+
+    A successful claim also persists the job record that status requests and
+    progress streams read.
+    """
+    dedupe_key = request_key(idempotency_key, payload["text"], payload["email"])
+    job_id = str(uuid.uuid4())
+    existing = await idempotency_store.claim(dedupe_key, {"job_id": job_id, "status": "queued"})
+    if existing is not None:
+        PIPELINE_DUPLICATES_TOTAL.labels("header" if idempotency_key else "content").inc()
+        logger.info("Duplicate ingest suppressed", job_id=existing["job_id"], job_status=existing["status"])
+        return dedupe_key, job_id, existing
+    try:
+        await asyncio.to_thread(create_job, job_id, payload["email"])
+    except Exception:
+        await idempotency_store.release(dedupe_key)
+        raise
+    payload["job_id"] = job_id
+    return dedupe_key, job_id, None
+
+
+async def submit_pipeline_job(background_tasks: BackgroundTasks, payload: dict,
+                              idempotency_key: Optional[str] = None) -> dict:
+    """Enqueue a pipeline job unless the same request was already accepted within the TTL.
+
+    Retries and concurrent duplicates get the original job's id and status
+    back instead of starting another run.
+    """
+    dedupe_key, job_id, existing = await _claim_pipeline_job(payload, idempotency_key)
+    if existing is not None:
+        return {"status": "duplicate", "job_id": existing["job_id"], "job_status": existing["status"]}
+    try:
+        enqueue_pipeline_job(background_tasks, payload, dedupe_key)
+    except Exception:
+        await idempotency_store.release(dedupe_key)
+        raise
+    return {"status": "accepted", "job_id": job_id}
+
+
 @router.post("/webhook/ingest")
-async def ingest_resume(payload: ResumeTextPayload, background_tasks: BackgroundTasks):
+async def ingest_resume(
+    payload: ResumeTextPayload,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(default=None),
+):
     # Simple webhook entry: accept resume text and enqueue background processing
     try:
-        background_tasks.add_task(process_resume_job, payload.dict())
-        return {"status": "accepted"}
+        return await submit_pipeline_job(background_tasks, payload.dict(), idempotency_key)
     except Exception as e:
         logger.exception("Failed to accept job")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def submit_bulk_job(payload: dict) -> str:
+    """Start one bulk record's pipeline run as soon as a bulk slot frees up."""
+    dedupe_key, job_id, existing = await _claim_pipeline_job(payload, None)
+    if existing is not None:
+        return "duplicate"
+    try:
+        await bulk_pipeline_slots.acquire()
+    except BaseException:
+        await idempotency_store.release(dedupe_key)
+        raise
+    pipeline_backlog.inc()
+    task = asyncio.create_task(_run_pipeline_job(payload, dedupe_key))
+    _bulk_jobs.add(task)
+
+    def done(task: asyncio.Task) -> None:
+        _bulk_jobs.discard(task)
+        bulk_pipeline_slots.release()
+
+    task.add_done_callback(done)
+    return "accepted"
+
+
+@router.post("/bulk")
+async def bulk_ingest(request: Request):
+    """Import many resumes in one request: an NDJSON stream of ``{text, email}`` or a ZIP of files.
+
+    Records are parsed as the body arrives and pipeline runs start while the
+    upload continues; when the pipeline is saturated the server stops reading,
+    so the client is slowed down rather than the upload buffered.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_TYPES:
+        records = iter_ndjson(request.stream())
+    elif content_type in ZIP_TYPES:
+        records = iter_zip(request.stream())
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail="Send application/x-ndjson or application/zip",
+        )
+    try:
+        summary = await ingest(records, submit_bulk_job)
+    except BulkIngestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "completed", **asdict(summary)}
+
+
+def _format_event(event: dict) -> str:
+    return f"event: stage\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/jobs/{job_id}")
+async def get_pipeline_job(job_id: uuid.UUID):
+    states = await asyncio.to_thread(load_job_states, [str(job_id)])
+    if not states:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return states[0]
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_pipeline_job(job_id: uuid.UUID):
+    """Server-sent events: the job's current stage, then every transition until it is done or failed."""
+    key = str(job_id)
+    # Subscribe before reading the current state so no transition falls in between
+    queue = job_events.subscribe(key)
+    try:
+        states = await asyncio.to_thread(load_job_states, [key])
+    except BaseException:
+        job_events.unsubscribe(key, queue)
+        raise
+    if not states:
+        job_events.unsubscribe(key, queue)
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        try:
+            event = states[0]
+            yield _format_event(event)
+            terminal = {stage.value for stage in TERMINAL_STAGES}
+            while event["stage"] not in terminal:
+                try:
+                    next_event = await asyncio.wait_for(queue.get(), settings.JOB_EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if next_event["stage"] != event["stage"]:
+                    event = next_event
+                    yield _format_event(event)
+        finally:
+            job_events.unsubscribe(key, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # identity keeps GZipMiddleware from buffering events inside the compressor
+        headers={"Cache-Control": "no-cache", "Content-Encoding": "identity", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/upload")
 async def upload_resume(
     background_tasks: BackgroundTasks,
     email: str,
     file: UploadFile = File(...),
+    idempotency_key: Optional[str] = Header(default=None),
 ):
     """Directly upload a resume file (PDF, DOCX) and start the pipeline."""
     try:
@@ -42,40 +230,48 @@ async def upload_resume(
             tmp_path = tmp.name
 
         # Extract text from the temporary file
-        text = extract_text_from_file(tmp_path)
+        with observe_stage("parse"):
+            text = extract_text_from_file(tmp_path)
         
         # Cleanup the temporary file
         os.unlink(tmp_path)
 
         # Enqueue the processing job
-        background_tasks.add_task(process_resume_job, {"text": text, "email": email})
+        result = await submit_pipeline_job(background_tasks, {"text": text, "email": email}, idempotency_key)
         
         return {
-            "status": "accepted",
+            **result,
             "filename": file.filename,
-            "message": "File uploaded and processing started"
+            "message": "File uploaded and processing started" if result["status"] == "accepted"
+            else "File matches a resume already being processed"
         }
     except Exception as e:
         logger.exception("Failed to process uploaded file")
         raise HTTPException(status_code=500, detail=f"File processing error: {str(e)}")
 
 
-from app.services.linkedin_scraper import PoliteLinkedInScraper
+from app.services.linkedin_scraper import get_shared_scraper
 from app.services.application_service import render_application_template
 from app.services.emailer import send_email
+from app.services.job_ranker import rank_jobs
+from app.services.search_planner import plan_search_urls
+from app.utils.fanout import fan_out
 import re
 
 async def process_resume_job(payload: dict):
     """The main orchestration logic for the recruitment pipeline."""
     text = payload.get("text")
     email = payload.get("email")
+    job_id = payload.get("job_id")
     
     logger.info("Starting background processing for resume", email=email)
     
     # 1. Extract Entities (AI or Basic Fallback)
+    await set_stage(job_id, PipelineStage.EXTRACTING)
     entities = {}
     try:
-        entities = await extract_entities_from_text(text)
+        with observe_stage("extract"):
+            entities = await extract_entities_from_text(text)
         logger.info("AI Entities extracted", entities=entities)
     except Exception as e:
         logger.warning(f"AI Extraction failed/not configured: {str(e)}. Using fallback keyword matching.")
@@ -90,59 +286,74 @@ async def process_resume_job(payload: dict):
         }
 
     # 2. Search for Jobs
-    scraper = PoliteLinkedInScraper()
+    await set_stage(job_id, PipelineStage.SEARCHING)
     jobs = []
     try:
-        # Search for the first position found
-        search_query = entities.get("positions", ["Software Engineer"])[0]
-        logger.info(f"Searching LinkedIn for: {search_query}")
-        
-        # Simulating search URLs (In production these would be generated based on location/role)
-        query_urls = [f"https://www.linkedin.com/jobs/search?keywords={search_query.replace(' ', '%20')}"]
-        jobs = await scraper.search_jobs(query_urls, max_results=3)
+        query_urls = plan_search_urls(entities.get("positions") or ["Software Engineer"])
+        logger.info("Searching LinkedIn", urls=len(query_urls))
+        with observe_stage("search"):
+            jobs = await get_shared_scraper().search_jobs(query_urls, max_results=settings.RANKING_CANDIDATE_POOL)
         logger.info(f"Found {len(jobs)} jobs")
+        with observe_stage("rank"):
+            jobs = rank_jobs(jobs, entities)
     except Exception:
         logger.exception("Job search failed")
-    finally:
-        await scraper.close()
 
     # 3. Draft and "Send" Applications
     if not jobs:
         logger.warning("No jobs found to apply to.")
+        await set_stage(job_id, PipelineStage.DONE, jobs=0, sent=0)
         return
 
-    for job in jobs:
-        try:
-            context = {
-                "recruiter_name": "Hiring Manager",
-                "position_title": job.get("title") or "Engineering Role",
-                "company_name": job.get("company") or "your company",
-                "top_skills": entities.get("top_skills", []),
-                "years_of_experience": entities.get("years_of_experience", "3+"),
-                "accomplishments": ["Developed scalable backends", "Optimized cloud costs"],
-                "company_interest_reason": "your innovative work in the industry",
-                "candidate_name": entities.get("candidate_name", "Naman"),
-                "candidate_email": email,
-                "candidate_phone": "+1-234-567-890"
-            }
-            
+    await set_stage(job_id, PipelineStage.DRAFTING, jobs=len(jobs))
+    sending = False
+
+    async def apply_to_job(job: dict) -> str:
+        context = {
+            "recruiter_name": "Hiring Manager",
+            "position_title": job.get("title") or "Engineering Role",
+            "company_name": job.get("company") or "your company",
+            "top_skills": entities.get("top_skills", []),
+            "years_of_experience": entities.get("years_of_experience", "3+"),
+            "accomplishments": ["Developed scalable backends", "Optimized cloud costs"],
+            "company_interest_reason": "your innovative work in the industry",
+            "candidate_name": entities.get("candidate_name", "Naman"),
+            "candidate_email": email,
+            "candidate_phone": "+1-234-567-890"
+        }
+
+        with observe_stage("draft"):
             draft = render_application_template("application_email.txt", context)
-            logger.info(f"Drafted application for {job.get('company')}")
-            
-            # 4. Email Outreach
-            subject = f"Application for {context['position_title']} - {context['candidate_name']}"
-            
-            # Log the draft so user can see it without SMTP setup
-            logger.info("DRAFT CREATED:\n" + "="*20 + "\n" + draft + "\n" + "="*20)
-            
-            try:
+        logger.info(f"Drafted application for {job.get('company')}")
+
+        # 4. Email Outreach
+        subject = f"Application for {context['position_title']} - {context['candidate_name']}"
+
+        # Log the draft so user can see it without SMTP setup
+        logger.info("DRAFT CREATED:\n" + "="*20 + "\n" + draft + "\n" + "="*20)
+
+        nonlocal sending
+        if not sending:
+            sending = True
+            await set_stage(job_id, PipelineStage.SENDING, jobs=len(jobs))
+        try:
+            with observe_stage("send"):
                 await send_email(email, subject, draft)
-                logger.info(f"Email sent successfully to {email}")
-            except Exception:
-                logger.warning("Email sending failed (Check SMTP settings in .env). Draft is logged above.")
-        
+            logger.info(f"Email sent successfully to {email}")
+            return "sent"
         except Exception:
-            logger.exception(f"Failed to process application for {job.get('company')}")
+            logger.warning("Email sending failed (Check SMTP settings in .env). Draft is logged above.")
+            return "drafted"
+
+    # One slow SMTP exchange must not hold up the rest of the batch
+    summary = await fan_out(jobs, apply_to_job, settings.APPLY_CONCURRENCY, settings.APPLY_TIMEOUT_SECONDS)
+    for failure in summary.failures:
+        logger.opt(exception=failure.error).error(
+            f"Failed to process application for {failure.item.get('company')}", timed_out=failure.timed_out
+        )
+    logger.info("Applications processed", sent=summary.values.count("sent"), **summary.counts())
+    await set_stage(job_id, PipelineStage.DONE, jobs=len(jobs), sent=summary.values.count("sent"),
+                    drafted=summary.values.count("drafted"), failed=len(summary.failures))
 
     logger.info("Resume processing job completed")
 
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.core.security import get_current_user
+from app.db.database import get_db
+from app.models.user import User
+from app.schemas.suppression import SuppressionCheck, SuppressionUpdate
+from app.services.suppression import add_suppressions, remove_suppressions, suppression_index
+
+router = APIRouter()
+
+
+@router.post("/")
+def add_to_suppression_list(
+    update: SuppressionUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Never email these addresses or domains from any of the user's campaigns."""
+    added = add_suppressions(db, current_user.id, update.values, update.reason)
+    db.commit()
+    return {"status": "ok", "added": added}
+
+
+@router.post("/remove")
+def remove_from_suppression_list(
+    update: SuppressionUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    removed = remove_suppressions(db, current_user.id, update.values)
+    db.commit()
+    return {"status": "ok", "removed": removed}
+
+
+@router.post("/check")
+def check_suppression_list(
+    check: SuppressionCheck,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Which of these addresses would be skipped (entries are stored hashed, so they cannot be listed)."""
+    return {"suppressed": sorted(suppression_index.suppressed(db, current_user.id, check.emails))}
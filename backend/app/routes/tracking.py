@@ -0,0 +1,48 @@
+import base64
+from typing import Optional
+from urllib.parse import urlparse
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.responses import RedirectResponse
+
+from app.services.tracking import tracking_buffer, verify_click
+
+router = APIRouter()
+
+# 1x1 transparent GIF
+PIXEL_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+NO_CACHE_HEADERS = {
+    "Cache-Control": "no-store, no-cache, must-revalidate, max-age=0",
+    "Pragma": "no-cache",
+}
+
+
+def _parse_log_id(log_id: str) -> Optional[UUID]:
+    try:
+        return UUID(log_id)
+    except ValueError:
+        return None
+
+
+@router.get("/open/{log_id}")
+async def track_open(log_id: str):
+    # Always answer with the pixel; a bad id must not render a broken image
+    parsed = _parse_log_id(log_id)
+    if parsed is not None:
+        tracking_buffer.record_open(parsed)
+    return Response(content=PIXEL_GIF, media_type="image/gif", headers=NO_CACHE_HEADERS)
+
+
+@router.get("/click/{log_id}")
+async def track_click(log_id: str, url: str, sig: str = ""):
+    # Only links signed by click_path redirect, so this cannot bounce visitors anywhere else
+    parsed = _parse_log_id(log_id)
+    if parsed is None or urlparse(url).scheme not in ("http", "https") or not verify_click(parsed, url, sig):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid redirect URL",
+        )
+    tracking_buffer.record_click(parsed)
+    return RedirectResponse(url, status_code=status.HTTP_302_FOUND, headers=NO_CACHE_HEADERS)
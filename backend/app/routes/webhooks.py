@@ -0,0 +1,32 @@
+import hmac
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.database import get_db
+from app.services.provider_events import apply_provider_events
+
+router = APIRouter()
+logger = get_logger("webhooks")
+
+
+@router.post("/sendgrid/events")
+def ingest_sendgrid_events(
+    events: List[Dict[str, Any]],
+    token: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Ingest a batch of SendGrid event-webhook events (delivered, bounce, open, ...)."""
+    if settings.SENDGRID_WEBHOOK_TOKEN and not hmac.compare_digest(
+        token or "", settings.SENDGRID_WEBHOOK_TOKEN
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook token",
+        )
+
+    applied = apply_provider_events(db, events)
+    return {"status": "ok", "received": len(events), "applied": applied}
@@ -64,6 +64,12 @@ class ContactResponse(ContactBase):
         from_attributes = True
 
 
+class ContactImportResponse(BaseModel):
+    added: int
+    # Addresses skipped because they are on the owner's suppression list
+    suppressed: List[str]
+
+
 class EmailLogResponse(BaseModel):
     id: UUID
     campaign_id: UUID
@@ -73,6 +79,8 @@ class EmailLogResponse(BaseModel):
     sent_at: Optional[datetime] = None
     is_opened: bool
     opened_at: Optional[datetime] = None
+    is_clicked: bool = False
+    clicked_at: Optional[datetime] = None
     is_replied: bool
     replied_at: Optional[datetime] = None
     created_at: datetime
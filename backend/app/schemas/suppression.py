@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class SuppressionUpdate(BaseModel):
+    # Addresses ("jane@acme.com") or whole domains ("acme.com")
+    values: List[str] = Field(..., min_length=1)
+    reason: str = "manual"
+
+
+class SuppressionCheck(BaseModel):
+    emails: List[str]
@@ -1,16 +1,22 @@
-from jinja2 import Environment, PackageLoader, select_autoescape, FileSystemLoader
+from functools import lru_cache
 from typing import Dict
 from app.core.logging import get_logger
 
 logger = get_logger("application_service")
 
-# Use a simple file-system loader so templates can live in app/templates
-env = Environment(
-    loader=FileSystemLoader("app/templates"),
-    autoescape=select_autoescape(["html", "xml"]),
-)
+
+@lru_cache(maxsize=None)
+def get_template_env():
+    """Jinja environment for app/templates, built on first use."""
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    # Use a simple file-system loader so templates can live in app/templates
+    return Environment(
+        loader=FileSystemLoader("app/templates"),
+        autoescape=select_autoescape(["html", "xml"]),
+    )
 
 
 def render_application_template(template_name: str, context: Dict) -> str:
-    tmpl = env.get_template(template_name)
+    tmpl = get_template_env().get_template(template_name)
     return tmpl.render(**context)
@@ -0,0 +1,88 @@
+import hashlib
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import insert_ignoring_duplicates
+from app.models.email_body import EmailBody
+
+# zlib only looks back 32 KiB, so that is all of a preset dictionary it can use
+MAX_ZDICT_BYTES = 32 * 1024
+
+
+def body_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _compress(data: bytes, zdict: Optional[bytes]) -> bytes:
+    level = settings.EMAIL_BODY_COMPRESS_LEVEL
+    compressor = zlib.compressobj(level, zdict=zdict[-MAX_ZDICT_BYTES:]) if zdict else zlib.compressobj(level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _decompress(data: bytes, zdict: Optional[bytes]) -> bytes:
+    decompressor = zlib.decompressobj(zdict=zdict[-MAX_ZDICT_BYTES:]) if zdict else zlib.decompressobj()
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+def store_bodies(db: Session, texts: Sequence[Optional[str]], base: Optional[str] = None) -> List[Optional[str]]:
+    """Store ``texts`` once per distinct content and return their hashes (None stays None).
+
+    With ``base`` (e.g. the first body rendered from a template) every other
+    text is compressed using it as the zlib preset dictionary, so only what
+    differs from it takes space. Existing bodies are left untouched. Does not
+    commit: call it inside the transaction that writes the referencing rows.
+    """
+    rows: Dict[str, dict] = {}
+    base_hash = zdict = None
+    if base is not None:
+        zdict = base.encode()
+        base_hash = body_hash(base)
+        rows[base_hash] = {"hash": base_hash, "base_hash": None, "data": _compress(zdict, None), "size": len(zdict)}
+
+    hashes: List[Optional[str]] = []
+    for text in texts:
+        if text is None:
+            hashes.append(None)
+            continue
+        digest = body_hash(text)
+        hashes.append(digest)
+        if digest not in rows:
+            raw = text.encode()
+            rows[digest] = {"hash": digest, "base_hash": base_hash, "data": _compress(raw, zdict), "size": len(raw)}
+    if rows:
+        # Bases come first, so the self-referencing foreign key is always satisfied
+        db.execute(insert_ignoring_duplicates(db, EmailBody.__table__, ["hash"]), list(rows.values()))
+    return hashes
+
+
+def load_bodies(db: Session, hashes: Iterable[Optional[str]]) -> Dict[str, str]:
+    """Texts for ``hashes``, fetched in one query per level of base bodies."""
+    wanted = {digest for digest in hashes if digest}
+    stored: Dict[str, Tuple[Optional[str], bytes]] = {}
+    missing = set(wanted)
+    while missing:
+        rows = db.execute(
+            select(EmailBody.hash, EmailBody.base_hash, EmailBody.data).where(EmailBody.hash.in_(missing))
+        ).all()
+        for digest, base_hash, data in rows:
+            stored[digest] = (base_hash, data)
+        missing = {base for base, _ in stored.values() if base and base not in stored}
+        if not rows:
+            break
+
+    texts: Dict[str, bytes] = {}
+
+    def resolve(digest: str) -> Optional[bytes]:
+        if digest not in texts:
+            if digest not in stored:
+                return None
+            base_hash, data = stored[digest]
+            zdict = resolve(base_hash) if base_hash else None
+            texts[digest] = _decompress(data, zdict)
+        return texts[digest]
+
+    return {digest: resolve(digest).decode() for digest in wanted if digest in stored}
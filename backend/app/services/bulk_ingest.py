@@ -0,0 +1,201 @@
+import asyncio
+import json
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.resume_service import extract_text_from_file
+
+logger = get_logger("bulk_ingest")
+
+RESUME_SUFFIXES = (".pdf", ".docx", ".txt")
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+MAX_REPORTED_ERRORS = 20
+
+
+class BulkIngestError(Exception):
+    pass
+
+
+@dataclass
+class BulkRecord:
+    source: str
+    text: Optional[str] = None
+    email: Optional[str] = None
+    # Archive members are extracted to a temp file, removed once parsed
+    path: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkSummary:
+    received: int = 0
+    accepted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: List[Dict[str, str]] = field(default_factory=list)
+
+    def fail(self, source: str, reason: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"source": source, "error": reason})
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[BulkRecord]:
+    """Yield one record per NDJSON line as the body arrives; malformed lines become error records."""
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield _ndjson_record(line, line_no)
+        if len(buffer) > settings.BULK_MAX_RECORD_BYTES:
+            raise BulkIngestError(f"NDJSON line {line_no + 1} exceeds {settings.BULK_MAX_RECORD_BYTES} bytes")
+    if buffer.strip():
+        yield _ndjson_record(buffer, line_no + 1)
+
+
+def _ndjson_record(line: bytes, line_no: int) -> BulkRecord:
+    source = f"line {line_no}"
+    try:
+        data = json.loads(line)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return BulkRecord(source, error="not a JSON object")
+    return BulkRecord(source, text=data.get("text"), email=data.get("email"))
+
+
+def _list_members(archive_path: str) -> List[zipfile.ZipInfo]:
+    with zipfile.ZipFile(archive_path) as archive:
+        return [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and info.filename.lower().endswith(RESUME_SUFFIXES)
+            and not os.path.basename(info.filename).startswith(".")
+            and "__MACOSX" not in info.filename
+        ]
+
+
+def _extract_member(archive_path: str, info: zipfile.ZipInfo) -> str:
+    suffix = os.path.splitext(info.filename)[1].lower()
+    with zipfile.ZipFile(archive_path) as archive, archive.open(info) as src:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as dst:
+            shutil.copyfileobj(src, dst)
+            return dst.name
+
+
+async def iter_zip(chunks: AsyncIterator[bytes]) -> AsyncIterator[BulkRecord]:
+    """Yield one record per resume in a ZIP upload, one member on disk at a time.
+
+    A ZIP's directory sits at the end of the file, so the body is spooled to
+    a temp file (never held in memory) and members are then extracted lazily.
+    The email comes from a path component such as ``jane@example.com/cv.pdf``,
+    else from the resume text itself.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".zip") as spool:
+        size = 0
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > settings.BULK_MAX_UPLOAD_BYTES:
+                raise BulkIngestError(f"Upload exceeds {settings.BULK_MAX_UPLOAD_BYTES} bytes")
+            spool.write(chunk)
+        spool.flush()
+        try:
+            members = await asyncio.to_thread(_list_members, spool.name)
+        except zipfile.BadZipFile as exc:
+            raise BulkIngestError(f"Invalid ZIP archive: {exc}")
+
+        for info in members:
+            if info.file_size > settings.BULK_MAX_RECORD_BYTES:
+                yield BulkRecord(info.filename, error="file too large")
+                continue
+            email = next((part for part in info.filename.split("/") if _EMAIL_RE.fullmatch(part)), None)
+            if email is None:
+                match = _EMAIL_RE.search(os.path.basename(info.filename))
+                email = match.group() if match else None
+            path = await asyncio.to_thread(_extract_member, spool.name, info)
+            yield BulkRecord(info.filename, email=email, path=path)
+
+
+Submit = Callable[[dict], Awaitable[str]]
+
+
+async def ingest(records: AsyncIterator[BulkRecord], submit: Submit, workers: Optional[int] = None,
+                 queue_size: Optional[int] = None) -> BulkSummary:
+    """Parse records through a bounded queue into ``workers`` extraction workers.
+
+    ``submit`` hands a ``{text, email}`` payload to the pipeline and returns
+    "accepted" or "duplicate"; it may block while the pipeline is full. A
+    full queue stops the reader, which stops reading the request body, so
+    a slow pipeline throttles the client instead of buffering the upload.
+    """
+    workers = workers or settings.BULK_WORKERS
+    queue: "asyncio.Queue[Optional[BulkRecord]]" = asyncio.Queue(maxsize=queue_size or settings.BULK_QUEUE_SIZE)
+    summary = BulkSummary()
+
+    async def worker() -> None:
+        while True:
+            record = await queue.get()
+            if record is None:
+                return
+            try:
+                await _process(record, submit, summary)
+            except Exception as exc:
+                logger.exception("Bulk record failed", source=record.source)
+                summary.fail(record.source, str(exc))
+            finally:
+                if record.path:
+                    os.unlink(record.path)
+
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        async for record in records:
+            summary.received += 1
+            await queue.put(record)
+        for _ in tasks:
+            await queue.put(None)
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Members parsed but never picked up (e.g. the client went away)
+        while not queue.empty():
+            record = queue.get_nowait()
+            if record is not None and record.path:
+                os.unlink(record.path)
+    logger.info("Bulk ingest finished", received=summary.received, accepted=summary.accepted,
+                duplicates=summary.duplicates, failed=summary.failed)
+    return summary
+
+
+async def _process(record: BulkRecord, submit: Submit, summary: BulkSummary) -> None:
+    if record.error:
+        summary.fail(record.source, record.error)
+        return
+    text = record.text
+    if record.path:
+        text = await asyncio.to_thread(extract_text_from_file, record.path)
+    if not isinstance(text, str) or not text.strip():
+        summary.fail(record.source, "no resume text")
+        return
+    email = record.email
+    if not email and record.path:
+        match = _EMAIL_RE.search(text)
+        email = match.group() if match else None
+    if not isinstance(email, str) or not _EMAIL_RE.fullmatch(email.strip()):
+        summary.fail(record.source, "missing or invalid email")
+        return
+
+    if await submit({"text": text, "email": email.strip()}) == "duplicate":
+        summary.duplicates += 1
+    else:
+        summary.accepted += 1
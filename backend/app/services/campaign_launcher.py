@@ -0,0 +1,107 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import insert, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.campaign import ArchivedEmailLog, Campaign, CampaignStatus, Contact, EmailLog
+from app.services.body_store import store_bodies
+from app.services.suppression import add_suppressions, suppression_index
+
+logger = get_logger("campaign_launcher")
+
+DEFAULT_TEMPLATE = "Hi {{ name or 'there' }},\n\nI'd love to connect about opportunities at {{ company or 'your company' }}."
+
+
+class CampaignTemplateError(Exception):
+    pass
+
+
+@lru_cache(maxsize=None)
+def _template_env():
+    from jinja2 import StrictUndefined
+    from jinja2.sandbox import SandboxedEnvironment
+
+    # Templates are user input: the sandbox blocks attribute walks into Python internals
+    return SandboxedEnvironment(autoescape=False, undefined=StrictUndefined)
+
+
+def _status_update(campaign_id: UUID, status: CampaignStatus, expected_status: Optional[CampaignStatus]):
+    table = Campaign.__table__
+    stmt = update(table).where(table.c.id == campaign_id).values(status=status)
+    if expected_status is not None:
+        stmt = stmt.where(table.c.status == expected_status)
+    return stmt
+
+
+def launch_campaign(db: Session, campaign_id: UUID, expected_status: Optional[CampaignStatus] = None) -> int:
+    """Activate a campaign and queue one pending EmailLog per contact for the outbox.
+
+    Contacts on the owner's suppression list (bounced, replied, or already
+    emailed by another campaign) are skipped, and the addresses queued here
+    are suppressed in turn.
+
+    The status flip is a conditional UPDATE, so concurrent launchers (or a
+    scheduler firing twice) activate the campaign at most once. Returns the
+    number of logs queued, or -1 if the campaign was not in the expected state.
+
+    Templates render in a sandbox. One that fails to compile or render
+    (syntax error, unknown variable, unsafe attribute) queues nothing: the
+    campaign is paused instead of activated and CampaignTemplateError raised.
+    """
+    if db.execute(_status_update(campaign_id, CampaignStatus.ACTIVE, expected_status)).rowcount != 1:
+        db.rollback()
+        return -1
+
+    from jinja2 import TemplateError
+
+    campaign = db.get(Campaign, campaign_id)
+    already_queued = union_all(
+        select(EmailLog.contact_id).where(EmailLog.campaign_id == campaign_id),
+        select(ArchivedEmailLog.contact_id).where(ArchivedEmailLog.campaign_id == campaign_id),
+    )
+    contacts = db.execute(
+        select(Contact.id, Contact.email, Contact.name, Contact.company, Contact.position)
+        .where(Contact.campaign_id == campaign_id, Contact.id.not_in(already_queued))
+    ).all()
+    blocked = suppression_index.suppressed(db, campaign.user_id, [contact.email for contact in contacts])
+    if blocked:
+        contacts = [contact for contact in contacts if contact.email not in blocked]
+
+    try:
+        template = _template_env().from_string(campaign.email_template or DEFAULT_TEMPLATE)
+        bodies = [
+            template.render(name=contact.name, email=contact.email, company=contact.company, position=contact.position)
+            for contact in contacts
+        ]
+    except TemplateError as exc:
+        db.rollback()
+        db.execute(_status_update(campaign_id, CampaignStatus.PAUSED, expected_status))
+        db.commit()
+        logger.warning("Campaign template rejected; campaign paused", campaign_id=str(campaign_id), error=str(exc))
+        raise CampaignTemplateError(str(exc)) from exc
+    # Every body is compressed against the first, so each costs about its variables
+    hashes = store_bodies(db, bodies, base=bodies[0] if bodies else None)
+    now = datetime.utcnow()
+    rows = [
+        {
+            "campaign_id": campaign_id,
+            "contact_id": contact.id,
+            "email_subject": campaign.name,
+            "body_hash": digest,
+            "status": "pending",
+            "created_at": now,
+        }
+        for contact, digest in zip(contacts, hashes)
+    ]
+    if rows:
+        db.execute(insert(EmailLog.__table__), rows)
+        if settings.SUPPRESS_CONTACTED:
+            add_suppressions(db, campaign.user_id, [contact.email for contact in contacts], "contacted")
+    db.commit()
+    logger.info("Campaign launched", campaign_id=str(campaign_id), queued=len(rows), suppressed=len(blocked))
+    return len(rows)
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Callable, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import CAMPAIGN_PURGE_ROWS_TOTAL
+from app.db.database import SessionLocal
+from app.models.campaign import ArchivedEmailLog, Campaign, CampaignStatus, Contact, EmailLog
+
+logger = get_logger("campaign_purge")
+
+# Children first, so every batch deletes exactly the rows it names
+PURGE_ORDER = (EmailLog, ArchivedEmailLog, Contact)
+
+_purges: Dict[str, asyncio.Task] = {}
+
+
+def child_row_count(db: Session, campaign_id: UUID) -> int:
+    return db.execute(
+        select(
+            sum(
+                select(func.count(model.id)).where(model.campaign_id == campaign_id).scalar_subquery()
+                for model in PURGE_ORDER
+            )
+        )
+    ).scalar_one()
+
+
+def delete_batch(db: Session, model, campaign_id: UUID, batch_size: int) -> int:
+    """Delete up to ``batch_size`` of a campaign's ``model`` rows in one short transaction."""
+    batch = select(model.id).where(model.campaign_id == campaign_id).limit(batch_size)
+    deleted = db.execute(delete(model).where(model.id.in_(batch))).rowcount
+    db.commit()
+    if deleted:
+        CAMPAIGN_PURGE_ROWS_TOTAL.labels(model.__tablename__).inc(deleted)
+    return deleted
+
+
+def _purge_step(campaign_id: UUID, batch_size: int, session_factory: Callable[[], Session]) -> bool:
+    """Delete the next batch; True once the campaign row itself is gone."""
+    db = session_factory()
+    try:
+        for model in PURGE_ORDER:
+            if delete_batch(db, model, campaign_id, batch_size):
+                return False
+        db.execute(delete(Campaign).where(Campaign.id == campaign_id))
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+async def purge_campaign(
+    campaign_id: UUID,
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> None:
+    """Delete a campaign marked DELETING in bounded batches.
+
+    Each batch is its own transaction, so locks are held for one batch at a
+    time and other writers interleave between them. The pause between
+    batches keeps a large purge from saturating the primary. Safe to run
+    again (or concurrently) after a crash: it only ever deletes what is left.
+    """
+    batch_size = batch_size or settings.CAMPAIGN_PURGE_BATCH_SIZE
+    pause_seconds = settings.CAMPAIGN_PURGE_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+    while not await asyncio.to_thread(_purge_step, campaign_id, batch_size, session_factory):
+        await asyncio.sleep(pause_seconds)
+    logger.info("Campaign purged", campaign_id=str(campaign_id))
+
+
+def start_purge(campaign_id: UUID) -> None:
+    """Run ``purge_campaign`` in the background, once per campaign on this worker."""
+    key = str(campaign_id)
+    if key in _purges:
+        return
+
+    async def run() -> None:
+        try:
+            await purge_campaign(campaign_id)
+        except Exception:
+            logger.exception("Campaign purge failed; it resumes on the next restart", campaign_id=key)
+        finally:
+            _purges.pop(key, None)
+
+    _purges[key] = asyncio.create_task(run())
+
+
+def _deleting_campaigns(session_factory: Callable[[], Session]) -> List[UUID]:
+    db = session_factory()
+    try:
+        return db.execute(select(Campaign.id).where(Campaign.status == CampaignStatus.DELETING)).scalars().all()
+    finally:
+        db.close()
+
+
+async def resume_purges(session_factory: Callable[[], Session] = SessionLocal) -> None:
+    """Restart purges left unfinished by a previous process."""
+    try:
+        pending = await asyncio.to_thread(_deleting_campaigns, session_factory)
+    except Exception:
+        logger.exception("Could not look up unfinished campaign purges")
+        return
+    for campaign_id in pending:
+        start_purge(campaign_id)
@@ -0,0 +1,185 @@
+"""Keeps ``email_logs`` narrow: inline bodies move to ``email_bodies`` and
+finished logs older than ``EMAIL_ARCHIVE_AFTER_DAYS`` move to
+``email_logs_archive``. Bodies (including reply text) that no log refers to
+any more, e.g. after a campaign purge, are deleted.
+
+Work is done in short batches, each its own transaction, so the job can run
+next to live traffic (e.g. nightly from cron) and be stopped at any point.
+
+    python -m app.services.email_archive --days 90
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import DateTime, bindparam, delete, func, insert, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import EMAIL_BODIES_SWEPT_TOTAL, EMAIL_LOGS_ARCHIVED_TOTAL
+from app.db.database import SessionLocal
+from app.models.campaign import ArchivedEmailLog, EmailLog
+from app.models.email_body import EmailBody
+from app.services.body_store import store_bodies
+
+logger = get_logger("email_archive")
+
+# Logs the outbox may still act on are never archived
+ACTIVE_STATUSES = ("pending", "sending")
+
+ARCHIVED_COLUMNS = [column.name for column in ArchivedEmailLog.__table__.columns if column.name != "archived_at"]
+
+
+def externalize_bodies(db: Session, batch_size: int, where=None) -> int:
+    """Move up to ``batch_size`` logs' inline body and reply text into the body store."""
+    query = select(EmailLog.id, EmailLog.email_body, EmailLog.reply_content).where(
+        or_(EmailLog.email_body.is_not(None), EmailLog.reply_content.is_not(None))
+    )
+    if where is not None:
+        query = query.where(where)
+    rows = db.execute(query.limit(batch_size).with_for_update(skip_locked=True)).all()
+    if not rows:
+        return 0
+
+    body_hashes = store_bodies(db, [row.email_body for row in rows])
+    reply_hashes = store_bodies(db, [row.reply_content for row in rows])
+    table = EmailLog.__table__
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            body_hash=func.coalesce(table.c.body_hash, bindparam("b_body_hash")),
+            reply_hash=func.coalesce(table.c.reply_hash, bindparam("b_reply_hash")),
+            email_body=None,
+            reply_content=None,
+        ),
+        [
+            {"b_id": row.id, "b_body_hash": body, "b_reply_hash": reply}
+            for row, body, reply in zip(rows, body_hashes, reply_hashes)
+        ],
+    )
+    return len(rows)
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """Move up to ``batch_size`` finished logs created before ``cutoff`` to the archive table."""
+    ids = db.execute(
+        select(EmailLog.id)
+        .where(EmailLog.created_at < cutoff, EmailLog.status.not_in(ACTIVE_STATUSES))
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not ids:
+        db.rollback()
+        return 0
+
+    externalize_bodies(db, len(ids), EmailLog.id.in_(ids))
+    columns = [EmailLog.__table__.c[name] for name in ARCHIVED_COLUMNS]
+    db.execute(
+        insert(ArchivedEmailLog.__table__).from_select(
+            ARCHIVED_COLUMNS + ["archived_at"],
+            select(*columns, literal(datetime.utcnow(), DateTime)).where(EmailLog.id.in_(ids)),
+        )
+    )
+    db.execute(delete(EmailLog).where(EmailLog.id.in_(ids)))
+    db.commit()
+    EMAIL_LOGS_ARCHIVED_TOTAL.inc(len(ids))
+    return len(ids)
+
+
+def _unreferenced():
+    """Conditions under which a stored body is referenced by nothing."""
+    dependent = aliased(EmailBody)
+    references = (
+        (EmailLog.id, EmailLog.body_hash),
+        (EmailLog.id, EmailLog.reply_hash),
+        (ArchivedEmailLog.id, ArchivedEmailLog.body_hash),
+        (ArchivedEmailLog.id, ArchivedEmailLog.reply_hash),
+        (dependent.hash, dependent.base_hash),
+    )
+    return [~select(key).where(column == EmailBody.hash).exists() for key, column in references]
+
+
+def sweep_bodies(db: Session, batch_size: int, grace: timedelta) -> int:
+    """Delete up to ``batch_size`` bodies older than ``grace`` that nothing refers to.
+
+    A base body goes in a later batch than the last body compressed against
+    it. If a writer starts using a body while it is being deleted, the
+    foreign keys reject the delete and the batch is left for the next run.
+    """
+    hashes = db.execute(
+        select(EmailBody.hash)
+        .where(EmailBody.created_at < datetime.utcnow() - grace, *_unreferenced())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not hashes:
+        db.rollback()
+        return 0
+    try:
+        deleted = db.execute(delete(EmailBody).where(EmailBody.hash.in_(hashes), *_unreferenced())).rowcount
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        logger.warning("Email bodies became referenced while being swept, skipping batch", count=len(hashes))
+        return 0
+    EMAIL_BODIES_SWEPT_TOTAL.inc(deleted)
+    return deleted
+
+
+def run(
+    days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> Dict[str, int]:
+    """Externalize remaining inline bodies, archive old logs, then sweep orphaned bodies, batch by batch."""
+    days = settings.EMAIL_ARCHIVE_AFTER_DAYS if days is None else days
+    batch_size = batch_size or settings.EMAIL_ARCHIVE_BATCH_SIZE
+    pause_seconds = settings.EMAIL_ARCHIVE_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    grace = timedelta(minutes=settings.EMAIL_BODY_ORPHAN_GRACE_MINUTES)
+    totals = {"externalized": 0, "archived": 0, "swept": 0}
+
+    db = session_factory()
+    try:
+        while True:
+            moved = externalize_bodies(db, batch_size)
+            db.commit()
+            totals["externalized"] += moved
+            if moved < batch_size:
+                break
+            time.sleep(pause_seconds)
+        while True:
+            archived = archive_batch(db, cutoff, batch_size)
+            totals["archived"] += archived
+            if archived < batch_size:
+                break
+            time.sleep(pause_seconds)
+        while True:
+            swept = sweep_bodies(db, batch_size, grace)
+            totals["swept"] += swept
+            if not swept:
+                break
+            time.sleep(pause_seconds)
+    finally:
+        db.close()
+    logger.info("Email log archiving finished", cutoff=cutoff.isoformat(), **totals)
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move email bodies out of email_logs, archive old logs and delete orphaned bodies"
+    )
+    parser.add_argument("--days", type=int, default=None, help="archive finished logs older than this")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    run(days=args.days, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
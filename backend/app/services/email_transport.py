@@ -0,0 +1,205 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional
+from uuid import UUID
+
+import httpx
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.campaign import EmailLog
+from app.services.emailer import send_email
+
+logger = get_logger("email_transport")
+
+
+class TransportError(Exception):
+    pass
+
+
+class RetryableTransportError(TransportError):
+    pass
+
+
+@dataclass
+class OutgoingMessage:
+    to_email: str
+    subject: str
+    body: str
+    html: Optional[str] = None
+    log_id: Optional[UUID] = None
+    # Provider-side template; messages sharing one are sent as a single request
+    template_id: Optional[str] = None
+    template_data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def group_key(self) -> Hashable:
+        if self.template_id:
+            return ("template", self.template_id, self.subject)
+        return ("content", self.subject, self.body, self.html)
+
+
+@dataclass
+class SendResult:
+    message: OutgoingMessage
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class EmailTransport(ABC):
+    """Delivers batches of messages; implementations never raise per message."""
+
+    @abstractmethod
+    async def send_batch(self, messages: List[OutgoingMessage]) -> List[SendResult]:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class SMTPTransport(EmailTransport):
+    """One SMTP exchange per message via ``emailer.send_email``."""
+
+    async def send_batch(self, messages: List[OutgoingMessage]) -> List[SendResult]:
+        results = []
+        for message in messages:
+            try:
+                await send_email(message.to_email, message.subject, message.body, message.html)
+                results.append(SendResult(message))
+            except Exception as e:
+                results.append(SendResult(message, error=str(e) or e.__class__.__name__))
+        return results
+
+
+class HTTPBatchTransport(EmailTransport):
+    """SendGrid v3 ``mail/send`` transport packing many recipients per request.
+
+    Messages with the same template (or identical content) become
+    personalizations of one request, up to ``batch_size`` each. A rejected
+    request is split in halves until the offending messages are isolated.
+    """
+
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.api_url = api_url or settings.SENDGRID_API_URL
+        self.api_key = api_key or settings.SENDGRID_API_KEY
+        self.batch_size = batch_size or settings.SENDGRID_BATCH_SIZE
+        self.client = client or httpx.AsyncClient(timeout=30)
+
+    async def send_batch(self, messages: List[OutgoingMessage]) -> List[SendResult]:
+        groups: Dict[Hashable, List[OutgoingMessage]] = {}
+        for message in messages:
+            groups.setdefault(message.group_key, []).append(message)
+
+        results = []
+        for group in groups.values():
+            for start in range(0, len(group), self.batch_size):
+                results.extend(await self._send_chunk(group[start:start + self.batch_size]))
+        return results
+
+    async def _send_chunk(self, chunk: List[OutgoingMessage]) -> List[SendResult]:
+        try:
+            message_id = await self._post(self._build_payload(chunk))
+            return [SendResult(m, message_id=message_id) for m in chunk]
+        except (RetryableTransportError, httpx.RequestError) as e:
+            return [SendResult(m, error=str(e) or e.__class__.__name__) for m in chunk]
+        except TransportError as e:
+            if len(chunk) == 1:
+                return [SendResult(chunk[0], error=str(e))]
+            mid = len(chunk) // 2
+            logger.warning("Batch rejected, splitting", size=len(chunk), error=str(e))
+            return await self._send_chunk(chunk[:mid]) + await self._send_chunk(chunk[mid:])
+
+    def _build_payload(self, chunk: List[OutgoingMessage]) -> Dict[str, Any]:
+        first = chunk[0]
+        personalizations = []
+        for message in chunk:
+            personalization: Dict[str, Any] = {"to": [{"email": message.to_email}]}
+            if message.log_id:
+                personalization["custom_args"] = {"email_log_id": str(message.log_id)}
+            if message.template_id:
+                personalization["dynamic_template_data"] = message.template_data
+            personalizations.append(personalization)
+
+        payload: Dict[str, Any] = {
+            "personalizations": personalizations,
+            "from": {"email": settings.EMAIL_FROM or settings.SMTP_USER},
+            "subject": first.subject,
+        }
+        if first.template_id:
+            payload["template_id"] = first.template_id
+        else:
+            payload["content"] = [{"type": "text/plain", "value": first.body}]
+            if first.html:
+                payload["content"].append({"type": "text/html", "value": first.html})
+        return payload
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10),
+           retry=retry_if_exception_type((httpx.RequestError, RetryableTransportError)),
+           reraise=True)
+    async def _post(self, payload: Dict[str, Any]) -> Optional[str]:
+        resp = await self.client.post(
+            self.api_url,
+            json=payload,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        )
+        if resp.status_code in (200, 202):
+            return resp.headers.get("X-Message-Id")
+        if resp.status_code == 429 or resp.status_code >= 500:
+            raise RetryableTransportError(f"Provider error {resp.status_code}")
+        raise TransportError(f"Provider rejected batch ({resp.status_code}): {resp.text[:500]}")
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def get_transport() -> EmailTransport:
+    if settings.EMAIL_TRANSPORT == "sendgrid":
+        return HTTPBatchTransport()
+    return SMTPTransport()
+
+
+def record_send_results(db: Session, results: List[SendResult]) -> int:
+    """Write delivery outcomes back to ``email_logs`` with one executemany UPDATE."""
+    now = datetime.utcnow()
+    rows = [
+        {
+            "b_id": r.message.log_id,
+            "b_status": "sent" if r.ok else "failed",
+            "b_sent_at": now if r.ok else None,
+            "b_message_id": r.message_id,
+            "b_error": r.error,
+        }
+        for r in results
+        if r.message.log_id is not None
+    ]
+    if not rows:
+        return 0
+
+    table = EmailLog.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            status=bindparam("b_status"),
+            sent_at=bindparam("b_sent_at"),
+            sendgrid_message_id=bindparam("b_message_id"),
+            error_message=bindparam("b_error"),
+        )
+    )
+    db.execute(stmt, rows)
+    db.commit()
+    return len(rows)
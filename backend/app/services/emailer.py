@@ -1,17 +1,28 @@
 from typing import Optional
 import asyncio
+import time
 from email.message import EmailMessage
-import aiosmtplib
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import SMTP_SEND_SECONDS
 
 logger = get_logger("emailer")
 
 
+def _is_retryable(exc: BaseException) -> bool:
+    # aiosmtplib is imported lazily in send_email, and is always loaded by the
+    # time anything it raised gets here
+    import aiosmtplib
+
+    return isinstance(exc, (aiosmtplib.errors.SMTPException, ConnectionError))
+
+
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10),
-       retry=retry_if_exception_type((aiosmtplib.errors.SMTPException, ConnectionError)))
+       retry=retry_if_exception(_is_retryable))
 async def send_email(to_email: str, subject: str, body: str, html: Optional[str] = None) -> None:
+    import aiosmtplib
+
     msg = EmailMessage()
     msg["From"] = settings.EMAIL_FROM or settings.SMTP_USER
     msg["To"] = to_email
@@ -20,16 +31,20 @@ async def send_email(to_email: str, subject: str, body: str, html: Optional[str]
     if html:
         msg.add_alternative(html, subtype="html")
 
+    start = time.perf_counter()
     try:
         await aiosmtplib.send(
             msg,
             hostname=settings.SMTP_HOST,
             port=settings.SMTP_PORT,
-            username=settings.SMTP_USER,
-            password=settings.SMTP_PASSWORD,
-            start_tls=True,
+            # Skip AUTH entirely for unauthenticated relays
+            username=settings.SMTP_USER or None,
+            password=settings.SMTP_PASSWORD or None,
+            start_tls=settings.SMTP_START_TLS,
         )
+        SMTP_SEND_SECONDS.labels("ok").observe(time.perf_counter() - start)
         logger.info("Email sent", to=to_email, subject=subject)
     except Exception:
+        SMTP_SEND_SECONDS.labels("error").observe(time.perf_counter() - start)
         logger.exception("Failed to send email")
         raise
@@ -1,10 +1,22 @@
+import asyncio
 import httpx
 import json
 import re
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import time
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 from typing import Any, Dict, Optional
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import (
+    HF_CIRCUIT_REJECTED_TOTAL,
+    HF_CIRCUIT_STATE,
+    HF_HEDGED_REQUESTS_TOTAL,
+    HF_REQUESTS_TOTAL,
+    HF_REQUEST_SECONDS,
+    count_hf_retry,
+)
+from app.services.resume_chunker import chunk_resume, estimate_tokens, merge_entities
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, LatencyWindow, hedged
 
 logger = get_logger("hf_mcp_client")
 
@@ -13,17 +25,103 @@ class MCPClientError(Exception):
     pass
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10),
-       retry=retry_if_exception_type((httpx.RequestError, MCPClientError)))
+class MCPUnavailableError(MCPClientError):
+    """The endpoint is loading, rate limiting or erroring; counts against the circuit breaker."""
+
+
+class MCPCircuitOpenError(MCPClientError, CircuitOpenError):
+    pass
+
+
+_CIRCUIT_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def _on_circuit_state(state: str) -> None:
+    HF_CIRCUIT_STATE.set(_CIRCUIT_STATE_VALUES[state])
+    logger.warning("HF circuit breaker changed state", state=state)
+
+
+# Shared by every pipeline in the process so one unhealthy endpoint is detected once
+hf_breaker = CircuitBreaker(
+    settings.HF_BREAKER_FAILURE_THRESHOLD,
+    settings.HF_BREAKER_RECOVERY_SECONDS,
+    settings.HF_BREAKER_HALF_OPEN_CALLS,
+    on_state_change=_on_circuit_state,
+)
+hf_latency = LatencyWindow()
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    # Retrying while the circuit is open or probing only piles more load on the endpoint
+    return isinstance(exc, (httpx.RequestError, MCPClientError)) and hf_breaker.state == CLOSED
+
+
+def _hedge_delay() -> Optional[float]:
+    if not settings.HF_HEDGE_ENABLED or hf_breaker.state != CLOSED:
+        return None
+    if len(hf_latency) < settings.HF_HEDGE_MIN_SAMPLES:
+        return None
+    return hf_latency.percentile(settings.HF_HEDGE_PERCENTILE)
+
+
 async def extract_entities_from_text(text: str, timeout: int = 60) -> Dict[str, Any]:
     """Send text to Hugging Face Inference API and return parsed JSON entities.
     
     Uses an LLM (Mistral/Llama) to extract structured data from resume text.
+    Long resumes are split into section-aware chunks that are extracted
+    concurrently and merged, so latency stays close to a single call.
     """
     if not settings.HF_MCP_TOKEN:
         logger.error("HF_MCP_TOKEN is not configured")
         raise MCPClientError("Hugging Face API token not configured")
 
+    chunks = chunk_resume(text, settings.HF_CHUNK_MAX_TOKENS, settings.HF_MAX_CHUNKS)
+    if len(chunks) <= 1:
+        return await _extract_chunk(chunks[0] if chunks else text, timeout)
+
+    semaphore = asyncio.Semaphore(settings.HF_CHUNK_CONCURRENCY)
+
+    async def bounded(chunk: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await _extract_chunk(chunk, timeout)
+
+    results = await asyncio.gather(*(bounded(chunk) for chunk in chunks), return_exceptions=True)
+    partials = [result for result in results if isinstance(result, dict)]
+    if not partials:
+        raise results[0]
+    logger.info(
+        "Merged chunked extraction",
+        chunks=len(chunks),
+        failed=len(chunks) - len(partials),
+        tokens=estimate_tokens(text),
+    )
+    return merge_entities(partials)
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10),
+       retry=retry_if_exception(_is_retryable),
+       before_sleep=count_hf_retry)
+async def _extract_chunk(text: str, timeout: int = 60) -> Dict[str, Any]:
+    if not hf_breaker.allow():
+        HF_CIRCUIT_REJECTED_TOTAL.inc()
+        raise MCPCircuitOpenError("HF circuit breaker is open, skipping inference call")
+    try:
+        entities = await _request_entities(text, timeout)
+    except (httpx.RequestError, MCPUnavailableError):
+        hf_breaker.record_failure()
+        raise
+    except MCPClientError:
+        # The endpoint answered, so a bad token or unparseable output says nothing about its health
+        hf_breaker.record_success()
+        raise
+    except BaseException:
+        hf_breaker.release()
+        raise
+    hf_breaker.record_success()
+    return entities
+
+
+async def _request_entities(text: str, timeout: int) -> Dict[str, Any]:
     model_url = f"{settings.HF_MCP_URL.rstrip('/')}/{settings.HF_MODEL_ID}"
     headers = {"Authorization": f"Bearer {settings.HF_MCP_TOKEN}"}
     
@@ -34,7 +132,7 @@ async def extract_entities_from_text(text: str, timeout: int = 60) -> Dict[str,
 - positions (list of job titles the candidate is qualified for)
 
 Resume Text:
-{text[:3000]} [/INST]</s>"""
+{text[:settings.HF_CHUNK_MAX_TOKENS * 4]} [/INST]</s>"""
 
     payload = {
         "inputs": prompt,
@@ -49,10 +147,22 @@ Resume Text:
 
     try:
         async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(model_url, json=payload, headers=headers)
-            if resp.status_code != 200:
-                logger.error("HF API error", status=resp.status_code, response=resp.text)
-            resp.raise_for_status()
+            async def post() -> httpx.Response:
+                start = time.perf_counter()
+                try:
+                    resp = await client.post(model_url, json=payload, headers=headers)
+                except httpx.RequestError:
+                    HF_REQUESTS_TOTAL.labels("network_error").inc()
+                    raise
+                finally:
+                    HF_REQUEST_SECONDS.observe(time.perf_counter() - start)
+                HF_REQUESTS_TOTAL.labels(str(resp.status_code)).inc()
+                # Raise so a fast error from one attempt does not beat a slower success from the other
+                resp.raise_for_status()
+                hf_latency.observe(time.perf_counter() - start)
+                return resp
+
+            resp = await hedged(post, _hedge_delay(), on_hedge=HF_HEDGED_REQUESTS_TOTAL.inc)
             
             # The API usually returns a list with the generated text
             result = resp.json()
@@ -74,11 +184,13 @@ Resume Text:
         logger.error("HF API returned bad status", status=status_code, text=response_text)
         
         if status_code == 503:
-            raise MCPClientError("HF Model is currently loading, please try again in a few seconds")
+            raise MCPUnavailableError("HF Model is currently loading, please try again in a few seconds")
         elif status_code == 401:
             raise MCPClientError("HF API token is invalid or expired")
         elif status_code == 429:
-            raise MCPClientError("HF API rate limit exceeded")
+            raise MCPUnavailableError("HF API rate limit exceeded")
+        elif status_code >= 500:
+            raise MCPUnavailableError(f"HF API error: {status_code}")
         
         raise MCPClientError(f"HF API error: {status_code}")
     except json.JSONDecodeError:
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+MAX_KEY_LENGTH = 255
+
+
+def request_key(idempotency_key: Optional[str], text: str, email: str) -> str:
+    """Dedupe identity of an ingest request: the client's key, else a hash of its content."""
+    if idempotency_key and idempotency_key.strip():
+        return "key:" + idempotency_key.strip()[:MAX_KEY_LENGTH]
+    digest = hashlib.sha256(f"{(email or '').strip().lower()}\0{text or ''}".encode()).hexdigest()
+    return "sha256:" + digest
+
+
+class MemoryIdempotencyStore:
+    """Per-worker TTL store of ingest keys -> job record, bounded to ``max_keys``.
+
+    ``claim`` never awaits between its check and its write, so concurrent
+    duplicates on one event loop always coalesce onto the first claim.
+    """
+
+    def __init__(self, ttl_seconds: float, max_keys: int = 100_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self._records: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+    def _get(self, key: str) -> Optional[Dict]:
+        entry = self._records.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._records[key]
+            return None
+        return entry[1]
+
+    async def claim(self, key: str, record: Dict) -> Optional[Dict]:
+        """Store ``record`` under ``key`` unless it is taken; return the existing record if so."""
+        existing = self._get(key)
+        if existing is not None:
+            return existing
+        self._records[key] = (time.monotonic() + self.ttl_seconds, dict(record))
+        while len(self._records) > self.max_keys:
+            self._records.popitem(last=False)
+        return None
+
+    async def update(self, key: str, **changes) -> None:
+        record = self._get(key)
+        if record is not None:
+            record.update(changes)
+
+    async def release(self, key: str) -> None:
+        self._records.pop(key, None)
+
+
+class RedisIdempotencyStore:
+    """The same store shared by every worker; ``claim`` is a single SET NX."""
+
+    def __init__(self, url: str, ttl_seconds: float, prefix: str = "idempotency"):
+        import redis.asyncio as redis
+
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+
+    async def claim(self, key: str, record: Dict) -> Optional[Dict]:
+        name = f"{self.prefix}:{key}"
+        ttl = max(1, int(self.ttl_seconds))
+        while True:
+            if await self._client.set(name, json.dumps(record), nx=True, ex=ttl):
+                return None
+            existing = await self._client.get(name)
+            # None means it expired between the two calls; try to claim it again
+            if existing is not None:
+                return json.loads(existing)
+
+    async def update(self, key: str, **changes) -> None:
+        name = f"{self.prefix}:{key}"
+        existing = await self._client.get(name)
+        if existing is not None:
+            await self._client.set(name, json.dumps({**json.loads(existing), **changes}), xx=True, keepttl=True)
+
+    async def release(self, key: str) -> None:
+        await self._client.delete(f"{self.prefix}:{key}")
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def build_idempotency_store():
+    if settings.IDEMPOTENCY_BACKEND == "redis":
+        return RedisIdempotencyStore(settings.REDIS_URL, settings.IDEMPOTENCY_TTL_SECONDS)
+    return MemoryIdempotencyStore(settings.IDEMPOTENCY_TTL_SECONDS)
+
+
+idempotency_store = build_idempotency_store()
@@ -0,0 +1,143 @@
+import re
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.resume_chunker import as_list, parse_years
+
+logger = get_logger("job_ranker")
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+# Title keyword -> seniority level (0 entry, 1 mid, 2 senior, 3 staff+)
+_LEVEL_WORDS = {
+    "intern": 0, "internship": 0, "junior": 0, "jr": 0, "entry": 0, "graduate": 0, "associate": 0,
+    "senior": 2, "sr": 2,
+    "staff": 3, "principal": 3, "lead": 3, "architect": 3, "head": 3, "director": 3,
+}
+# Fields of a scraped job that carry signal, with their term weight
+JOB_FIELDS = (("title", 3.0), ("description", 1.0), ("company", 0.5))
+POSITION_WEIGHT = 2.0
+SKILL_WEIGHT = 1.0
+# Score multiplier lost per seniority level between candidate and posting
+LEVEL_PENALTY = 0.15
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word unigrams plus adjacent bigrams ("backend engineer")."""
+    words = _TOKEN_RE.findall((text or "").lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _feature(token: str, n_features: int) -> int:
+    # crc32 rather than hash(): stable across processes and PYTHONHASHSEED
+    return zlib.crc32(token.encode()) % n_features
+
+
+@lru_cache(maxsize=16384)
+def _text_features(text: str, n_features: int) -> Tuple[int, ...]:
+    # Titles and company names repeat heavily across postings and searches
+    return tuple(_feature(token, n_features) for token in tokenize(text))
+
+
+def candidate_level(years: Optional[float]) -> Optional[int]:
+    if years is None:
+        return None
+    if years < 2:
+        return 0
+    if years < 5:
+        return 1
+    if years < 8:
+        return 2
+    return 3
+
+
+@lru_cache(maxsize=4096)
+def title_level(title: str) -> int:
+    levels = [_LEVEL_WORDS[word] for word in _TOKEN_RE.findall((title or "").lower()) if word in _LEVEL_WORDS]
+    return max(levels) if levels else 1
+
+
+def _job_matrix(jobs: Sequence[Dict[str, Any]], n_features: int):
+    import numpy as np
+    from scipy import sparse
+
+    indptr, cols, weights = [0], [], []
+    for job in jobs:
+        for field, weight in JOB_FIELDS:
+            features = _text_features(job.get(field) or "", n_features)
+            cols.extend(features)
+            weights.extend([weight] * len(features))
+        indptr.append(len(cols))
+    matrix = sparse.csr_matrix(
+        (np.asarray(weights, dtype=np.float32), np.asarray(cols, dtype=np.int32), np.asarray(indptr)),
+        shape=(len(jobs), n_features),
+    )
+    # Repeated features within a row become weighted term counts
+    matrix.sum_duplicates()
+    matrix.data = 1.0 + np.log(matrix.data, dtype=np.float32)
+    return matrix
+
+
+def _query_vector(entities: Dict[str, Any], n_features: int):
+    import numpy as np
+
+    query = np.zeros(n_features, dtype=np.float32)
+    for field, weight in (("positions", POSITION_WEIGHT), ("top_skills", SKILL_WEIGHT)):
+        for value in as_list(entities.get(field)):
+            for feature in _text_features(value, n_features):
+                query[feature] += weight
+    return query
+
+
+def score_jobs(jobs: Sequence[Dict[str, Any]], entities: Dict[str, Any],
+               n_features: Optional[int] = None) -> List[float]:
+    """Cosine similarity of each job against the candidate, adjusted for seniority.
+
+    Jobs and the candidate profile are hashed into one sparse feature space,
+    weighted by IDF over the batch of jobs (so "engineer" on every posting
+    counts for little), L2-normalised and scored with a single sparse
+    matrix-vector product.
+    """
+    import numpy as np
+
+    if not jobs:
+        return []
+    n_features = n_features or settings.RANKING_HASH_FEATURES
+    matrix = _job_matrix(jobs, n_features)
+    query = _query_vector(entities, n_features)
+
+    doc_freq = np.bincount(matrix.indices, minlength=n_features)
+    idf = (np.log((1.0 + len(jobs)) / (1.0 + doc_freq)) + 1.0).astype(np.float32)
+    matrix = matrix.multiply(idf).tocsr()
+    query *= idf
+
+    query_norm = np.linalg.norm(query)
+    if not query_norm:
+        return [0.0] * len(jobs)
+    row_norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    row_norms[row_norms == 0] = 1.0
+    scores = (matrix @ query) / (row_norms * query_norm)
+
+    level = candidate_level(parse_years(entities.get("years_of_experience")))
+    if level is not None:
+        gaps = np.abs(np.array([title_level(job.get("title") or "") for job in jobs]) - level)
+        scores *= np.clip(1.0 - LEVEL_PENALTY * gaps, 0.0, 1.0)
+    return scores.tolist()
+
+
+def rank_jobs(jobs: Sequence[Dict[str, Any]], entities: Dict[str, Any], top_k: Optional[int] = None,
+              min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Return the best ``top_k`` jobs scoring at least ``min_score``, best first, each with a ``score``."""
+    top_k = settings.RANKING_TOP_K if top_k is None else top_k
+    min_score = settings.RANKING_MIN_SCORE if min_score is None else min_score
+    scores = score_jobs(jobs, entities)
+    ranked = sorted(
+        ({**job, "score": round(score, 4)} for job, score in zip(jobs, scores) if score >= min_score),
+        key=lambda job: job["score"],
+        reverse=True,
+    )
+    logger.info("Ranked jobs", candidates=len(jobs), kept=min(len(ranked), top_k),
+                best=ranked[0]["score"] if ranked else None)
+    return ranked[:top_k]
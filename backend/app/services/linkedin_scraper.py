@@ -1,10 +1,13 @@
 import asyncio
 import random
-from typing import List, Optional
+import time
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
 import httpx
-from bs4 import BeautifulSoup
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import SCRAPER_FETCH_SECONDS, proxy_label
+from app.utils.fanout import fan_out
 
 logger = get_logger("linkedin_scraper")
 
@@ -13,6 +16,16 @@ class ScraperError(Exception):
     pass
 
 
+def job_key(job: dict, page_url: str) -> Tuple[str, ...]:
+    """Identity of a posting across searches: its URL without tracking params."""
+    url = job.get("url") or ""
+    if url and url != page_url:
+        parsed = urlparse(url)
+        return (parsed.netloc.lower(), parsed.path.rstrip("/"))
+    # Cards without a link fall back to the page URL, which identifies nothing
+    return ((job.get("title") or "").casefold(), (job.get("company") or "").casefold())
+
+
 class PoliteLinkedInScraper:
     def __init__(self, concurrency: int = None, proxies: Optional[List[str]] = None):
         self.concurrency = concurrency or settings.SCRAPER_CONCURRENCY
@@ -24,6 +37,8 @@ class PoliteLinkedInScraper:
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
+        start = time.perf_counter()
+        outcome = "error"
         try:
             if proxy:
                 # httpx requires proxies to be set at client initialization.
@@ -31,36 +46,45 @@ class PoliteLinkedInScraper:
                 async with httpx.AsyncClient(proxies=proxy, timeout=30) as client:
                     resp = await client.get(url, headers=headers)
                     resp.raise_for_status()
+                    outcome = "ok"
                     return resp.text
             else:
                 resp = await self.client.get(url, headers=headers)
                 resp.raise_for_status()
+                outcome = "ok"
                 return resp.text
         except httpx.HTTPStatusError as e:
+            outcome = str(e.response.status_code)
             logger.error("HTTP error while fetching", url=url, status=e.response.status_code)
             raise ScraperError(str(e))
         except httpx.RequestError as e:
             logger.exception("Network error while fetching %s", url)
             raise
+        finally:
+            SCRAPER_FETCH_SECONDS.labels(
+                urlparse(url).hostname or "unknown", proxy_label(proxy), outcome
+            ).observe(time.perf_counter() - start)
 
     async def search_jobs(self, query_urls: List[str], max_results: int = 10) -> List[dict]:
         """Search multiple LinkedIn job listing pages (or other job pages) and extract simple job metadata.
 
         IMPORTANT: This implementation does not log into LinkedIn and is intended for public job pages only.
         Use polite scraping configuration (delays, proxies) and respect robots.txt.
+
+        Pages are fetched concurrently (bounded by the scraper's semaphore) and
+        postings that show up on several pages are merged by job URL.
         """
-        tasks = [self._scrape_job_page(url) for url in query_urls]
-        results = []
-        for coro in asyncio.as_completed(tasks):
-            try:
-                r = await coro
-                if r:
-                    results.extend(r)
-            except Exception:
-                logger.exception("Error scraping a page")
-            if len(results) >= max_results:
-                break
-        return results[:max_results]
+        summary = await fan_out(dict.fromkeys(query_urls), self._scrape_job_page, self.concurrency)
+        for failure in summary.failures:
+            logger.opt(exception=failure.error).error("Error scraping a page", url=failure.item)
+
+        results = {}
+        for page in summary.results:
+            for job in page.value or []:
+                results.setdefault(job_key(job, page.item), job)
+        logger.info("Job search finished", pages=len(summary.results), failed=len(summary.failures),
+                    jobs=len(results))
+        return list(results.values())[:max_results]
 
     async def _scrape_job_page(self, url: str) -> List[dict]:
         async with self.semaphore:
@@ -73,6 +97,9 @@ class PoliteLinkedInScraper:
             return self._parse_job_listings(html, url)
 
     def _parse_job_listings(self, html: str, base_url: str) -> List[dict]:
+        # Imported lazily: bs4 + lxml are only needed by pipeline workers
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html, "lxml")
         jobs = []
         
@@ -108,3 +135,21 @@ class PoliteLinkedInScraper:
 
     async def close(self):
         await self.client.aclose()
+
+
+_shared_scraper: Optional[PoliteLinkedInScraper] = None
+
+
+def get_shared_scraper() -> PoliteLinkedInScraper:
+    """The process-wide scraper, so connections and the politeness limit span pipeline jobs."""
+    global _shared_scraper
+    if _shared_scraper is None:
+        _shared_scraper = PoliteLinkedInScraper()
+    return _shared_scraper
+
+
+async def close_shared_scraper() -> None:
+    global _shared_scraper
+    if _shared_scraper is not None:
+        scraper, _shared_scraper = _shared_scraper, None
+        await scraper.close()
@@ -0,0 +1,267 @@
+"""Transactional-outbox dispatcher for pending ``email_logs`` rows.
+
+Any number of dispatcher processes, on any number of nodes, claim disjoint
+batches with ``SELECT ... FOR UPDATE SKIP LOCKED`` and lease them for
+``OUTBOX_LEASE_SECONDS``. Rows whose lease expires (crashed worker) become
+claimable again. The per-user and per-domain caps hold across dispatchers
+when ``RATE_LIMIT_BACKEND`` is "redis"; in memory each process has its own. On SQLite the locking clause is not emitted and the
+database-level write lock serializes claims instead, which is fine for
+local testing.
+
+    python -m app.services.outbox --processes 4
+"""
+import argparse
+import asyncio
+import inspect
+import multiprocessing
+import os
+import socket
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.admission import build_limiter
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.database import SessionLocal
+from app.models.campaign import Campaign, CampaignStatus, Contact, EmailLog
+from app.services.body_store import load_bodies
+from app.services.email_transport import (
+    EmailTransport,
+    OutgoingMessage,
+    SendResult,
+    get_transport,
+    record_send_results,
+)
+
+logger = get_logger("outbox")
+
+
+@dataclass
+class ClaimedLog:
+    id: UUID
+    user_id: UUID
+    to_email: str
+    subject: str
+    body: str
+    attempts: int
+
+    @property
+    def domain(self) -> str:
+        return self.to_email.rsplit("@", 1)[-1].lower()
+
+
+async def _maybe_await(value):
+    # RedisTokenBuckets is async, KeyedTokenBuckets is not
+    return await value if inspect.isawaitable(value) else value
+
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        transport: Optional[EmailTransport] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        per_user_per_minute: Optional[int] = None,
+        per_domain_per_minute: Optional[int] = None,
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.lease = timedelta(seconds=lease_seconds or settings.OUTBOX_LEASE_SECONDS)
+        self.transport = transport or get_transport()
+        self.session_factory = session_factory
+        self.user_limits = build_limiter(
+            settings.OUTBOX_PER_USER_PER_MINUTE if per_user_per_minute is None else per_user_per_minute,
+            prefix="outbox:user",
+        )
+        self.domain_limits = build_limiter(
+            settings.OUTBOX_PER_DOMAIN_PER_MINUTE if per_domain_per_minute is None else per_domain_per_minute,
+            prefix="outbox:domain",
+        )
+
+    def claim(self, db: Session) -> List[ClaimedLog]:
+        """Lease up to ``batch_size`` pending (or lease-expired) logs for this worker."""
+        now = datetime.utcnow()
+        claimable = and_(
+            EmailLog.status.in_(("pending", "sending")),
+            or_(EmailLog.lease_expires_at.is_(None), EmailLog.lease_expires_at <= now),
+            Campaign.status.is_distinct_from(CampaignStatus.DELETING),
+        )
+        rows = db.execute(
+            select(
+                EmailLog.id,
+                Campaign.user_id,
+                Contact.email,
+                EmailLog.email_subject,
+                EmailLog.email_body,
+                EmailLog.attempts,
+                EmailLog.body_hash,
+            )
+            .join(Contact, EmailLog.contact_id == Contact.id)
+            .join(Campaign, EmailLog.campaign_id == Campaign.id)
+            .where(claimable)
+            .order_by(EmailLog.created_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True, of=EmailLog)
+        ).all()
+        if not rows:
+            db.rollback()
+            return []
+
+        table = EmailLog.__table__
+        db.execute(
+            update(table)
+            .where(table.c.id.in_([row[0] for row in rows]))
+            .values(
+                status="sending",
+                lease_owner=self.worker_id,
+                lease_expires_at=now + self.lease,
+                attempts=func.coalesce(table.c.attempts, 0) + 1,
+            )
+        )
+        bodies = load_bodies(db, [row[6] for row in rows if row[4] is None])
+        db.commit()
+        return [
+            ClaimedLog(
+                *row[:4],
+                body=row[4] if row[4] is not None else bodies.get(row[6], ""),
+                attempts=(row[5] or 0) + 1,
+            )
+            for row in rows
+        ]
+
+    def release(self, db: Session, delays: List[Tuple[UUID, float]]) -> None:
+        """Hand throttled logs back as pending, not claimable before their delay."""
+        if not delays:
+            return
+        now = datetime.utcnow()
+        table = EmailLog.__table__
+        db.execute(
+            update(table)
+            .where(and_(table.c.id == bindparam("b_id"), table.c.lease_owner == self.worker_id))
+            .values(
+                status="pending",
+                lease_owner=None,
+                lease_expires_at=bindparam("b_not_before"),
+                attempts=table.c.attempts - 1,
+            ),
+            [{"b_id": log_id, "b_not_before": now + timedelta(seconds=delay)} for log_id, delay in delays],
+        )
+        db.commit()
+
+    async def _throttle(self, claimed: List[ClaimedLog]) -> Tuple[List[ClaimedLog], List[Tuple[UUID, float]]]:
+        allowed, delayed = [], []
+        for log in claimed:
+            wait = await _maybe_await(self.domain_limits.try_acquire(log.domain))
+            if not wait:
+                wait = await _maybe_await(self.user_limits.try_acquire(log.user_id))
+                if wait:
+                    await _maybe_await(self.domain_limits.refund(log.domain))
+            if wait:
+                delayed.append((log.id, wait))
+            else:
+                allowed.append(log)
+        return allowed, delayed
+
+    def _claim_batch(self) -> Tuple[List[ClaimedLog], List[SendResult]]:
+        db = self.session_factory()
+        try:
+            claimed = self.claim(db)
+        finally:
+            db.close()
+        exhausted = [log for log in claimed if log.attempts > settings.OUTBOX_MAX_ATTEMPTS]
+        failed = [
+            SendResult(OutgoingMessage(log.to_email, log.subject, log.body, log_id=log.id),
+                       error="Exceeded maximum dispatch attempts")
+            for log in exhausted
+        ]
+        return [log for log in claimed if log.attempts <= settings.OUTBOX_MAX_ATTEMPTS], failed
+
+    def _release(self, delays: List[Tuple[UUID, float]]) -> None:
+        db = self.session_factory()
+        try:
+            self.release(db, delays)
+        finally:
+            db.close()
+
+    def _record(self, results: List[SendResult]) -> None:
+        db = self.session_factory()
+        try:
+            record_send_results(db, results)
+        finally:
+            db.close()
+
+    async def dispatch_once(self) -> int:
+        """Claim, send and record one batch. Returns the number of logs finished."""
+        claimed, results = await asyncio.to_thread(self._claim_batch)
+        try:
+            allowed, delayed = await self._throttle(claimed)
+        except Exception:
+            # Without the shared limiter the caps cannot be checked; try the batch again shortly
+            logger.warning("Outbox rate limiter unavailable, deferring batch", worker=self.worker_id)
+            allowed, delayed = [], [(log.id, settings.OUTBOX_POLL_INTERVAL_MS / 1000.0) for log in claimed]
+        if delayed:
+            await asyncio.to_thread(self._release, delayed)
+        if allowed:
+            messages = [
+                OutgoingMessage(log.to_email, log.subject, log.body, log_id=log.id)
+                for log in allowed
+            ]
+            results.extend(await self.transport.send_batch(messages))
+        if results:
+            await asyncio.to_thread(self._record, results)
+            logger.info(
+                "Dispatched outbox batch",
+                worker=self.worker_id,
+                sent=sum(1 for r in results if r.ok),
+                failed=sum(1 for r in results if not r.ok),
+            )
+        return len(results)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        poll_interval = settings.OUTBOX_POLL_INTERVAL_MS / 1000.0
+        logger.info("Outbox dispatcher started", worker=self.worker_id)
+        try:
+            while not stop.is_set():
+                try:
+                    done = await self.dispatch_once()
+                except Exception:
+                    logger.exception("Outbox dispatch failed")
+                    done = 0
+                if not done:
+                    try:
+                        await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self.transport.close()
+
+
+def _run_worker() -> None:
+    asyncio.run(OutboxDispatcher().run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run outbox dispatcher workers")
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+    if args.processes == 1:
+        _run_worker()
+        return
+    workers = [multiprocessing.Process(target=_run_worker) for _ in range(args.processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import JOB_EVENT_STREAMS
+from app.db.database import SessionLocal
+from app.models.pipeline_job import PipelineJob, PipelineStage
+
+logger = get_logger("pipeline_jobs")
+
+
+def _event(job_id, stage, detail, error_message, updated_at) -> Dict[str, Any]:
+    return {
+        "job_id": str(job_id),
+        "stage": PipelineStage(stage).value,
+        "detail": detail or {},
+        "error": error_message,
+        "updated_at": updated_at.isoformat() if updated_at else None,
+    }
+
+
+def create_job(job_id: str, email: str) -> None:
+    db = SessionLocal()
+    try:
+        db.add(PipelineJob(id=UUID(job_id), email=email, stage=PipelineStage.QUEUED))
+        db.commit()
+    finally:
+        db.close()
+
+
+def load_job_states(job_ids: Iterable[str]) -> List[Dict[str, Any]]:
+    ids = [UUID(job_id) for job_id in job_ids]
+    if not ids:
+        return []
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(PipelineJob.id, PipelineJob.stage, PipelineJob.detail,
+                   PipelineJob.error_message, PipelineJob.updated_at)
+            .where(PipelineJob.id.in_(ids))
+        ).all()
+    finally:
+        db.close()
+    return [_event(*row) for row in rows]
+
+
+def _save_stage(job_id: str, stage: PipelineStage, detail: Dict[str, Any], error: Optional[str]) -> datetime:
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(PipelineJob)
+            .where(PipelineJob.id == UUID(job_id))
+            .values(stage=stage, detail=detail, error_message=error, updated_at=now)
+        )
+        db.commit()
+    finally:
+        db.close()
+    return now
+
+
+async def set_stage(job_id: Optional[str], stage: PipelineStage, error: Optional[str] = None, **detail) -> None:
+    """Persist a job's stage and push it to any open event streams.
+
+    Progress reporting never fails the pipeline: a failed write is logged
+    and the transition is still broadcast to this worker's listeners.
+    """
+    if not job_id:
+        return
+    try:
+        updated_at = await asyncio.to_thread(_save_stage, job_id, stage, detail, error)
+    except Exception:
+        logger.exception("Failed to record pipeline stage", job_id=job_id, stage=stage.value)
+        updated_at = datetime.utcnow()
+    job_events.publish(_event(job_id, stage, detail, error, updated_at))
+
+
+class JobEventBroadcaster:
+    """Fans job stage transitions out to every open stream watching that job.
+
+    Each stream owns a small queue, so a publish touches only that job's
+    listeners and never blocks on a slow client (its oldest event is dropped
+    instead). Transitions made by other workers are picked up by one poller
+    per worker that reads all watched jobs in a single query every
+    ``poll_seconds``, rather than one poll per stream.
+    """
+
+    def __init__(self, poll_seconds: float, queue_size: int = 16):
+        self.poll_seconds = poll_seconds
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._last_stage: Dict[str, str] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        JOB_EVENT_STREAMS.inc()
+        if self.poll_seconds and (self._poller is None or self._poller.done()
+                                  or self._poller.get_loop() is not asyncio.get_running_loop()):
+            self._poller = asyncio.create_task(self._poll())
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(job_id)
+        if queues is None or queue not in queues:
+            return
+        queues.discard(queue)
+        JOB_EVENT_STREAMS.dec()
+        if not queues:
+            del self._subscribers[job_id]
+            self._last_stage.pop(job_id, None)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        job_id = event["job_id"]
+        queues = self._subscribers.get(job_id)
+        if not queues or self._last_stage.get(job_id) == event["stage"]:
+            return
+        self._last_stage[job_id] = event["stage"]
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _poll(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                states = await asyncio.to_thread(load_job_states, list(self._subscribers))
+            except Exception:
+                logger.exception("Failed to poll pipeline job states")
+                continue
+            for state in states:
+                self.publish(state)
+
+
+job_events = JobEventBroadcaster(settings.JOB_EVENTS_POLL_SECONDS)
@@ -0,0 +1,189 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Integer, bindparam, case, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.models.campaign import Campaign, Contact, EmailLog
+from app.services.body_store import store_bodies
+from app.services.suppression import add_suppressions
+
+logger = get_logger("provider_events")
+
+# Delivery states only ever move forward, so replayed or out-of-order events
+# cannot downgrade a log (e.g. a late "delivered" after a "bounce").
+STATUS_RANK = {
+    "pending": 0,
+    "sent": 1,
+    "delivered": 2,
+    "bounced": 3,
+}
+
+EVENT_STATUS = {
+    "delivered": "delivered",
+    "bounce": "bounced",
+    "dropped": "bounced",
+}
+
+
+def _message_id(event: Dict[str, Any]) -> Optional[str]:
+    # sg_message_id is the X-Message-Id we stored plus a ".filterNNNN..." suffix
+    raw = event.get("sg_message_id") or event.get("smtp-id")
+    if not raw:
+        return None
+    return str(raw).strip("<>").split(".filter")[0]
+
+
+def _event_time(event: Dict[str, Any]) -> datetime:
+    ts = event.get("timestamp")
+    try:
+        return datetime.utcfromtimestamp(int(ts))
+    except (TypeError, ValueError, OverflowError, OSError):
+        # A malformed timestamp must not fail (and so replay) the whole batch
+        return datetime.utcnow()
+
+
+def _resolve_log_ids(db: Session, message_ids: List[str]) -> Dict[Tuple[str, Optional[str]], UUID]:
+    """Map (message id, recipient) and unambiguous message ids to log ids in one query."""
+    rows = db.execute(
+        select(EmailLog.id, EmailLog.sendgrid_message_id, Contact.email)
+        .join(Contact, EmailLog.contact_id == Contact.id)
+        .where(EmailLog.sendgrid_message_id.in_(message_ids))
+    ).all()
+
+    resolved: Dict[Tuple[str, Optional[str]], UUID] = {}
+    per_message: Dict[str, List[UUID]] = {}
+    for log_id, message_id, email in rows:
+        resolved[(message_id, email.lower())] = log_id
+        per_message.setdefault(message_id, []).append(log_id)
+    # Batch sends share one X-Message-Id, so the bare id is only usable when unique
+    for message_id, log_ids in per_message.items():
+        if len(log_ids) == 1:
+            resolved[(message_id, None)] = log_ids[0]
+    return resolved
+
+
+def _merge(changes: Dict[str, Any], event_type: str, event: Dict[str, Any]) -> None:
+    at = _event_time(event)
+    status = EVENT_STATUS.get(event_type)
+    if status and STATUS_RANK[status] > changes["b_rank"]:
+        changes["b_rank"] = STATUS_RANK[status]
+        changes["b_status"] = status
+    if status == "bounced" and changes["b_error"] is None:
+        changes["b_error"] = event.get("reason") or event.get("response") or event_type
+
+    def earliest(key: str) -> None:
+        if changes[key] is None or at < changes[key]:
+            changes[key] = at
+
+    if event_type in ("open", "click", "reply"):
+        earliest("b_opened_at")
+    if event_type == "click":
+        earliest("b_clicked_at")
+    if event_type == "reply":
+        earliest("b_replied_at")
+        if changes["b_reply"] is None:
+            changes["b_reply"] = event.get("text") or event.get("reply_content")
+
+
+def apply_provider_events(db: Session, events: List[Dict[str, Any]]) -> int:
+    """Apply a batch of SendGrid-style webhook events to ``email_logs``.
+
+    Message ids are resolved in one indexed query and all state transitions
+    are written with a single executemany UPDATE. Transitions are monotonic,
+    so re-delivered batches are no-ops. Returns the number of logs touched.
+    """
+    seen_event_ids = set()
+    keyed: List[Tuple[str, Optional[str], str, Dict[str, Any]]] = []
+    for event in events:
+        event_id = event.get("sg_event_id")
+        if event_id:
+            if event_id in seen_event_ids:
+                continue
+            seen_event_ids.add(event_id)
+        message_id = _message_id(event)
+        event_type = str(event.get("event", "")).lower()
+        if not message_id or not event_type:
+            continue
+        email = event.get("email")
+        keyed.append((message_id, email.lower() if email else None, event_type, event))
+
+    if not keyed:
+        return 0
+
+    resolved = _resolve_log_ids(db, sorted({k[0] for k in keyed}))
+    per_log: Dict[UUID, Dict[str, Any]] = {}
+    unresolved = 0
+    for message_id, email, event_type, event in keyed:
+        log_id = resolved.get((message_id, email)) or resolved.get((message_id, None))
+        if log_id is None:
+            unresolved += 1
+            continue
+        changes = per_log.setdefault(log_id, {
+            "b_id": log_id,
+            "b_rank": 0,
+            "b_status": None,
+            "b_error": None,
+            "b_opened_at": None,
+            "b_clicked_at": None,
+            "b_replied_at": None,
+            "b_reply": None,
+        })
+        _merge(changes, event_type, event)
+
+    if unresolved:
+        logger.warning("Ignored provider events for unknown messages", count=unresolved)
+    if not per_log:
+        return 0
+    replies = [changes.pop("b_reply") for changes in per_log.values()]
+    for changes, digest in zip(per_log.values(), store_bodies(db, replies)):
+        changes["b_reply_hash"] = digest
+
+    table = EmailLog.__table__
+    current_rank = case(STATUS_RANK, value=table.c.status, else_=0)
+    rank = bindparam("b_rank", type_=Integer)
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            status=case((current_rank < rank, bindparam("b_status")), else_=table.c.status),
+            error_message=func.coalesce(table.c.error_message, bindparam("b_error")),
+            is_opened=or_(table.c.is_opened, bindparam("b_opened_at").is_not(None)),
+            opened_at=func.coalesce(table.c.opened_at, bindparam("b_opened_at")),
+            is_clicked=or_(table.c.is_clicked, bindparam("b_clicked_at").is_not(None)),
+            clicked_at=func.coalesce(table.c.clicked_at, bindparam("b_clicked_at")),
+            is_replied=or_(table.c.is_replied, bindparam("b_replied_at").is_not(None)),
+            replied_at=func.coalesce(table.c.replied_at, bindparam("b_replied_at")),
+            reply_hash=func.coalesce(table.c.reply_hash, bindparam("b_reply_hash")),
+        )
+    )
+    db.execute(stmt, list(per_log.values()))
+    _suppress_recipients(db, per_log.values())
+    db.commit()
+    logger.info("Applied provider events", events=len(keyed), logs=len(per_log))
+    return len(per_log)
+
+
+def _suppress_recipients(db: Session, changes: Iterable[Dict[str, Any]]) -> None:
+    """Put bounced and replying recipients on their sender's suppression list."""
+    reasons = {}
+    for change in changes:
+        if change["b_status"] == "bounced":
+            reasons[change["b_id"]] = "bounce"
+        elif change["b_replied_at"] is not None:
+            reasons[change["b_id"]] = "reply"
+    if not reasons:
+        return
+    rows = db.execute(
+        select(EmailLog.id, Campaign.user_id, Contact.email)
+        .join(Contact, EmailLog.contact_id == Contact.id)
+        .join(Campaign, EmailLog.campaign_id == Campaign.id)
+        .where(EmailLog.id.in_(list(reasons)))
+    ).all()
+    grouped: Dict[Tuple[UUID, str], List[str]] = {}
+    for log_id, user_id, email in rows:
+        grouped.setdefault((user_id, reasons[log_id]), []).append(email)
+    for (user_id, reason), emails in grouped.items():
+        add_suppressions(db, user_id, emails, reason)
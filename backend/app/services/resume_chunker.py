@@ -0,0 +1,184 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Canonical section -> heading words seen on real resumes
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "professional summary", "about me", "objective", "overview"),
+    "skills": ("skills", "technical skills", "core competencies", "technologies", "tech stack", "expertise"),
+    "experience": ("experience", "work experience", "professional experience", "employment history",
+                   "work history", "employment", "career history"),
+    "projects": ("projects", "personal projects", "selected projects", "open source"),
+    "education": ("education", "academic background", "qualifications"),
+    "certifications": ("certifications", "certificates", "licenses", "awards", "achievements"),
+    "ignored": ("references", "hobbies", "interests", "personal details", "declaration"),
+}
+# Order in which sections are worth spending the token budget on. The
+# header (name, contact line) always goes first so the name is never lost.
+SECTION_PRIORITY = ("header", "summary", "skills", "experience", "projects", "certifications", "education", "other")
+
+_HEADING_LOOKUP = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_RE = re.compile(r"^[\s#*_\-=•]*([A-Za-z][A-Za-z &/]{1,40}?)[\s:*_\-=]*$")
+# Longer first lines are content (or a whole unbroken resume), not a label worth repeating
+MAX_HEADING_CHARS = 80
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+@dataclass
+class Section:
+    name: str
+    text: str
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count: ~4 characters per token for English prose."""
+    return (len(text) + 3) // 4
+
+
+def _heading(line: str) -> Optional[str]:
+    match = _HEADING_RE.match(line)
+    if not match:
+        return None
+    return _HEADING_LOOKUP.get(match.group(1).strip().lower())
+
+
+def split_sections(text: str) -> List[Section]:
+    """Split resume text at recognised section headings, keeping their order."""
+    sections: List[Section] = []
+    name, lines = "header", []
+    for line in text.splitlines():
+        heading = _heading(line)
+        if heading is not None:
+            if any(part.strip() for part in lines):
+                sections.append(Section(name, "\n".join(lines).strip()))
+            name, lines = heading, [line.strip()]
+        else:
+            lines.append(line)
+    if any(part.strip() for part in lines):
+        sections.append(Section(name, "\n".join(lines).strip()))
+    return sections
+
+
+def _cut_line(line: str, max_chars: int) -> List[str]:
+    """Cut an over-long line (e.g. a PDF extracted without newlines) at word boundaries."""
+    parts = []
+    while len(line) > max_chars:
+        cut = line.rfind(" ", max_chars // 2, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        parts.append(line[:cut].rstrip())
+        line = line[cut:].lstrip()
+    parts.append(line)
+    return parts
+
+
+def _split_to_budget(text: str, max_tokens: int) -> List[str]:
+    """Split an oversized section into pieces of at most ``max_tokens``.
+
+    Lines are packed greedily; over-long ones are cut to the full remaining
+    budget. A short first line is taken as the section's heading and
+    repeated in each piece, anything longer is split like the rest.
+    """
+    max_chars = max_tokens * 4
+    heading, _, body = text.partition("\n")
+    if not body or len(heading) > MAX_HEADING_CHARS or len(heading) > max_chars // 4:
+        heading, body = "", text
+    budget = max_chars - (len(heading) + 1 if heading else 0)
+
+    pieces: List[str] = []
+    current: List[str] = []
+    size = 0
+
+    def flush(carry: List[str]) -> None:
+        nonlocal current, size
+        pieces.append("\n".join(([heading] if heading else []) + current))
+        current, size = carry, sum(len(line) + 1 for line in carry) - 1 if carry else 0
+
+    for line in body.splitlines():
+        for part in _cut_line(line, budget):
+            if current and size + 1 + len(part) > budget:
+                # A short last line is usually a role title; keep it with its details
+                carry = []
+                if len(current) > 1 and len(current[-1]) < 80 and len(current[-1]) + 1 + len(part) <= budget:
+                    carry = [current.pop()]
+                flush(carry)
+            size = size + 1 + len(part) if current else len(part)
+            current.append(part)
+    if current or not pieces:
+        flush([])
+    return pieces
+
+
+def chunk_resume(text: str, max_tokens: int, max_chunks: int) -> List[str]:
+    """Pick and pack the most relevant resume sections into at most ``max_chunks`` chunks.
+
+    Short resumes come back as a single chunk. Longer ones are split by
+    section, in priority order (header, summary, skills, experience, ...),
+    with oversized sections split on line (or, failing that, word)
+    boundaries and packed up to ``max_tokens``. Experience keeps its
+    original order, which on resumes is most recent first, so a budget cut
+    drops the oldest roles. Sections like references and hobbies are skipped.
+    """
+    text = text.strip()
+    if estimate_tokens(text) <= max_tokens:
+        return [text] if text else []
+
+    sections = [s for s in split_sections(text) if s.name != "ignored"]
+    sections.sort(key=lambda s: SECTION_PRIORITY.index(s.name))
+
+    chunks: List[str] = []
+    current = ""
+    for section in sections:
+        for piece in _split_to_budget(section.text, max_tokens):
+            candidate = f"{current}\n\n{piece}" if current else piece
+            if estimate_tokens(candidate) <= max_tokens:
+                current = candidate
+                continue
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return [chunk for chunk in chunks if chunk][:max_chunks]
+
+
+def as_list(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()]
+    if isinstance(value, (list, tuple)):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return []
+
+
+def parse_years(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = _NUMBER_RE.search(str(value or ""))
+    return float(match.group()) if match else None
+
+
+def merge_entities(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-chunk extractions in chunk order, independent of completion order.
+
+    Lists are unioned with first-seen order and case-insensitive de-duplication,
+    years of experience takes the largest figure any chunk reported, and other
+    fields keep the first non-empty value.
+    """
+    merged: Dict[str, Any] = {}
+    seen: Dict[str, set] = {}
+    best_years: Optional[float] = None
+    for partial in partials:
+        for key, value in partial.items():
+            if key in ("top_skills", "positions"):
+                items = merged.setdefault(key, [])
+                keys = seen.setdefault(key, set())
+                for item in as_list(value):
+                    if item.lower() not in keys:
+                        keys.add(item.lower())
+                        items.append(item)
+            elif key == "years_of_experience":
+                years = parse_years(value)
+                if years is not None and (best_years is None or years > best_years):
+                    best_years, merged[key] = years, value
+            elif value not in (None, "", [], {}) and key not in merged:
+                merged[key] = value
+    return merged
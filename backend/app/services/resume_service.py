@@ -1,7 +1,5 @@
 import os
 from typing import Dict, Any
-from pdfminer.high_level import extract_text as extract_pdf_text
-from docx import Document
 from app.core.logging import get_logger
 
 logger = get_logger("resume_service")
@@ -12,13 +10,16 @@ def extract_text_from_file(path: str) -> str:
     
     Uses pdfminer.six for PDFs and python-docx for DOCX files to ensure 
     compatibility on Windows without external command-line dependencies.
+    Both are imported on first use; they dominate API worker import time.
     """
     try:
         suffix = os.path.splitext(path)[1].lower()
         
         if suffix == ".pdf":
+            from pdfminer.high_level import extract_text as extract_pdf_text
             text = extract_pdf_text(path)
         elif suffix == ".docx":
+            from docx import Document
             doc = Document(path)
             text = "\n".join([para.text for para in doc.paragraphs])
         elif suffix == ".txt":
@@ -0,0 +1,253 @@
+import asyncio
+import heapq
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.database import SessionLocal, engine
+from app.models.campaign import Campaign, CampaignStatus
+from app.services.campaign_launcher import CampaignTemplateError, launch_campaign
+
+logger = get_logger("scheduler")
+
+SCHEDULE_CHANNEL = "campaign_schedule"
+# Arbitrary application-wide key for pg_try_advisory_lock
+LEADER_LOCK_KEY = 0x52464353
+
+
+def publish_schedule_change(db: Session, campaign: Campaign) -> None:
+    """Queue a NOTIFY for other nodes; Postgres delivers it when ``db`` commits."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    payload = json.dumps({
+        "id": str(campaign.id),
+        "status": CampaignStatus(campaign.status).value if campaign.status else None,
+        "scheduled_time": campaign.scheduled_time.isoformat() if campaign.scheduled_time else None,
+    })
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": SCHEDULE_CHANNEL, "payload": payload})
+
+
+class CampaignScheduler:
+    """Fires scheduled campaigns at their ``scheduled_time`` from an in-memory heap.
+
+    Only the node holding a Postgres advisory lock runs timers. The leader
+    rebuilds the heap from the DB when it takes over and then follows
+    changes through LISTEN/NOTIFY instead of rescanning the table. Other
+    databases (local SQLite) always run as a single leader.
+    """
+
+    def __init__(self, bind: Engine = engine, session_factory: Callable[[], Session] = SessionLocal):
+        self.bind = bind
+        self.session_factory = session_factory
+        self.is_leader = False
+        self._heap: List[Tuple[datetime, str]] = []
+        self._due: Dict[str, datetime] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._leader_conn = None
+
+    # -- schedule bookkeeping -------------------------------------------------
+
+    def on_campaign_changed(self, campaign_id, status, scheduled_time: Optional[datetime]) -> None:
+        # Followers keep no timers; they rebuild from the DB if they take over
+        if not self.is_leader:
+            return
+        campaign_id = str(campaign_id)
+        if scheduled_time is not None and scheduled_time.tzinfo is not None:
+            scheduled_time = scheduled_time.astimezone(timezone.utc).replace(tzinfo=None)
+        if status == CampaignStatus.SCHEDULED and scheduled_time is not None:
+            if self._due.get(campaign_id) != scheduled_time:
+                self._due[campaign_id] = scheduled_time
+                heapq.heappush(self._heap, (scheduled_time, campaign_id))
+        else:
+            self._due.pop(campaign_id, None)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def pop_due(self, now: datetime) -> List[str]:
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            due, campaign_id = heapq.heappop(self._heap)
+            # Entries superseded by a reschedule or cancel are dropped lazily
+            if self._due.get(campaign_id) == due:
+                del self._due[campaign_id]
+                fired.append(campaign_id)
+        return fired
+
+    def next_due(self) -> Optional[datetime]:
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _load_schedule(self) -> List[Tuple[UUID, datetime]]:
+        db = self.session_factory()
+        try:
+            return db.execute(
+                select(Campaign.id, Campaign.scheduled_time).where(
+                    Campaign.status == CampaignStatus.SCHEDULED,
+                    Campaign.scheduled_time.is_not(None),
+                )
+            ).all()
+        finally:
+            db.close()
+
+    async def _rebuild(self) -> None:
+        rows = await asyncio.to_thread(self._load_schedule)
+        self._heap, self._due = [], {}
+        for campaign_id, scheduled_time in rows:
+            self.on_campaign_changed(campaign_id, CampaignStatus.SCHEDULED, scheduled_time)
+        logger.info("Scheduler rebuilt from database", scheduled=len(rows))
+
+    def _fire(self, campaign_id: str) -> None:
+        db = self.session_factory()
+        try:
+            queued = launch_campaign(db, UUID(campaign_id), expected_status=CampaignStatus.SCHEDULED)
+            if queued < 0:
+                logger.info("Scheduled campaign already launched or changed", campaign_id=campaign_id)
+        except CampaignTemplateError:
+            # The campaign is paused until its owner fixes the template; retrying cannot help
+            pass
+        finally:
+            db.close()
+
+    # -- leadership -----------------------------------------------------------
+
+    def _acquire_leadership(self) -> bool:
+        if self.bind.dialect.name != "postgresql":
+            return True
+        raw = self.bind.raw_connection()
+        try:
+            conn = raw.driver_connection
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_lock(%s)", (LEADER_LOCK_KEY,))
+                if not cur.fetchone()[0]:
+                    raw.close()
+                    return False
+                # Subscribe before rebuilding so no change slips between the two
+                cur.execute(f"LISTEN {SCHEDULE_CHANNEL}")
+        except Exception:
+            raw.invalidate()
+            raise
+        self._leader_conn = raw
+        return True
+
+    def _leader_alive(self) -> bool:
+        # Runs on the loop thread: the LISTEN reader polls this same socket, so
+        # querying it from a worker thread would race with _on_notify.
+        if self._leader_conn is None:
+            return True
+        try:
+            with self._leader_conn.driver_connection.cursor() as cur:
+                cur.execute("SELECT 1")
+        except Exception:
+            return False
+        self._drain_notifies()
+        return True
+
+    def _on_notify(self) -> None:
+        try:
+            self._leader_conn.driver_connection.poll()
+        except Exception:
+            logger.exception("Scheduler notification connection failed")
+            return
+        self._drain_notifies()
+
+    def _drain_notifies(self) -> None:
+        conn = self._leader_conn.driver_connection
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            try:
+                change = json.loads(notify.payload)
+                scheduled_time = change.get("scheduled_time")
+                self.on_campaign_changed(
+                    change["id"],
+                    change.get("status"),
+                    datetime.fromisoformat(scheduled_time) if scheduled_time else None,
+                )
+            except (ValueError, KeyError):
+                logger.warning("Ignoring malformed schedule notification", payload=notify.payload)
+
+    def _release_leadership(self) -> None:
+        if self._leader_conn is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(self._leader_conn.driver_connection.fileno())
+            except Exception:
+                pass
+            # Closing the session releases the advisory lock
+            self._leader_conn.invalidate()
+            self._leader_conn = None
+        self.is_leader = False
+        self._heap, self._due = [], {}
+
+    # -- loop -----------------------------------------------------------------
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=max(seconds, 0))
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _run(self) -> None:
+        check_interval = settings.SCHEDULER_LEADER_CHECK_SECONDS
+        while not self._stopping:
+            try:
+                if not self.is_leader:
+                    if not await asyncio.to_thread(self._acquire_leadership):
+                        await self._sleep(check_interval)
+                        continue
+                    self.is_leader = True
+                    if self._leader_conn is not None:
+                        asyncio.get_running_loop().add_reader(
+                            self._leader_conn.driver_connection.fileno(), self._on_notify
+                        )
+                    await self._rebuild()
+                    logger.info("Scheduler acquired leadership")
+                elif not self._leader_alive():
+                    logger.warning("Scheduler lost leadership connection")
+                    self._release_leadership()
+                    continue
+
+                due = self.next_due()
+                timeout = check_interval
+                if due is not None:
+                    timeout = min(timeout, (due - datetime.utcnow()).total_seconds())
+                await self._sleep(timeout)
+
+                for campaign_id in self.pop_due(datetime.utcnow()):
+                    try:
+                        await asyncio.to_thread(self._fire, campaign_id)
+                    except Exception:
+                        logger.exception("Failed to launch scheduled campaign, retrying", campaign_id=campaign_id)
+                        retry_at = datetime.utcnow() + timedelta(seconds=check_interval)
+                        self.on_campaign_changed(campaign_id, CampaignStatus.SCHEDULED, retry_at)
+            except Exception:
+                logger.exception("Scheduler loop error")
+                self._release_leadership()
+                await self._sleep(check_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        self._release_leadership()
+
+
+campaign_scheduler = CampaignScheduler()
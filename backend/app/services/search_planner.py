@@ -0,0 +1,50 @@
+import re
+from typing import Iterable, List, Optional
+from urllib.parse import quote, urlencode
+
+from app.core.config import settings
+
+# LinkedIn's public search pages list 25 postings and page with ?start=
+RESULTS_PER_PAGE = 25
+
+_PUNCTUATION_RE = re.compile(r"[^\w+#./-]+")
+
+
+def normalize_keywords(value: str) -> str:
+    return " ".join(_PUNCTUATION_RE.sub(" ", value or "").split())
+
+
+def _unique(values: Iterable[str]) -> List[str]:
+    seen = {}
+    for value in values:
+        normalized = normalize_keywords(value)
+        if normalized:
+            seen.setdefault(normalized.casefold(), normalized)
+    return list(seen.values())
+
+
+def plan_search_urls(positions: Iterable[str], locations: Optional[Iterable[str]] = None,
+                     pages: Optional[int] = None, base_url: Optional[str] = None,
+                     max_urls: Optional[int] = None) -> List[str]:
+    """Expand positions x locations x result pages into unique search URLs.
+
+    Positions and locations are de-duplicated case-insensitively, and the
+    URLs are ordered first page first across every position, so that the
+    ``max_urls`` cap trims deep pages before it drops a position.
+    """
+    base_url = base_url or settings.LINKEDIN_JOBS_SEARCH_URL
+    places = _unique(settings.SEARCH_LOCATIONS if locations is None else locations) or [None]
+    pages = settings.SEARCH_PAGES if pages is None else pages
+    max_urls = settings.SEARCH_MAX_URLS if max_urls is None else max_urls
+
+    urls = []
+    for page in range(max(1, pages)):
+        for keywords in _unique(positions):
+            for place in places:
+                params = {"keywords": keywords}
+                if place:
+                    params["location"] = place
+                if page:
+                    params["start"] = page * RESULTS_PER_PAGE
+                urls.append(f"{base_url}?{urlencode(params, quote_via=quote)}")
+    return urls[:max_urls]
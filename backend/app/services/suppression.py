@@ -0,0 +1,175 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import SUPPRESSION_CHECKS_TOTAL
+from app.db.database import insert_ignoring_duplicates
+from app.models.suppression import Suppression
+from app.utils.bloom import BloomFilter
+
+def _normalize(value: str) -> Optional[Tuple[str, str]]:
+    """(kind, value) for an address or a domain (``@acme.com`` or ``acme.com``)."""
+    value = (value or "").strip().lower()
+    if not value:
+        return None
+    if value.startswith("@"):
+        value = value[1:]
+    return ("email" if "@" in value else "domain"), value
+
+
+def value_hash(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _email_keys(email: str) -> Optional[Tuple[str, str]]:
+    """Hashes an address is suppressed under: itself and its domain."""
+    normalized = (email or "").strip().lower()
+    if "@" not in normalized:
+        return None
+    return value_hash(normalized), value_hash(normalized.rsplit("@", 1)[1])
+
+
+def add_suppressions(db: Session, user_id: UUID, values: Iterable[str], reason: str) -> int:
+    """Suppress addresses and/or domains for a user; existing entries are kept. Does not commit."""
+    rows: Dict[str, dict] = {}
+    for value in values:
+        parsed = _normalize(value)
+        if parsed is None:
+            continue
+        kind, normalized = parsed
+        digest = value_hash(normalized)
+        rows[digest] = {
+            "user_id": user_id,
+            "kind": kind,
+            "value_hash": digest,
+            "reason": reason,
+            "created_at": datetime.utcnow(),
+        }
+    if rows:
+        db.execute(insert_ignoring_duplicates(db, Suppression.__table__, ["user_id", "value_hash"]), list(rows.values()))
+        # Visible to this worker at once; other workers pick it up on their next refresh
+        suppression_index.note(user_id, rows)
+    return len(rows)
+
+
+def remove_suppressions(db: Session, user_id: UUID, values: Iterable[str]) -> int:
+    digests = [value_hash(parsed[1]) for parsed in map(_normalize, values) if parsed]
+    if not digests:
+        return 0
+    removed = db.execute(
+        delete(Suppression).where(Suppression.user_id == user_id, Suppression.value_hash.in_(digests))
+    ).rowcount
+    # Bloom filters cannot forget; a stale bit only costs one confirming query
+    suppression_index.invalidate(user_id)
+    return removed
+
+
+@dataclass
+class _UserFilter:
+    bloom: BloomFilter
+    synced_at: datetime
+    checked_at: float
+
+
+class SuppressionIndex:
+    """Per-user Bloom filters over suppressed hashes, kept in step with the table.
+
+    A check first asks the filter: a miss is definitive, so most addresses
+    never touch the table. Hits are confirmed with one indexed query, so a
+    false positive or a since-removed entry never suppresses anyone. Filters
+    are built once per user; entries added by this worker go straight in,
+    and at most every ``refresh_seconds`` the filter is topped up with the
+    rows other workers created since the last sync (re-reading a short
+    overlap to catch slow commits). Filters are rebuilt larger when they
+    fill up, and at most ``max_users`` are kept.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, max_users: int, overlap_seconds: float,
+                 refresh_seconds: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.max_users = max_users
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.refresh_seconds = refresh_seconds
+        self._filters: "OrderedDict[UUID, _UserFilter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def invalidate(self, user_id: UUID) -> None:
+        with self._lock:
+            self._filters.pop(user_id, None)
+
+    def note(self, user_id: UUID, digests: Iterable[str]) -> None:
+        """Add hashes just written by this worker to the user's filter, if it is cached."""
+        with self._lock:
+            entry = self._filters.get(user_id)
+            if entry is not None:
+                for digest in digests:
+                    if digest not in entry.bloom:
+                        entry.bloom.add(digest)
+
+    def _sync(self, db: Session, user_id: UUID) -> BloomFilter:
+        now, checked = datetime.utcnow(), time.monotonic()
+        with self._lock:
+            entry = self._filters.get(user_id)
+            if entry is not None:
+                self._filters.move_to_end(user_id)
+                if not entry.bloom.saturated and checked - entry.checked_at < self.refresh_seconds:
+                    return entry.bloom
+
+        query = select(Suppression.value_hash).where(Suppression.user_id == user_id)
+        if entry is None or entry.bloom.saturated:
+            hashes = db.execute(query).scalars().all()
+            entry = _UserFilter(BloomFilter(max(self.capacity, 2 * len(hashes)), self.error_rate), now, checked)
+        else:
+            hashes = db.execute(query.where(Suppression.created_at >= entry.synced_at - self.overlap)).scalars().all()
+
+        with self._lock:
+            for digest in hashes:
+                # Re-read overlap rows are already present; skipping them keeps ``count`` honest
+                if digest not in entry.bloom:
+                    entry.bloom.add(digest)
+            entry.synced_at = max(entry.synced_at, now)
+            entry.checked_at = max(entry.checked_at, checked)
+            self._filters[user_id] = entry
+            while len(self._filters) > self.max_users:
+                self._filters.popitem(last=False)
+        return entry.bloom
+
+    def suppressed(self, db: Session, user_id: UUID, emails: Iterable[str]) -> Set[str]:
+        """The subset of ``emails`` suppressed for ``user_id``, by address or domain."""
+        keys = {email: pair for email in emails if (pair := _email_keys(email))}
+        if not keys:
+            return set()
+        bloom = self._sync(db, user_id)
+        candidates = {digest for pair in keys.values() for digest in pair if digest in bloom}
+        confirmed: Set[str] = set()
+        if candidates:
+            confirmed = set(db.execute(
+                select(Suppression.value_hash)
+                .where(Suppression.user_id == user_id, Suppression.value_hash.in_(candidates))
+            ).scalars())
+
+        blocked = {email for email, (address, domain) in keys.items() if address in confirmed or domain in confirmed}
+        maybe = sum(1 for address, domain in keys.values() if address in candidates or domain in candidates)
+        SUPPRESSION_CHECKS_TOTAL.labels("clear").inc(len(keys) - maybe)
+        SUPPRESSION_CHECKS_TOTAL.labels("false_positive").inc(maybe - len(blocked))
+        SUPPRESSION_CHECKS_TOTAL.labels("suppressed").inc(len(blocked))
+        return blocked
+
+
+suppression_index = SuppressionIndex(
+    capacity=settings.SUPPRESSION_BLOOM_CAPACITY,
+    error_rate=settings.SUPPRESSION_BLOOM_ERROR_RATE,
+    max_users=settings.SUPPRESSION_CACHE_USERS,
+    overlap_seconds=settings.SUPPRESSION_SYNC_OVERLAP_SECONDS,
+    refresh_seconds=settings.SUPPRESSION_REFRESH_SECONDS,
+)
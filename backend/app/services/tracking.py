@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import hmac
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlencode
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import TRACKING_EVENTS_DROPPED_TOTAL
+from app.db.database import SessionLocal
+from app.models.campaign import EmailLog
+
+logger = get_logger("tracking")
+
+
+def click_signature(log_id: UUID, url: str) -> str:
+    """HMAC binding a redirect target to one email log, so the click endpoint is not an open redirect."""
+    message = f"{log_id}\n{url}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify_click(log_id: UUID, url: str, signature: str) -> bool:
+    return hmac.compare_digest(click_signature(log_id, url), signature or "")
+
+
+def click_path(log_id: UUID, url: str) -> str:
+    """Path of the tracked (signed) link for ``url`` in the email behind ``log_id``."""
+    query = urlencode({"url": url, "sig": click_signature(log_id, url)})
+    return f"{settings.API_V1_STR}/track/click/{log_id}?{query}"
+
+
+class TrackingBuffer:
+    """In-process write-behind buffer for open/click tracking hits.
+
+    Hits are recorded in memory (keeping only the first hit per log id) and
+    written to ``email_logs`` in batched UPDATEs every ``flush_interval_ms``
+    or as soon as ``max_events`` distinct log ids are pending.
+
+    A failed flush keeps its events and is retried with exponential backoff.
+    While writes keep failing, hits for new log ids beyond ``max_pending``
+    are dropped (and counted) so the buffer cannot grow without bound.
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: Optional[int] = None,
+        max_events: Optional[int] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_pending: Optional[int] = None,
+    ):
+        self.flush_interval = (flush_interval_ms or settings.TRACKING_FLUSH_INTERVAL_MS) / 1000.0
+        self.max_events = max_events or settings.TRACKING_FLUSH_MAX_EVENTS
+        self.max_pending = max_pending or self.max_events * settings.TRACKING_MAX_PENDING_BATCHES
+        self.session_factory = session_factory
+        self._failures = 0
+        self._retry_at = 0.0
+        self._opens: Dict[UUID, datetime] = {}
+        self._clicks: Dict[UUID, datetime] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._opens)
+
+    def _add_open(self, log_id: UUID, at: datetime) -> bool:
+        """Buffer an open; False if it was dropped because the buffer is full."""
+        if log_id not in self._opens:
+            if len(self._opens) >= self.max_pending:
+                return False
+            self._opens[log_id] = at
+            if len(self._opens) >= self.max_events and self._wakeup is not None:
+                self._wakeup.set()
+        return True
+
+    def record_open(self, log_id: UUID, at: Optional[datetime] = None) -> None:
+        if not self._add_open(log_id, at or datetime.utcnow()):
+            TRACKING_EVENTS_DROPPED_TOTAL.labels("open").inc()
+
+    def record_click(self, log_id: UUID, at: Optional[datetime] = None) -> None:
+        # A click implies the message was opened, even if the pixel was blocked
+        at = at or datetime.utcnow()
+        if not self._add_open(log_id, at):
+            TRACKING_EVENTS_DROPPED_TOTAL.labels("click").inc()
+            return
+        self._clicks.setdefault(log_id, at)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out everything still buffered."""
+        self._stopping = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        if not self._opens:
+            return 0
+        opens, clicks = self._opens, self._clicks
+        self._opens, self._clicks = {}, {}
+        try:
+            await asyncio.to_thread(self._write, opens, clicks)
+        except Exception:
+            self._failures += 1
+            delay = min(settings.TRACKING_RETRY_MAX_SECONDS, self.flush_interval * 2 ** self._failures)
+            self._retry_at = time.monotonic() + delay
+            logger.exception("Failed to flush tracking events, re-buffering", count=len(opens), retry_in=delay)
+            for log_id, at in opens.items():
+                # Logs hit again during the write keep their slot; the rest must fit under the cap
+                if log_id in self._opens or len(self._opens) < self.max_pending:
+                    self._opens.setdefault(log_id, at)
+                    if log_id in clicks:
+                        self._clicks.setdefault(log_id, clicks[log_id])
+                else:
+                    TRACKING_EVENTS_DROPPED_TOTAL.labels("click" if log_id in clicks else "open").inc()
+            return 0
+        self._failures, self._retry_at = 0, 0.0
+        return len(opens)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            timeout = max(self.flush_interval, self._retry_at - time.monotonic())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            # A full buffer does not cut a backoff short
+            if not self._stopping and time.monotonic() >= self._retry_at:
+                await self.flush()
+
+    def _write(self, opens: Dict[UUID, datetime], clicks: Dict[UUID, datetime]) -> None:
+        table = EmailLog.__table__
+        # COALESCE keeps the first recorded time when a log is hit again after a flush
+        open_stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(is_opened=True, opened_at=func.coalesce(table.c.opened_at, bindparam("b_at")))
+        )
+        click_stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(is_clicked=True, clicked_at=func.coalesce(table.c.clicked_at, bindparam("b_at")))
+        )
+        db = self.session_factory()
+        try:
+            db.execute(open_stmt, [{"b_id": log_id, "b_at": at} for log_id, at in opens.items()])
+            if clicks:
+                db.execute(click_stmt, [{"b_id": log_id, "b_at": at} for log_id, at in clicks.items()])
+            db.commit()
+            logger.debug("Flushed tracking events", opens=len(opens), clicks=len(clicks))
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+tracking_buffer = TrackingBuffer()
@@ -0,0 +1,41 @@
+import time
+
+from app.core.logging import get_logger
+from app.db.database import engine
+
+logger = get_logger("warmup")
+
+
+def warm_up(db_connections: int = 0) -> None:
+    """Pay first-request costs before the worker takes traffic.
+
+    Loads the lazily imported parsers and mail client, compiles the
+    application template and opens ``db_connections`` pooled connections.
+    Failures are logged and never block startup.
+    """
+    start = time.perf_counter()
+    try:
+        import aiosmtplib  # noqa: F401
+        import pdfminer.high_level  # noqa: F401
+        from bs4 import BeautifulSoup
+        from docx import Document  # noqa: F401
+
+        from app.services.application_service import get_template_env
+
+        BeautifulSoup("<p></p>", "lxml")
+        get_template_env().get_template("application_email.txt")
+    except Exception:
+        logger.exception("Warm-up of imports and templates failed")
+
+    connections = []
+    try:
+        for _ in range(db_connections):
+            connections.append(engine.connect())
+    except Exception:
+        logger.exception("Warm-up of the DB pool failed")
+    finally:
+        # Closing returns them to the pool, still connected
+        for connection in connections:
+            connection.close()
+
+    logger.info("Worker warmed up", seconds=round(time.perf_counter() - start, 3), db_connections=len(connections))
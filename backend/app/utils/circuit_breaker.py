@@ -0,0 +1,126 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, TypeVar
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker shared by every caller in the process.
+
+    After ``failure_threshold`` failures in a row the circuit opens and
+    ``allow()`` refuses calls for ``recovery_seconds``. It then goes half-open
+    and lets up to ``half_open_max_calls`` probes through: a success closes
+    the circuit, a failure opens it again for another full period.
+    """
+
+    def __init__(self, failure_threshold: int, recovery_seconds: float, half_open_max_calls: int = 1,
+                 on_state_change: Optional[Callable[[str], None]] = None):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.on_state_change = on_state_change
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probes = 0
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            if self.on_state_change is not None:
+                self.on_state_change(state)
+
+    def allow(self) -> bool:
+        """Return whether a call may go ahead; callers must then report its outcome."""
+        if self.failure_threshold <= 0:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_seconds:
+                return False
+            self._probes = 0
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_max_calls:
+                return False
+            self._probes += 1
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probes = 0
+        self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or (self.failure_threshold > 0 and self.failures >= self.failure_threshold):
+            self.opened_at = time.monotonic()
+            self._probes = 0
+            self._set_state(OPEN)
+
+    def release(self) -> None:
+        """Give back a half-open probe slot for a call that ended without a verdict."""
+        if self.state == HALF_OPEN and self._probes:
+            self._probes -= 1
+
+
+class LatencyWindow:
+    """Rolling window of recent latencies for percentile-based hedging."""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(p / 100.0 * len(ordered)) - 1))
+        return ordered[index]
+
+
+async def hedged(call: Callable[[], Awaitable[T]], delay: Optional[float],
+                 on_hedge: Optional[Callable[[], None]] = None) -> T:
+    """Await ``call()``; if it is still running after ``delay`` seconds, race a second copy.
+
+    The first successful result wins and the other attempt is cancelled. If
+    both fail, the error of the one that finished last is raised.
+    """
+    if delay is None:
+        return await call()
+
+    tasks = {asyncio.ensure_future(call())}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            if on_hedge is not None:
+                on_hedge()
+            tasks.add(asyncio.ensure_future(call()))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,34 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+
+# Bump when a response shape changes so clients don't keep a stale body
+ETAG_FORMAT = "1"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the version parts of a resource (ids, timestamps, counts)."""
+    digest = hashlib.sha1("|".join(str(part) for part in (ETAG_FORMAT, *parts)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Let pollers keep the body but revalidate every time
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Generic, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class ItemResult(Generic[T, R]):
+    item: T
+    value: Optional[R] = None
+    error: Optional[BaseException] = None
+    timed_out: bool = False
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class FanOutSummary(Generic[T, R]):
+    results: List[ItemResult[T, R]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def values(self) -> List[R]:
+        """Results of the items that succeeded, in input order."""
+        return [result.value for result in self.results if result.ok]
+
+    @property
+    def failures(self) -> List[ItemResult[T, R]]:
+        return [result for result in self.results if not result.ok]
+
+    def counts(self) -> dict:
+        timed_out = sum(result.timed_out for result in self.results)
+        failed = len(self.failures)
+        return {
+            "total": len(self.results),
+            "succeeded": len(self.results) - failed,
+            "failed": failed - timed_out,
+            "timed_out": timed_out,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+async def fan_out(items: Iterable[T], worker: Callable[[T], Awaitable[R]], concurrency: int,
+                  timeout: Optional[float] = None) -> FanOutSummary[T, R]:
+    """Run ``worker`` over ``items`` with at most ``concurrency`` in flight.
+
+    Each item gets its own ``timeout`` (time waiting for a slot does not
+    count) and its own failure: an exception or timeout is recorded on that
+    item's result and never cancels its siblings. Cancelling the caller
+    cancels every item still running. Results keep input order.
+
+    Written with gather rather than asyncio.TaskGroup, which needs 3.11 and
+    the worker image still runs 3.10.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item: T) -> ItemResult[T, R]:
+        async with semaphore:
+            result: ItemResult[T, R] = ItemResult(item)
+            start = time.perf_counter()
+            try:
+                result.value = await asyncio.wait_for(worker(item), timeout)
+            except asyncio.TimeoutError as exc:
+                result.error, result.timed_out = exc, True
+            except Exception as exc:
+                result.error = exc
+            result.seconds = time.perf_counter() - start
+            return result
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run(item) for item in items))
+    return FanOutSummary(list(results), time.perf_counter() - start)
@@ -0,0 +1,124 @@
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` if available and return 0, else the seconds to wait."""
+        now = time.monotonic()
+        self._refill(now)
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+
+class KeyedTokenBuckets:
+    """One lazily created bucket per key, e.g. per user or recipient domain.
+
+    At most ``max_keys`` buckets are kept; the least recently used is dropped
+    first, which only ever hands that key a fresh (full) bucket.
+    """
+
+    def __init__(self, per_minute: int, burst: Optional[int] = None, max_keys: int = 100_000):
+        self.per_minute = per_minute
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, TokenBucket]" = OrderedDict()
+
+    def try_acquire(self, key: Hashable, tokens: float = 1.0) -> float:
+        if self.per_minute <= 0:
+            return 0.0
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.per_minute / 60.0, self.burst or self.per_minute)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.try_acquire(tokens)
+
+    def refund(self, key: Hashable, tokens: float = 1.0) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket.tokens = min(bucket.capacity, bucket.tokens + tokens)
+
+
+# Refill and take in one round trip; Redis' own clock keeps nodes consistent
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= requested then
+  tokens = tokens - requested
+else
+  wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+# Give back tokens taken by a request that was not admitted after all
+_REDIS_TOKEN_REFUND = """
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens then
+  redis.call('HSET', KEYS[1], 'tokens', math.min(tonumber(ARGV[1]), tokens + tonumber(ARGV[2])))
+end
+return 0
+"""
+
+
+class RedisTokenBuckets:
+    """KeyedTokenBuckets shared by every worker through Redis.
+
+    ``try_acquire`` and ``refund`` are coroutines here. Each key is a small hash that expires
+    once its bucket would be full again, so idle keys cost nothing.
+    """
+
+    def __init__(self, url: str, per_minute: int, burst: Optional[int] = None, prefix: str = "ratelimit"):
+        import redis.asyncio as redis
+
+        self.per_minute = per_minute
+        self.burst = burst
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+        self._refund = self._client.register_script(_REDIS_TOKEN_REFUND)
+
+    async def try_acquire(self, key: Hashable, tokens: float = 1.0) -> float:
+        if self.per_minute <= 0:
+            return 0.0
+        wait = await self._script(
+            keys=[f"{self.prefix}:{key}"],
+            args=[self.per_minute / 60.0, self.burst or self.per_minute, tokens],
+        )
+        return float(wait)
+
+    async def refund(self, key: Hashable, tokens: float = 1.0) -> None:
+        if self.per_minute > 0:
+            await self._refund(keys=[f"{self.prefix}:{key}"], args=[self.burst or self.per_minute, tokens])
+
+    async def close(self) -> None:
+        await self._client.aclose()
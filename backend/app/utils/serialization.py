@@ -0,0 +1,23 @@
+from typing import Iterable, List, Type
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def schema_columns(schema: Type[BaseModel], model) -> List:
+    """ORM columns for each field of ``schema``, in field order.
+
+    Selecting exactly these lets a list endpoint skip building ORM instances
+    and Pydantic models: the rows already have the response's shape.
+    """
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def rows_response(schema: Type[BaseModel], rows: Iterable) -> ORJSONResponse:
+    """Serialize rows selected with ``schema_columns`` straight to JSON with orjson.
+
+    orjson renders UUIDs, datetimes and enums the same way Pydantic does, so
+    the body matches the ``response_model`` output byte for byte.
+    """
+    fields = list(schema.model_fields)
+    return ORJSONResponse([dict(zip(fields, row)) for row in rows])
@@ -0,0 +1,230 @@
+"""Benchmark cases for the request and pipeline hot paths.
+
+Each case is a generator that does its setup, yields the zero-argument
+callable to time, and cleans up after the yield. Raise ``SkipCase`` from the
+setup when a case cannot run in the current environment.
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class SkipCase(Exception):
+    pass
+
+
+class Case:
+    def __init__(self, name: str, factory: Callable, tolerance: Optional[float] = None):
+        self.name = name
+        self.factory = factory
+        self.tolerance = tolerance
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, tolerance: Optional[float] = None):
+    def register(factory):
+        CASES[name] = Case(name, factory, tolerance)
+        return factory
+    return register
+
+
+@case("calibration")
+def calibration():
+    # Fixed pure-Python workload; other cases are compared relative to it so
+    # baselines recorded on one machine stay meaningful on another.
+    data = list(range(10000, 0, -1))
+
+    def run():
+        total = 0
+        for value in sorted(data):
+            total += value * value
+        return total
+
+    yield run
+
+
+def _scrape_case(fixture: str):
+    from app.services.linkedin_scraper import PoliteLinkedInScraper
+
+    html = (FIXTURES / fixture).read_text(encoding="utf-8")
+    scraper = PoliteLinkedInScraper.__new__(PoliteLinkedInScraper)  # parsing needs no HTTP client
+    yield lambda: scraper._parse_job_listings(html, "https://www.linkedin.com/jobs/search")
+
+
+@case("parse_job_listings")
+def parse_job_listings():
+    yield from _scrape_case("linkedin_search.html")
+
+
+@case("parse_job_listings_large")
+def parse_job_listings_large():
+    yield from _scrape_case("linkedin_search_large.html")
+
+
+@case("extract_text_pdf", tolerance=0.5)
+def extract_text_pdf():
+    from app.services.resume_service import extract_text_from_file
+
+    path = str(FIXTURES / "resume.pdf")
+    yield lambda: extract_text_from_file(path)
+
+
+@case("extract_text_docx", tolerance=0.5)
+def extract_text_docx():
+    from app.services.resume_service import extract_text_from_file
+
+    path = str(FIXTURES / "resume.docx")
+    yield lambda: extract_text_from_file(path)
+
+
+@case("render_application_template_x100")
+def render_application_template_x100():
+    from app.services.application_service import render_application_template
+
+    contexts = [
+        {
+            "recruiter_name": "Hiring Manager",
+            "position_title": f"Backend Engineer {i}",
+            "company_name": f"Company {i}",
+            "top_skills": ["python", "fastapi", "sql", "aws"],
+            "years_of_experience": "6",
+            "accomplishments": ["Developed scalable backends", "Optimized cloud costs"],
+            "company_interest_reason": "your innovative work in the industry",
+            "candidate_name": "Jane Doe",
+            "candidate_email": "jane@example.com",
+            "candidate_phone": "+1-234-567-890",
+        }
+        for i in range(100)
+    ]
+
+    def run():
+        for context in contexts:
+            render_application_template("application_email.txt", context)
+
+    yield run
+
+
+@case("contacts_list_json_10k")
+def contacts_list_json_10k():
+    from app.schemas.campaign import ContactResponse
+    from app.utils.serialization import rows_response
+
+    campaign_id, now = uuid.uuid4(), datetime.utcnow()
+    rows = [
+        (f"r{i}@example.com", f"Recruiter {i}", "Acme", "Engineering Manager", None, uuid.uuid4(), campaign_id, now)
+        for i in range(10000)
+    ]
+    yield lambda: rows_response(ContactResponse, rows)
+
+
+@case("rank_jobs_3000")
+def rank_jobs_3000():
+    import json
+
+    from app.services.job_ranker import rank_jobs
+
+    jobs = json.loads((FIXTURES / "jobs_corpus.json").read_text(encoding="utf-8"))
+    entities = {
+        "positions": ["Backend Engineer", "Python Developer", "Platform Engineer"],
+        "top_skills": ["Python", "Go", "PostgreSQL", "Kubernetes", "AWS"],
+        "years_of_experience": "8",
+    }
+    yield lambda: rank_jobs(jobs, entities, top_k=10)
+
+
+@case("summarize_resume")
+def summarize_resume():
+    from app.services.resume_service import extract_text_from_file, summarize_resume as summarize
+
+    # Pad the extracted text with the blank and indented lines real exports have
+    text = extract_text_from_file(str(FIXTURES / "resume.pdf")).replace("\n", "\n   \n  ") * 4
+    yield lambda: summarize(text)
+
+
+@case("credential_encrypt_decrypt")
+def credential_encrypt_decrypt():
+    from app.utils.encryption import credential_encryption
+
+    secret = "smtp-app-password-" + "x" * 32
+    yield lambda: credential_encryption.decrypt(credential_encryption.encrypt(secret))
+
+
+@case("jwt_create_verify")
+def jwt_create_verify():
+    from app.core.security import create_access_token, verify_token
+
+    claims = {"sub": str(uuid.uuid4()), "email": "jane@example.com"}
+    yield lambda: verify_token(create_access_token(claims))
+
+
+@case("campaign_analytics_2000_logs", tolerance=0.5)
+def campaign_analytics():
+    if not os.environ.get("BENCH_DATABASE_URL"):
+        raise SkipCase("set BENCH_DATABASE_URL to a scratch Postgres database")
+
+    from fastapi import Response
+    from sqlalchemy import delete, insert
+
+    import app.models  # noqa: F401
+    from app.db.base import Base
+    from app.db.database import SessionLocal, engine
+    from app.models.campaign import Campaign, Contact, EmailLog
+    from app.models.user import User
+    from app.routes.campaigns import get_campaign_analytics
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    user = User(auth0_id=f"auth0|bench-{uuid.uuid4().hex}", email=f"bench-{uuid.uuid4().hex}@example.com")
+    db.add(user)
+    db.flush()
+    campaign = Campaign(user_id=user.id, name="Benchmark campaign")
+    db.add(campaign)
+    db.flush()
+
+    now = datetime.utcnow()
+    contacts = [
+        {"id": uuid.uuid4(), "campaign_id": campaign.id, "email": f"r{i}@example.com", "created_at": now}
+        for i in range(2000)
+    ]
+    db.execute(insert(Contact.__table__), contacts)
+    db.execute(insert(EmailLog.__table__), [
+        {
+            "id": uuid.uuid4(),
+            "campaign_id": campaign.id,
+            "contact_id": contact["id"],
+            "email_subject": "Hello",
+            "email_body": "Body " * 200,
+            "status": "sent",
+            "sent_at": now - timedelta(minutes=i),
+            "is_opened": i % 3 == 0,
+            "is_replied": i % 10 == 0,
+            "created_at": now,
+        }
+        for i, contact in enumerate(contacts)
+    ])
+    db.commit()
+    campaign_id = campaign.id
+
+    loop = asyncio.new_event_loop()
+    try:
+        yield lambda: loop.run_until_complete(
+            get_campaign_analytics(
+                campaign_id=campaign_id, response=Response(), if_none_match=None, current_user=user, db=db
+            )
+        )
+    finally:
+        loop.close()
+        db.rollback()
+        db.execute(delete(EmailLog.__table__).where(EmailLog.campaign_id == campaign_id))
+        db.execute(delete(Contact.__table__).where(Contact.campaign_id == campaign_id))
+        db.execute(delete(Campaign.__table__).where(Campaign.id == campaign_id))
+        db.execute(delete(User.__table__).where(User.id == user.id))
+        db.commit()
+        db.close()
@@ -0,0 +1,136 @@
+"""Offline micro-benchmarks for the hot paths, checked against stored baselines.
+
+    python -m benchmarks.run                 # measure and compare
+    python -m benchmarks.run --check         # exit 1 on a regression
+    python -m benchmarks.run --update        # re-record baselines.json
+    python -m benchmarks.run -k parse        # only cases matching "parse"
+
+Run from ``backend/``. Everything reads fixtures from ``benchmarks/fixtures``
+and needs no network. The analytics case needs a scratch Postgres database in
+``BENCH_DATABASE_URL`` and is skipped without one (it creates the schema and
+removes its own rows afterwards).
+
+Timings are recorded relative to the ``calibration`` case, so a baseline taken
+on one machine can be checked on another; re-record after intentional changes.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+from pathlib import Path
+
+BASELINES = Path(__file__).parent / "baselines.json"
+DEFAULT_TOLERANCE = 0.3
+REPEAT = 5
+
+# Settings are validated at import time; benchmarks don't need real secrets
+for _name, _value in {
+    "SECRET_KEY": "benchmark-secret",
+    "ENCRYPTION_KEY": "benchmark-encryption-key",
+    "AUTH0_DOMAIN": "example.auth0.com",
+    "AUTH0_CLIENT_ID": "benchmark",
+    "AUTH0_CLIENT_SECRET": "benchmark",
+    "AUTH0_API_AUDIENCE": "benchmark",
+    "AUTH0_CALLBACK_URL": "http://localhost/callback",
+}.items():
+    os.environ.setdefault(_name, _value)
+os.environ["DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL") or "sqlite://"
+
+from benchmarks.cases import CASES, SkipCase  # noqa: E402
+
+
+def measure(fn) -> float:
+    """Best-of-REPEAT seconds per call, with the loop count sized like ``timeit``."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number
+
+
+def run_case(name: str):
+    factory = CASES[name].factory()
+    try:
+        fn = next(factory)
+    except SkipCase as e:
+        return None, str(e)
+    try:
+        fn()  # warm caches and lazy imports outside the timed loop
+        return measure(fn), None
+    finally:
+        factory.close()
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases whose name contains this")
+    parser.add_argument("--check", action="store_true", help="exit non-zero if any case regressed")
+    parser.add_argument("--update", action="store_true", help="write the measured results to baselines.json")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help=f"allowed slowdown as a fraction (default {DEFAULT_TOLERANCE}, or the per-case value)")
+    args = parser.parse_args(argv)
+
+    from app.core.logging import logger
+    logger.remove()  # time the code, not the terminal
+
+    stored = json.loads(BASELINES.read_text()) if BASELINES.exists() else {"cases": {}}
+    baselines = stored["cases"]
+
+    results = {}
+    previous = run_case("calibration")[0]
+    regressions = []
+    print(f"{'case':<36} {'time':>10} {'relative':>10} {'baseline':>10} {'change':>8}")
+    for name, case in CASES.items():
+        if name == "calibration" or args.pattern not in name:
+            continue
+        baseline = baselines.get(name)
+        tolerance = args.tolerance if args.tolerance is not None else (case.tolerance or DEFAULT_TOLERANCE)
+        for attempt in range(2):
+            seconds, skipped = run_case(name)
+            if seconds is None:
+                break
+            # Calibrate next to each case so CPU frequency drift during the run cancels out
+            after = run_case("calibration")[0]
+            calibration, previous = min(previous, after), after
+            relative = min(seconds / calibration, results.get(name, float("inf")))
+            results[name] = float(f"{relative:.4g}")
+            # Re-measure once before calling a regression; shared machines are noisy
+            if not baseline or relative / baseline - 1 <= tolerance:
+                break
+        if seconds is None:
+            print(f"{name:<36} {'skipped':>10}  ({skipped})")
+            continue
+
+        line = f"{name:<36} {format_seconds(seconds):>10} {relative:>10.3g}"
+        if baseline:
+            change = relative / baseline - 1
+            line += f" {baseline:>10.3g} {change:>+8.0%}"
+            if change > tolerance:
+                regressions.append(name)
+                line += f"  REGRESSION (> {tolerance:.0%})"
+        else:
+            line += f" {'-':>10} {'new':>8}"
+        print(line)
+
+    if args.update:
+        baselines.update(results)
+        stored["recorded_on"] = f"{platform.python_implementation()} {platform.python_version()} {platform.machine()}"
+        stored["calibration_seconds"] = previous
+        BASELINES.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        print(f"Updated {BASELINES.name} with {len(results)} case(s)")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Compare the standard and fast JSON paths of the campaign list endpoints.
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --contacts 10000 --campaigns 1000
+
+"standard" is what FastAPI does with ORM instances and a response_model
+(Pydantic validation, jsonable encoding, json.dumps). "fast" is the
+schema-column rows rendered by ``rows_response``. Also reports the gzip
+size and cost at the configured GZIP_COMPRESS_LEVEL. Runs in memory, so the
+query itself is not included.
+"""
+import argparse
+import asyncio
+import gzip
+import uuid
+from datetime import datetime
+from typing import List
+
+from benchmarks.run import format_seconds, measure  # noqa: E402  (sets up settings env)
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.config import settings
+from app.models.campaign import Campaign, CampaignStatus, Contact
+from app.schemas.campaign import CampaignResponse, ContactResponse
+from app.utils.serialization import rows_response
+
+
+def _contacts(count: int) -> List[Contact]:
+    campaign_id, now = uuid.uuid4(), datetime.utcnow()
+    return [
+        Contact(id=uuid.uuid4(), campaign_id=campaign_id, email=f"recruiter{i}@example.com",
+                name=f"Recruiter {i}", company=f"Company {i % 50}", position="Engineering Manager",
+                linkedin_profile=f"https://www.linkedin.com/in/recruiter-{i}", created_at=now)
+        for i in range(count)
+    ]
+
+
+def _campaigns(count: int) -> List[Campaign]:
+    user_id, now = uuid.uuid4(), datetime.utcnow()
+    return [
+        Campaign(id=uuid.uuid4(), user_id=user_id, name=f"Campaign {i}", description="Outreach to platform teams",
+                 target_companies=["Acme", "Globex"], email_template="Hi {{ name }}", personalization_prompt=None,
+                 is_ab_test=False, template_variants=None, status=CampaignStatus.ACTIVE, scheduled_time=None,
+                 created_at=now, updated_at=now)
+        for i in range(count)
+    ]
+
+
+def compare(endpoint: str, schema, instances) -> None:
+    field = create_response_field(name=f"{endpoint}_response", type_=List[schema])
+    rows = [tuple(getattr(obj, name) for name in schema.model_fields) for obj in instances]
+
+    def standard() -> bytes:
+        content = asyncio.run(serialize_response(field=field, response_content=instances, is_coroutine=True))
+        return JSONResponse(content).body
+
+    def fast() -> bytes:
+        return rows_response(schema, rows).body
+
+    body = fast()
+    standard_seconds, fast_seconds = measure(standard), measure(fast)
+    compressed = gzip.compress(body, settings.GZIP_COMPRESS_LEVEL)
+    gzip_seconds = measure(lambda: gzip.compress(body, settings.GZIP_COMPRESS_LEVEL))
+    print(f"{endpoint:<22} {len(instances):>7} {format_seconds(standard_seconds):>10} {format_seconds(fast_seconds):>10} "
+          f"{format_seconds(standard_seconds - fast_seconds):>10} {len(body):>11,} {len(compressed):>11,} "
+          f"{format_seconds(gzip_seconds):>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=10000)
+    parser.add_argument("--campaigns", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<22} {'items':>7} {'standard':>10} {'fast':>10} {'saved':>10} "
+          f"{'json bytes':>11} {'gzip bytes':>11} {'gzip time':>9}")
+    compare("GET /campaigns", CampaignResponse, _campaigns(args.campaigns))
+    compare("GET /{id}/contacts", ContactResponse, _contacts(args.contacts))
+
+
+if __name__ == "__main__":
+    main()
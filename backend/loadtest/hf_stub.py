@@ -0,0 +1,49 @@
+"""Local stand-in for the Hugging Face inference API.
+
+Answers ``POST /models/{model_id}`` like a text-generation model, with a JSON
+entity block in ``generated_text``. Latency is drawn around
+``HF_STUB_LATENCY_MS`` (+/- ``HF_STUB_JITTER_MS``) and a fraction
+``HF_STUB_ERROR_RATE`` of requests fail with ``HF_STUB_ERROR_STATUS`` (503 by
+default, the status the real API uses while a model loads).
+
+    uvicorn loadtest.hf_stub:app --port 8031
+"""
+import asyncio
+import json
+import os
+import random
+
+from fastapi import FastAPI, Request, Response
+
+app = FastAPI(title="hf-stub")
+
+LATENCY_MS = float(os.environ.get("HF_STUB_LATENCY_MS", "800"))
+JITTER_MS = float(os.environ.get("HF_STUB_JITTER_MS", "200"))
+ERROR_RATE = float(os.environ.get("HF_STUB_ERROR_RATE", "0"))
+ERROR_STATUS = int(os.environ.get("HF_STUB_ERROR_STATUS", "503"))
+
+ENTITIES = {
+    "candidate_name": "Jane Doe",
+    "top_skills": ["python", "fastapi", "postgresql", "kubernetes"],
+    "years_of_experience": 8,
+    "positions": ["Backend Engineer", "Platform Engineer"],
+}
+
+stats = {"requests": 0, "errors": 0}
+
+
+@app.post("/models/{model_id:path}")
+async def generate(model_id: str, request: Request):
+    await request.body()
+    stats["requests"] += 1
+    delay = max(0.0, LATENCY_MS + random.uniform(-JITTER_MS, JITTER_MS))
+    await asyncio.sleep(delay / 1000.0)
+    if ERROR_RATE and random.random() < ERROR_RATE:
+        stats["errors"] += 1
+        return Response(status_code=ERROR_STATUS, content='{"error":"stub failure"}')
+    return [{"generated_text": "Here is the JSON:\n" + json.dumps(ENTITIES)}]
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
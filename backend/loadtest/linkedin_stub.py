@@ -0,0 +1,39 @@
+"""Local stand-in for LinkedIn's public job search pages.
+
+Serves the benchmark fixture page for ``GET /jobs/search`` with latency drawn
+around ``LINKEDIN_STUB_LATENCY_MS``; ``LINKEDIN_STUB_ERROR_RATE`` of requests
+get a 429 like a throttled scraper would.
+
+    uvicorn loadtest.linkedin_stub:app --port 8032
+"""
+import asyncio
+import os
+import random
+from pathlib import Path
+
+from fastapi import FastAPI, Response
+from fastapi.responses import HTMLResponse
+
+app = FastAPI(title="linkedin-stub")
+
+LATENCY_MS = float(os.environ.get("LINKEDIN_STUB_LATENCY_MS", "300"))
+ERROR_RATE = float(os.environ.get("LINKEDIN_STUB_ERROR_RATE", "0"))
+FIXTURE = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "linkedin_search.html"
+PAGE = FIXTURE.read_text(encoding="utf-8")
+
+stats = {"requests": 0, "errors": 0}
+
+
+@app.get("/jobs/search")
+async def search(keywords: str = ""):
+    stats["requests"] += 1
+    await asyncio.sleep(max(0.0, random.gauss(LATENCY_MS, LATENCY_MS / 4)) / 1000.0)
+    if ERROR_RATE and random.random() < ERROR_RATE:
+        stats["errors"] += 1
+        return Response(status_code=429)
+    return HTMLResponse(PAGE)
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
@@ -0,0 +1,341 @@
+"""Drive the resume pipeline end to end and report how much it can take.
+
+By default the harness starts everything it needs locally: the HF inference
+stub, the LinkedIn job-page stub, an SMTP sink and the API itself (pointed at
+the three via environment variables). It then sends ``/webhook/ingest`` and
+``/upload`` requests at a fixed arrival rate, waits for the background jobs to
+drain, and reports request latency, pipeline throughput, per-stage latency
+percentiles (from the API's /metrics) and error rates.
+
+    python -m loadtest.pipeline_load --rate 2 --duration 60
+    HF_STUB_ERROR_RATE=0.1 python -m loadtest.pipeline_load --rate 5 --upload-ratio 0.5
+    python -m loadtest.pipeline_load --no-spawn --api-url http://staging:8000 --rate 1
+
+Run from ``backend/``. Stub latency and error rates are configured through the
+stubs' own environment variables (see loadtest/hf_stub.py and
+loadtest/linkedin_stub.py), which spawned processes inherit.
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+
+from loadtest.smtp_sink import start_sink
+
+STAGES = ("parse", "extract", "search", "draft", "send")
+RESUME = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "resume.pdf"
+RESUME_TEXT = (
+    "Jane Doe - Backend Engineer. Eight years of Python, FastAPI, SQL, AWS, Docker and Kubernetes. "
+    "Led billing platform migrations and built internal schedulers used by 40 teams."
+)
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+# -- local stand-ins ----------------------------------------------------------
+
+def _uvicorn(app: str, port: int, env: Dict[str, str], workers: int = 1) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+
+
+async def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.RequestError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+            await asyncio.sleep(0.2)
+
+
+class LocalStack:
+    """Stubs plus an API process wired to them; torn down on exit."""
+
+    def __init__(self, args):
+        self.args = args
+        self.processes: List[subprocess.Popen] = []
+        self.sink = None
+        self._metrics_dir = None
+
+    async def __aenter__(self) -> "LocalStack":
+        args = self.args
+        env = dict(os.environ)
+        self.sink = start_sink(port=args.smtp_port)
+        self.processes.append(_uvicorn("loadtest.hf_stub:app", args.hf_port, env))
+        self.processes.append(_uvicorn("loadtest.linkedin_stub:app", args.linkedin_port, env))
+
+        api_env = dict(env)
+        api_env.update({
+            "HF_MCP_URL": f"http://127.0.0.1:{args.hf_port}/models",
+            "HF_MCP_TOKEN": "loadtest",
+            "LINKEDIN_JOBS_SEARCH_URL": f"http://127.0.0.1:{args.linkedin_port}/jobs/search",
+            "SMTP_HOST": "127.0.0.1",
+            "SMTP_PORT": str(args.smtp_port),
+            "SMTP_USER": "",
+            "SMTP_PASSWORD": "",
+            "SMTP_START_TLS": "false",
+            "EMAIL_FROM": "loadtest@example.com",
+            "SCHEDULER_ENABLED": "false",
+            # All load comes from one IP; measure capacity, not the per-client limits
+            "API_RATE_LIMIT_PER_MINUTE": "0",
+            "INGEST_RATE_LIMIT_PER_MINUTE": "0",
+            "LOG_LEVEL": "WARNING",
+        })
+        if args.workers > 1:
+            self._metrics_dir = tempfile.TemporaryDirectory(prefix="loadtest-metrics-")
+            api_env["PROMETHEUS_MULTIPROC_DIR"] = self._metrics_dir.name
+        self.processes.append(_uvicorn("app.main:app", args.api_port, api_env, args.workers))
+
+        try:
+            await asyncio.gather(
+                _wait_ready(f"http://127.0.0.1:{args.hf_port}/stats"),
+                _wait_ready(f"http://127.0.0.1:{args.linkedin_port}/stats"),
+                _wait_ready(f"{args.api_url}/health"),
+            )
+        except BaseException:
+            await self.__aexit__(None, None, None)
+            raise
+        return self
+
+    async def stub_stats(self) -> Dict[str, Dict]:
+        async with httpx.AsyncClient() as client:
+            hf = (await client.get(f"http://127.0.0.1:{self.args.hf_port}/stats")).json()
+            linkedin = (await client.get(f"http://127.0.0.1:{self.args.linkedin_port}/stats")).json()
+        return {"hf": hf, "linkedin": linkedin, "smtp": {"messages": self.sink.handler.messages}}
+
+    async def __aexit__(self, *exc) -> None:
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if self.sink is not None:
+            self.sink.stop()
+        if self._metrics_dir is not None:
+            self._metrics_dir.cleanup()
+
+
+# -- metrics ------------------------------------------------------------------
+
+async def scrape(client: httpx.AsyncClient, api_url: str) -> Dict[MetricKey, float]:
+    resp = await client.get(f"{api_url}/metrics")
+    resp.raise_for_status()
+    samples = {}
+    for family in text_string_to_metric_families(resp.text):
+        for sample in family.samples:
+            samples[(sample.name, tuple(sorted(sample.labels.items())))] = sample.value
+    return samples
+
+
+def delta(after: Dict[MetricKey, float], before: Dict[MetricKey, float], name: str, **labels) -> Dict[MetricKey, float]:
+    """Per-series increase of ``name`` between two scrapes, filtered by labels."""
+    out = {}
+    for key, value in after.items():
+        sample_name, sample_labels = key
+        if sample_name != name or any(dict(sample_labels).get(k) != v for k, v in labels.items()):
+            continue
+        out[key] = value - before.get(key, 0.0)
+    return out
+
+
+def histogram_quantile(buckets: Dict[float, float], q: float) -> Optional[float]:
+    """Estimate a quantile from cumulative bucket counts, like PromQL does."""
+    bounds = sorted(buckets)
+    total = buckets[bounds[-1]] if bounds else 0
+    if not total:
+        return None
+    rank = q * total
+    lower, lower_count = 0.0, 0.0
+    for bound in bounds:
+        count = buckets[bound]
+        if count >= rank:
+            if bound == float("inf"):
+                return lower
+            return lower + (bound - lower) * (rank - lower_count) / max(count - lower_count, 1e-9)
+        lower, lower_count = bound, count
+    return lower
+
+
+def stage_quantiles(after, before) -> Dict[str, Dict[str, Optional[float]]]:
+    per_stage = defaultdict(dict)
+    for (name, labels), value in delta(after, before, "referralflow_pipeline_stage_seconds_bucket").items():
+        labels = dict(labels)
+        per_stage[labels["stage"]][float(labels["le"])] = value
+    return {
+        stage: {
+            "count": buckets.get(float("inf"), 0),
+            "p50": histogram_quantile(buckets, 0.50),
+            "p95": histogram_quantile(buckets, 0.95),
+            "p99": histogram_quantile(buckets, 0.99),
+        }
+        for stage, buckets in per_stage.items()
+    }
+
+
+def by_label(series: Dict[MetricKey, float], label: str) -> Counter:
+    counts = Counter()
+    for (_, labels), value in series.items():
+        counts[dict(labels).get(label, "")] += value
+    return counts
+
+
+# -- load generation ----------------------------------------------------------
+
+async def send_one(client: httpx.AsyncClient, api_url: str, kind: str, index: int, results: list) -> None:
+    email = f"loadtest+{index}@example.com"
+    start = time.perf_counter()
+    try:
+        if kind == "upload":
+            with open(RESUME, "rb") as f:
+                resp = await client.post(
+                    f"{api_url}/api/v1/orchestrator/upload",
+                    params={"email": email},
+                    files={"file": ("resume.pdf", f, "application/pdf")},
+                )
+        else:
+            resp = await client.post(
+                f"{api_url}/api/v1/orchestrator/webhook/ingest",
+                json={"text": RESUME_TEXT, "email": email},
+            )
+        outcome = str(resp.status_code)
+    except httpx.HTTPError as e:
+        outcome = type(e).__name__
+    results.append((kind, outcome, time.perf_counter() - start))
+
+
+async def generate_load(api_url: str, rate: float, duration: float, upload_ratio: float, seed: int) -> list:
+    """Open-loop arrivals: requests go out on schedule whether or not earlier ones finished."""
+    rng = random.Random(seed)
+    results: list = []
+    total = int(rate * duration)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        started = time.monotonic()
+        tasks = []
+        for i in range(total):
+            delay = started + i / rate - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            kind = "upload" if rng.random() < upload_ratio else "ingest"
+            tasks.append(asyncio.create_task(send_one(client, api_url, kind, i, results)))
+        await asyncio.gather(*tasks)
+    return results
+
+
+async def wait_for_drain(client: httpx.AsyncClient, api_url: str, timeout: float) -> float:
+    """Wait until the API reports no queued pipeline jobs; returns the backlog left."""
+    deadline = time.monotonic() + timeout
+    while True:
+        samples = await scrape(client, api_url)
+        queued = samples.get(("referralflow_pipeline_jobs_queued", ()), 0.0)
+        if queued <= 0 or time.monotonic() > deadline:
+            return queued
+        await asyncio.sleep(1)
+
+
+def _pct(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f}ms"
+
+
+def report(results, before, after, elapsed: float, backlog: float, stub_stats: Optional[Dict]) -> None:
+    print("\nRequests")
+    by_kind = defaultdict(list)
+    for kind, outcome, latency in results:
+        by_kind[kind].append((outcome, latency))
+    for kind, rows in sorted(by_kind.items()):
+        latencies = [latency for _, latency in rows]
+        outcomes = Counter(outcome for outcome, _ in rows)
+        errors = sum(n for outcome, n in outcomes.items() if not outcome.startswith("2"))
+        print(f"  {kind:<8} n={len(rows):<6} p50={_ms(_pct(latencies, .5))} p95={_ms(_pct(latencies, .95))} "
+              f"p99={_ms(_pct(latencies, .99))} errors={errors / len(rows):.1%} {dict(outcomes)}")
+
+    quantiles = stage_quantiles(after, before)
+    finished = quantiles.get("extract", {}).get("count", 0) - backlog
+    print(f"\nPipeline: {finished:.0f} resumes processed in {elapsed:.1f}s "
+          f"= {finished / elapsed * 60:.1f} resumes/min (backlog left: {backlog:.0f})")
+    print("\nStage latency")
+    for stage in STAGES:
+        if stage in quantiles:
+            q = quantiles[stage]
+            print(f"  {stage:<8} n={q['count']:<6.0f} p50={_ms(q['p50'])} p95={_ms(q['p95'])} p99={_ms(q['p99'])}")
+
+    print("\nDownstream calls")
+    hf = by_label(delta(after, before, "referralflow_hf_requests_total"), "status")
+    hf_total = sum(hf.values())
+    hf_errors = hf_total - hf.get("200", 0)
+    retries = sum(delta(after, before, "referralflow_hf_retries_total").values())
+    print(f"  hf       n={hf_total:.0f} errors={hf_errors / hf_total if hf_total else 0:.1%} "
+          f"retries={retries:.0f} {dict(hf)}")
+    scraper = by_label(delta(after, before, "referralflow_scraper_fetch_seconds_count"), "outcome")
+    scraper_total = sum(scraper.values())
+    print(f"  scraper  n={scraper_total:.0f} "
+          f"errors={(scraper_total - scraper.get('ok', 0)) / scraper_total if scraper_total else 0:.1%} {dict(scraper)}")
+    smtp = by_label(delta(after, before, "referralflow_smtp_send_seconds_count"), "outcome")
+    smtp_total = sum(smtp.values())
+    print(f"  smtp     n={smtp_total:.0f} "
+          f"errors={(smtp_total - smtp.get('ok', 0)) / smtp_total if smtp_total else 0:.1%} {dict(smtp)}")
+    if stub_stats:
+        print(f"\nStub counters: {stub_stats}")
+
+
+async def run(args) -> None:
+    async with contextlib.AsyncExitStack() as exit_stack:
+        stack = await exit_stack.enter_async_context(LocalStack(args)) if args.spawn else None
+        async with httpx.AsyncClient(timeout=30) as client:
+            before = await scrape(client, args.api_url)
+            print(f"Sending {int(args.rate * args.duration)} requests at {args.rate}/s "
+                  f"({args.upload_ratio:.0%} uploads) to {args.api_url}")
+            started = time.monotonic()
+            results = await generate_load(args.api_url, args.rate, args.duration, args.upload_ratio, args.seed)
+            backlog = await wait_for_drain(client, args.api_url, args.drain_timeout)
+            elapsed = time.monotonic() - started
+            after = await scrape(client, args.api_url)
+        stub_stats = await stack.stub_stats() if stack is not None else None
+        report(results, before, after, elapsed, backlog, stub_stats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=1.0, help="requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--upload-ratio", type=float, default=0.2, help="fraction of requests sent to /upload")
+    parser.add_argument("--drain-timeout", type=float, default=300.0,
+                        help="seconds to wait for queued jobs after the load stops")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-spawn", dest="spawn", action="store_false",
+                        help="target an already running API instead of starting one with local stubs")
+    parser.add_argument("--api-url", default=None)
+    parser.add_argument("--api-port", type=int, default=8030)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the spawned API")
+    parser.add_argument("--hf-port", type=int, default=8031)
+    parser.add_argument("--linkedin-port", type=int, default=8032)
+    parser.add_argument("--smtp-port", type=int, default=1025)
+    args = parser.parse_args()
+    args.api_url = (args.api_url or f"http://127.0.0.1:{args.api_port}").rstrip("/")
+    asyncio.run(run(args))
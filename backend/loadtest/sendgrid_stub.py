@@ -0,0 +1,48 @@
+"""Local stand-in for the SendGrid v3 ``mail/send`` API.
+
+Accepts batches like the real endpoint, answers 202 with an ``X-Message-Id``
+and rejects the whole request with 400 when any recipient address contains
+"invalid", so batch splitting can be exercised. Latency is configurable via
+``STUB_LATENCY_MS``.
+
+    uvicorn loadtest.sendgrid_stub:app --port 8025
+"""
+import asyncio
+import os
+import uuid
+
+from fastapi import FastAPI, Request, Response
+
+app = FastAPI(title="sendgrid-stub")
+
+LATENCY_MS = float(os.environ.get("STUB_LATENCY_MS", "20"))
+
+stats = {"requests": 0, "messages": 0, "rejected": 0}
+
+
+@app.post("/v3/mail/send")
+async def mail_send(request: Request):
+    payload = await request.json()
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000.0)
+
+    stats["requests"] += 1
+    recipients = [
+        to["email"]
+        for personalization in payload.get("personalizations", [])
+        for to in personalization.get("to", [])
+    ]
+    if not recipients or len(recipients) > 1000:
+        stats["rejected"] += 1
+        return Response(status_code=400, content='{"errors":[{"message":"bad personalizations"}]}')
+    if any("invalid" in email for email in recipients):
+        stats["rejected"] += 1
+        return Response(status_code=400, content='{"errors":[{"message":"invalid email"}]}')
+
+    stats["messages"] += len(recipients)
+    return Response(status_code=202, headers={"X-Message-Id": uuid.uuid4().hex})
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
@@ -0,0 +1,44 @@
+"""SMTP sink that accepts and counts messages without delivering them.
+
+    python -m loadtest.smtp_sink --port 1025
+
+Point the API at it with ``SMTP_HOST=127.0.0.1 SMTP_PORT=1025
+SMTP_START_TLS=false`` and empty SMTP credentials.
+"""
+import argparse
+import time
+
+from aiosmtpd.controller import Controller
+
+
+class CountingHandler:
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        self.bytes += len(envelope.content or b"")
+        return "250 Message accepted"
+
+
+def start_sink(host: str = "127.0.0.1", port: int = 1025) -> Controller:
+    """Start the sink on a background thread; call ``.stop()`` on the result."""
+    controller = Controller(CountingHandler(), hostname=host, port=port)
+    controller.start()
+    return controller
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    args = parser.parse_args()
+    sink = start_sink(args.host, args.port)
+    print(f"SMTP sink listening on {args.host}:{args.port}")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"messages={sink.handler.messages} bytes={sink.handler.bytes}")
+    except KeyboardInterrupt:
+        sink.stop()
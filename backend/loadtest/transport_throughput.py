@@ -0,0 +1,45 @@
+"""Measure HTTPBatchTransport throughput against the local SendGrid stub.
+
+    uvicorn loadtest.sendgrid_stub:app --port 8025 &
+    python -m loadtest.transport_throughput --url http://127.0.0.1:8025/v3/mail/send -n 20000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.services.email_transport import HTTPBatchTransport, OutgoingMessage
+
+
+async def main(url: str, count: int, batch_size: int, invalid_every: int) -> None:
+    messages = [
+        OutgoingMessage(
+            to_email=f"{'invalid' if invalid_every and i % invalid_every == 0 else 'user'}{i}@example.com",
+            subject="Application",
+            body="Hello",
+            log_id=uuid.uuid4(),
+            template_id="d-application",
+            template_data={"index": i},
+        )
+        for i in range(count)
+    ]
+    transport = HTTPBatchTransport(api_url=url, api_key="stub", batch_size=batch_size)
+    started = time.perf_counter()
+    results = await transport.send_batch(messages)
+    elapsed = time.perf_counter() - started
+    await transport.close()
+
+    sent = sum(1 for r in results if r.ok)
+    print(f"messages={count} sent={sent} failed={count - sent} "
+          f"elapsed={elapsed:.2f}s throughput={count / elapsed:.0f} msg/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://127.0.0.1:8025/v3/mail/send")
+    parser.add_argument("-n", "--count", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--invalid-every", type=int, default=0,
+                        help="make every Nth recipient invalid to exercise batch splitting")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.count, args.batch_size, args.invalid_every))
@@ -0,0 +1,55 @@
+import pytest
+
+import app.models  # noqa: F401  (register all tables on Base.metadata)
+from app.db.base import Base
+from app.db.database import SessionLocal, engine
+from app.models.campaign import Campaign, Contact, EmailLog
+from app.models.user import User
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """Create a fresh schema on DATABASE_URL for the test session."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def db(db_engine):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        with db_engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+
+
+@pytest.fixture
+def campaign(db):
+    user = User(auth0_id="auth0|test", email="owner@example.com")
+    db.add(user)
+    db.flush()
+    campaign = Campaign(user_id=user.id, name="Test campaign")
+    db.add(campaign)
+    db.commit()
+    return campaign
+
+
+@pytest.fixture
+def email_log(db, campaign):
+    contact = Contact(campaign_id=campaign.id, email="recruiter@example.com")
+    db.add(contact)
+    db.flush()
+    log = EmailLog(
+        campaign_id=campaign.id,
+        contact_id=contact.id,
+        email_subject="Hello",
+        email_body="Body",
+    )
+    db.add(log)
+    db.commit()
+    return log
@@ -0,0 +1,63 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionMiddleware, pipeline_backlog
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.utils.rate_limit import KeyedTokenBuckets
+
+INGEST = f"{settings.API_V1_STR}/orchestrator/webhook/ingest"
+CAMPAIGNS = f"{settings.API_V1_STR}/campaigns/"
+
+
+def _client(**kwargs) -> TestClient:
+    app = FastAPI()
+    app.add_api_route(INGEST, lambda: {"status": "accepted"}, methods=["POST"])
+    app.add_api_route(CAMPAIGNS, lambda: [], methods=["GET"])
+    app.add_middleware(
+        AdmissionMiddleware,
+        api_limiter=kwargs.get("api_limiter", KeyedTokenBuckets(600)),
+        ingest_limiter=kwargs.get("ingest_limiter", KeyedTokenBuckets(60, burst=2)),
+        max_backlog=kwargs.get("max_backlog", 0),
+    )
+    return TestClient(app)
+
+
+def test_ingest_is_limited_per_user():
+    """Each user gets their own ingest bucket; an exhausted one answers 429 + Retry-After."""
+    client = _client()
+    alice = {"Authorization": f"Bearer {create_access_token({'sub': 'alice'})}"}
+    bob = {"Authorization": f"Bearer {create_access_token({'sub': 'bob'})}"}
+
+    assert [client.post(INGEST, headers=alice).status_code for _ in range(3)] == [200, 200, 429]
+    rejected = client.post(INGEST, headers=alice)
+    assert rejected.headers["Retry-After"] == "1"
+    assert client.post(INGEST, headers=bob).status_code == 200
+    # The general API budget is separate from the ingest one
+    assert client.get(CAMPAIGNS, headers=alice).status_code == 200
+
+
+def test_ingest_is_shed_when_backlog_is_full(monkeypatch):
+    """Past the backlog threshold new pipeline work is refused, other routes still served."""
+    client = _client(max_backlog=5)
+    monkeypatch.setattr(pipeline_backlog, "value", 5)
+
+    response = client.post(INGEST)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(settings.PIPELINE_SHED_RETRY_AFTER_SECONDS)
+    assert client.get(CAMPAIGNS).status_code == 200
+
+    monkeypatch.setattr(pipeline_backlog, "value", 4)
+    assert client.post(INGEST).status_code == 200
+
+
+def test_rejections_carry_cors_headers(monkeypatch):
+    """A 429 from admission control is still readable by the browser frontend."""
+    from app.main import app
+
+    monkeypatch.setattr(pipeline_backlog, "value", settings.PIPELINE_MAX_BACKLOG)
+    origin = settings.CORS_ORIGINS[0]
+    response = TestClient(app).post(INGEST, json={"text": "resume", "email": "a@example.com"}, headers={"Origin": origin})
+
+    assert response.status_code == 429
+    assert response.headers["access-control-allow-origin"] == origin
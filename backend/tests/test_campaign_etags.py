@@ -0,0 +1,46 @@
+from fastapi.testclient import TestClient
+
+from app.core.security import get_current_user
+from app.db.database import get_db, get_read_db
+from app.main import app
+from app.models.campaign import Contact
+from app.models.user import User
+
+
+def _client(db, campaign):
+    owner = db.get(User, campaign.user_id)
+    app.dependency_overrides[get_current_user] = lambda: owner
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_read_db] = lambda: db
+    return TestClient(app)
+
+
+def test_campaign_reads_answer_304_until_data_changes(db, campaign):
+    """Polling with If-None-Match gets 304 until the campaign or its contacts change."""
+    try:
+        client = _client(db, campaign)
+        detail = app.url_path_for("get_campaign", campaign_id=str(campaign.id))
+        contacts = app.url_path_for("get_campaign_contacts", campaign_id=str(campaign.id))
+        analytics = app.url_path_for("get_campaign_analytics", campaign_id=str(campaign.id))
+
+        etags = {}
+        for path in (detail, contacts, analytics, app.url_path_for("get_user_campaigns")):
+            first = client.get(path)
+            assert first.status_code == 200
+            etags[path] = first.headers["ETag"]
+            cached = client.get(path, headers={"If-None-Match": etags[path]})
+            assert cached.status_code == 304
+            assert cached.content == b""
+
+        db.add(Contact(campaign_id=campaign.id, email="new@example.com"))
+        db.commit()
+        assert client.get(detail, headers={"If-None-Match": etags[detail]}).status_code == 304
+        refreshed = client.get(contacts, headers={"If-None-Match": etags[contacts]})
+        assert refreshed.status_code == 200
+        assert len(refreshed.json()) == 1
+        assert client.get(analytics, headers={"If-None-Match": etags[analytics]}).status_code == 200
+
+        client.put(detail, json={"name": "Renamed"})
+        assert client.get(detail, headers={"If-None-Match": etags[detail]}).json()["name"] == "Renamed"
+    finally:
+        app.dependency_overrides.clear()
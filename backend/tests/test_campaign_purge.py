@@ -0,0 +1,75 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.db.database import SessionLocal, get_db, get_read_db
+from app.main import app
+from app.models.campaign import Campaign, Contact, EmailLog
+from app.models.user import User
+from app.routes import campaigns
+from app.services.campaign_purge import purge_campaign
+
+
+@pytest.fixture
+def client(db, campaign):
+    owner = db.get(User, campaign.user_id)
+    app.dependency_overrides[get_current_user] = lambda: owner
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_read_db] = lambda: db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _add_contacts_with_logs(db, campaign, count):
+    for i in range(count):
+        contact = Contact(campaign_id=campaign.id, email=f"r{i}@example.com")
+        db.add(contact)
+        db.flush()
+        db.add(EmailLog(campaign_id=campaign.id, contact_id=contact.id, email_subject="Hi", email_body="Body"))
+    db.commit()
+
+
+def _count(db, model):
+    return db.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def test_small_campaign_is_deleted_by_database_cascade(db, campaign, email_log, client):
+    """Contacts and logs go with the campaign row without being loaded."""
+    response = client.delete(app.url_path_for("delete_campaign", campaign_id=str(campaign.id)))
+
+    assert response.status_code == 200
+    db.expire_all()
+    assert (_count(db, Campaign), _count(db, Contact), _count(db, EmailLog)) == (0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_large_campaign_is_hidden_then_purged_in_batches(db, campaign, client, monkeypatch):
+    """Deleting returns a handle at once; the purge removes rows in bounded batches."""
+    _add_contacts_with_logs(db, campaign, 5)
+    started = []
+    monkeypatch.setattr(settings, "CAMPAIGN_PURGE_INLINE_ROWS", 4)
+    monkeypatch.setattr(campaigns, "start_purge", started.append)
+
+    response = client.delete(app.url_path_for("delete_campaign", campaign_id=str(campaign.id)))
+    assert response.status_code == 202
+    assert response.json() == {"status": "deleting", "job_id": str(campaign.id)}
+    assert started == [campaign.id]
+    assert client.get(app.url_path_for("get_campaign", campaign_id=str(campaign.id))).status_code == 404
+    progress = app.url_path_for("get_campaign_deletion", campaign_id=str(campaign.id))
+    assert client.get(progress).json() == {"status": "deleting", "remaining_rows": 10}
+
+    batches = []
+
+    def counting_session():
+        batches.append(1)
+        return SessionLocal()
+
+    await purge_campaign(campaign.id, batch_size=2, pause_seconds=0, session_factory=counting_session)
+
+    # 3 batches of logs, 3 of contacts, then the campaign row
+    assert len(batches) == 7
+    db.expire_all()
+    assert (_count(db, Campaign), _count(db, Contact), _count(db, EmailLog)) == (0, 0, 0)
+    assert client.get(progress).json() == {"status": "deleted", "remaining_rows": 0}
@@ -0,0 +1,81 @@
+import zlib
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.models.campaign import ArchivedEmailLog, Contact, EmailLog
+from app.models.email_body import EmailBody
+from app.services import email_archive
+from app.services.body_store import load_bodies, store_bodies
+
+TEMPLATE = (
+    "Hi {name},\n\nI came across the {position} opening at {company} and wanted to reach out. "
+    "I have spent the last six years building backend services in Python and Go, most recently "
+    "leading the migration of a payments platform to an event-driven architecture. I would love "
+    "to learn more about the team and how I could help.\n\nBest regards,\nJane"
+)
+
+
+def test_bodies_are_deduplicated_and_compressed_against_a_base(db):
+    """Identical texts share one row; template renders cost little more than their variables."""
+    bodies = [TEMPLATE.format(name=f"Recruiter {i}", position="Backend Engineer", company=f"Co{i % 50}")
+              for i in range(200)]
+    hashes = store_bodies(db, bodies + bodies[:10], base=bodies[0])
+    db.commit()
+
+    assert len(set(hashes)) == 200
+    assert db.execute(select(func.count()).select_from(EmailBody)).scalar_one() == 200
+    stored = db.execute(select(func.sum(func.length(EmailBody.data)))).scalar_one()
+    plain = sum(len(zlib.compress(body.encode())) for body in bodies)
+    assert stored * 4 < plain
+    assert load_bodies(db, hashes[:3] + [None]) == {h: b for h, b in zip(hashes[:3], bodies)}
+
+
+def test_old_finished_logs_move_to_the_archive(db, campaign, email_log):
+    """Finished logs past the cutoff leave the hot table with their bodies; pending ones stay."""
+    old = datetime.utcnow() - timedelta(days=120)
+    email_log.status, email_log.sent_at, email_log.created_at = "sent", old, old
+    email_log.reply_content = "Sure, let's talk"
+    contact = Contact(campaign_id=campaign.id, email="other@example.com")
+    db.add(contact)
+    db.flush()
+    db.add(EmailLog(campaign_id=campaign.id, contact_id=contact.id, email_subject="Hi",
+                    email_body="Queued", status="pending", created_at=old))
+    db.commit()
+    archived_id = email_log.id
+
+    totals = email_archive.run(days=90, batch_size=1, pause_seconds=0)
+
+    assert totals == {"externalized": 2, "archived": 1, "swept": 0}
+    db.expire_all()
+    pending = db.query(EmailLog).one()
+    assert pending.email_body is None and load_bodies(db, [pending.body_hash]) == {pending.body_hash: "Queued"}
+    archived = db.get(ArchivedEmailLog, archived_id)
+    assert archived.status == "sent" and archived.sent_at == old
+    assert load_bodies(db, [archived.body_hash, archived.reply_hash]) == {
+        archived.body_hash: "Body",
+        archived.reply_hash: "Sure, let's talk",
+    }
+
+
+def test_unreferenced_bodies_are_swept(db, campaign, email_log):
+    """Bodies no log or archived log uses are deleted, bases only once nothing is compressed against them."""
+    texts = [TEMPLATE.format(name=name, position="Engineer", company="Acme") for name in ("Ann", "Bob", "Cy")]
+    base, kept, dropped = store_bodies(db, texts, base=texts[0])
+    orphan_reply, fresh = store_bodies(db, ["Not interested, thanks", "Just stored"])
+    email_log.body_hash, email_log.email_body = kept, None
+    db.flush()
+    old = datetime.utcnow() - timedelta(days=1)
+    db.query(EmailBody).filter(EmailBody.hash != fresh).update({"created_at": old})
+    db.commit()
+
+    totals = email_archive.run(days=90, batch_size=10, pause_seconds=0)
+
+    assert totals["swept"] == 2
+    remaining = set(db.execute(select(EmailBody.hash)).scalars())
+    assert remaining == {base, kept, fresh}
+
+    db.delete(email_log)
+    db.commit()
+    assert email_archive.run(days=90, batch_size=10, pause_seconds=0)["swept"] == 2
+    assert set(db.execute(select(EmailBody.hash)).scalars()) == {fresh}
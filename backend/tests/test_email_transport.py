@@ -0,0 +1,54 @@
+import json
+
+import httpx
+import pytest
+
+from app.services.email_transport import (
+    HTTPBatchTransport,
+    OutgoingMessage,
+    SendResult,
+    record_send_results,
+)
+
+
+def _provider(requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        requests.append(payload)
+        emails = [p["to"][0]["email"] for p in payload["personalizations"]]
+        if any("invalid" in e for e in emails):
+            return httpx.Response(400, json={"errors": [{"message": "invalid email"}]})
+        return httpx.Response(202, headers={"X-Message-Id": f"msg-{len(requests)}"})
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_http_transport_groups_and_splits_batches():
+    """Shared templates go out as one request; a bad address is isolated by splitting."""
+    requests = []
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_provider(requests)))
+    transport = HTTPBatchTransport(api_url="http://stub/v3/mail/send", api_key="k", batch_size=100, client=client)
+
+    messages = [
+        OutgoingMessage(to_email=f"user{i}@example.com", subject="Hi", body="", template_id="d-1")
+        for i in range(7)
+    ]
+    messages.append(OutgoingMessage(to_email="invalid@example.com", subject="Hi", body="", template_id="d-1"))
+    results = await transport.send_batch(messages)
+    await transport.close()
+
+    assert len(requests[0]["personalizations"]) == 8
+    failed = [r for r in results if not r.ok]
+    assert [r.message.to_email for r in failed] == ["invalid@example.com"]
+    assert all(r.message_id for r in results if r.ok)
+
+
+def test_record_send_results_updates_logs(db, email_log):
+    """Message ids and statuses are written back in bulk."""
+    message = OutgoingMessage(to_email="recruiter@example.com", subject="Hello", body="Body", log_id=email_log.id)
+    assert record_send_results(db, [SendResult(message, message_id="msg-1")]) == 1
+
+    db.refresh(email_log)
+    assert email_log.status == "sent"
+    assert email_log.sendgrid_message_id == "msg-1"
+    assert email_log.sent_at is not None
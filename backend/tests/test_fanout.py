@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from app.utils.fanout import fan_out
+
+
+@pytest.mark.asyncio
+async def test_fan_out_bounds_concurrency_and_isolates_failures():
+    """Slow and failing items are recorded per item while the rest finish, in input order."""
+    in_flight = peak = 0
+
+    async def worker(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            if item == "slow":
+                await asyncio.sleep(5)
+            await asyncio.sleep(0.01)
+            if item == "boom":
+                raise RuntimeError("smtp down")
+            return item.upper()
+        finally:
+            in_flight -= 1
+
+    items = ["a", "slow", "b", "boom", "c", "d"]
+    summary = await fan_out(items, worker, concurrency=2, timeout=0.1)
+
+    assert peak == 2
+    assert summary.values == ["A", "B", "C", "D"]
+    assert [(r.item, r.timed_out) for r in summary.failures] == [("slow", True), ("boom", False)]
+    assert summary.counts()["timed_out"] == 1 and summary.counts()["failed"] == 1
+    assert summary.seconds < 1
@@ -0,0 +1,92 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import hf_mcp_client
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, hedged
+
+
+def test_breaker_opens_and_probes_half_open(monkeypatch):
+    """Consecutive failures open the circuit; after the recovery period one probe decides."""
+    now = [100.0]
+    monkeypatch.setattr("app.utils.circuit_breaker.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=30)
+
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    now[0] += 31
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    now[0] += 31
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_retries(monkeypatch):
+    """A 503 opens the shared breaker; later calls raise immediately instead of hitting HF."""
+    monkeypatch.setattr(hf_mcp_client, "hf_breaker", CircuitBreaker(failure_threshold=1, recovery_seconds=60))
+    calls = []
+
+    async def unavailable(text, timeout):
+        calls.append(text)
+        raise hf_mcp_client.MCPUnavailableError("loading")
+
+    monkeypatch.setattr(hf_mcp_client, "_request_entities", unavailable)
+
+    with pytest.raises(hf_mcp_client.MCPUnavailableError):
+        await hf_mcp_client._extract_chunk("resume")
+    with pytest.raises(hf_mcp_client.MCPCircuitOpenError):
+        await hf_mcp_client._extract_chunk("resume")
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_returns_faster_copy():
+    """A call still running after the delay is raced by a second one, and the loser is cancelled."""
+    started = []
+    cancelled = []
+
+    async def call():
+        attempt = len(started)
+        started.append(attempt)
+        try:
+            await asyncio.sleep(1.0 if attempt == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return attempt
+
+    assert await hedged(call, delay=0.02) == 1
+    await asyncio.sleep(0)
+    assert started == [0, 1] and cancelled == [0]
+
+
+@pytest.mark.asyncio
+async def test_hedged_error_does_not_beat_slow_success(monkeypatch):
+    """A hedge that fails fast with 503 keeps waiting for the slower primary's 200."""
+    attempts = []
+
+    async def handler(request):
+        attempt = len(attempts)
+        attempts.append(attempt)
+        if attempt == 0:
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json=[{"generated_text": '{"candidate_name": "Rita"}'}])
+        return httpx.Response(503, text="loading")
+
+    client_class = httpx.AsyncClient
+    monkeypatch.setattr(hf_mcp_client.httpx, "AsyncClient",
+                        lambda **kwargs: client_class(transport=httpx.MockTransport(handler), **kwargs))
+    monkeypatch.setattr(hf_mcp_client, "_hedge_delay", lambda: 0.02)
+
+    assert await hf_mcp_client._request_entities("resume", timeout=5) == {"candidate_name": "Rita"}
+    assert attempts == [0, 1]
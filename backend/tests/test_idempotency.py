@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.routes import orchestrator
+from app.services.idempotency import MemoryIdempotencyStore, request_key
+
+INGEST = f"{settings.API_V1_STR}/orchestrator/webhook/ingest"
+
+
+@pytest.fixture
+def runs(db, monkeypatch):
+    monkeypatch.setattr(orchestrator, "idempotency_store", MemoryIdempotencyStore(ttl_seconds=60))
+    calls = []
+
+    async def fake_pipeline(payload):
+        calls.append(payload)
+
+    monkeypatch.setattr(orchestrator, "process_resume_job", fake_pipeline)
+    return calls
+
+
+def test_retried_ingest_returns_original_job(runs):
+    """A retry with the same Idempotency-Key, or the same content, reuses the first job."""
+    client = TestClient(app)
+    body = {"text": "Jane Doe, Python engineer", "email": "jane@example.com"}
+
+    first = client.post(INGEST, json=body, headers={"Idempotency-Key": "n8n-42"}).json()
+    retry = client.post(INGEST, json=body, headers={"Idempotency-Key": "n8n-42"}).json()
+    assert first["status"] == "accepted"
+    assert retry == {"status": "duplicate", "job_id": first["job_id"], "job_status": "completed"}
+
+    by_content = client.post(INGEST, json={**body, "email": "JANE@example.com "}).json()
+    again = client.post(INGEST, json=body).json()
+    assert by_content["status"] == "accepted" and again["job_id"] == by_content["job_id"]
+    assert client.post(INGEST, json={**body, "email": "john@example.com"}).json()["status"] == "accepted"
+    assert len(runs) == 3
+
+
+def test_retry_after_failed_job_runs_again(runs, monkeypatch):
+    """A failed job gives up its key, so resending the request starts a new run."""
+    client = TestClient(app, raise_server_exceptions=False)
+    body = {"text": "Jane Doe, Python engineer", "email": "jane@example.com"}
+
+    async def crashing_pipeline(payload):
+        runs.append(payload)
+        raise RuntimeError("scraper down")
+
+    monkeypatch.setattr(orchestrator, "process_resume_job", crashing_pipeline)
+    first = client.post(INGEST, json=body, headers={"Idempotency-Key": "n8n-43"}).json()
+    retry = client.post(INGEST, json=body, headers={"Idempotency-Key": "n8n-43"}).json()
+
+    assert first["status"] == retry["status"] == "accepted"
+    assert retry["job_id"] != first["job_id"]
+    assert len(runs) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_coalesce_on_one_claim():
+    """Only one of many simultaneous claims for a key wins; the rest see its record."""
+    store = MemoryIdempotencyStore(ttl_seconds=60)
+    key = request_key(None, "resume", "a@example.com")
+
+    results = await asyncio.gather(*(store.claim(key, {"job_id": str(i), "status": "queued"}) for i in range(5)))
+
+    assert results.count(None) == 1
+    assert {r["job_id"] for r in results if r} == {"0"}
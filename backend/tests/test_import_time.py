@@ -0,0 +1,39 @@
+import subprocess
+import sys
+from pathlib import Path
+
+# Only needed by pipeline workers; importing the API must not pull them in
+LAZY_MODULES = ("pdfminer", "docx", "bs4", "lxml", "jinja2", "aiosmtplib", "numpy", "scipy")
+# Generous ceiling for `import app.main`: meant to catch a heavy dependency
+# creeping back into the import chain, not to measure machine speed
+IMPORT_BUDGET_MS = 4000
+
+
+def _import_times(module: str) -> dict:
+    """Cumulative import time in ms per module, from ``python -X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=Path(__file__).resolve().parent.parent, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            times[parts[2].strip()] = int(parts[1]) / 1000
+    return times
+
+
+def test_api_import_skips_heavy_pipeline_dependencies():
+    """Parsers, templating and SMTP are imported on first use, not at startup."""
+    times = _import_times("app.main")
+    eager = sorted(name for name in times if name.split(".")[0] in LAZY_MODULES)
+    assert not eager, f"imported at startup: {eager}"
+
+
+def test_api_import_time_budget():
+    """`import app.main` stays within the startup budget."""
+    times = _import_times("app.main")
+    slowest = sorted(
+        ((ms, name) for name, ms in times.items() if name.startswith("app.")), reverse=True
+    )[:10]
+    assert times["app.main"] < IMPORT_BUDGET_MS, f"slowest app modules (cumulative ms): {slowest}"
@@ -0,0 +1,30 @@
+from app.services.job_ranker import rank_jobs, score_jobs
+
+JOBS = [
+    {"title": "Marketing Manager", "company": "Acme", "url": "https://example.com/1"},
+    {"title": "Junior Backend Engineer (Python)", "company": "Globex", "url": "https://example.com/2"},
+    {"title": "Senior Backend Engineer (Python)", "company": "Initech", "url": "https://example.com/3"},
+    {"title": "Frontend Developer (React)", "company": "Hooli", "url": "https://example.com/4"},
+    {"title": "Software Engineer", "company": "Soylent", "url": "https://example.com/5"},
+]
+ENTITIES = {
+    "positions": ["Backend Engineer"],
+    "top_skills": ["Python", "PostgreSQL"],
+    "years_of_experience": "6 years",
+}
+
+
+def test_rank_jobs_prefers_matching_title_and_seniority():
+    """Relevant postings come first, seniority breaks ties and unrelated ones are dropped."""
+    ranked = rank_jobs(JOBS, ENTITIES, top_k=3, min_score=0.05)
+
+    assert [job["url"] for job in ranked[:2]] == ["https://example.com/3", "https://example.com/2"]
+    assert all(job["title"] != "Marketing Manager" for job in ranked)
+    assert ranked == sorted(ranked, key=lambda job: job["score"], reverse=True)
+
+
+def test_rank_jobs_applies_threshold_and_handles_empty_profiles():
+    """Nothing clears a high floor, and an empty profile scores every job zero."""
+    assert rank_jobs(JOBS, ENTITIES, min_score=0.99) == []
+    assert score_jobs(JOBS, {}) == [0.0] * len(JOBS)
+    assert rank_jobs([], ENTITIES) == []
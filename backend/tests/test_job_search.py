@@ -0,0 +1,49 @@
+import pytest
+
+from app.services.linkedin_scraper import PoliteLinkedInScraper
+from app.services.search_planner import plan_search_urls
+
+BASE = "https://jobs.example.com/search"
+
+
+def test_plan_search_urls_dedupes_and_puts_first_pages_first():
+    """Duplicate positions collapse, and the cap drops deep pages before positions."""
+    urls = plan_search_urls(
+        ["Backend Engineer", " backend  engineer", "Python Developer"],
+        locations=["Remote"], pages=3, base_url=BASE, max_urls=4,
+    )
+
+    assert urls == [
+        f"{BASE}?keywords=Backend%20Engineer&location=Remote",
+        f"{BASE}?keywords=Python%20Developer&location=Remote",
+        f"{BASE}?keywords=Backend%20Engineer&location=Remote&start=25",
+        f"{BASE}?keywords=Python%20Developer&location=Remote&start=25",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_jobs_merges_postings_by_job_url(monkeypatch):
+    """A posting found by two searches is returned once; a failed page does not sink the search."""
+    pages = {
+        f"{BASE}?keywords=a": [
+            {"title": "Backend Engineer", "company": "Acme", "url": "https://jobs.example.com/view/1?trk=a"},
+            {"title": "Data Engineer", "company": "Globex", "url": "https://jobs.example.com/view/2"},
+        ],
+        f"{BASE}?keywords=b": [
+            {"title": "Backend Engineer", "company": "Acme", "url": "https://jobs.example.com/view/1?trk=b"},
+        ],
+    }
+
+    async def scrape(url):
+        if url not in pages:
+            raise RuntimeError("blocked")
+        return pages[url]
+
+    scraper = PoliteLinkedInScraper()
+    monkeypatch.setattr(scraper, "_scrape_job_page", scrape)
+    try:
+        jobs = await scraper.search_jobs(list(pages) + [f"{BASE}?keywords=c"], max_results=10)
+    finally:
+        await scraper.close()
+
+    assert [job["title"] for job in jobs] == ["Backend Engineer", "Data Engineer"]
@@ -0,0 +1,9 @@
+from loadtest.pipeline_load import histogram_quantile
+
+
+def test_histogram_quantile_interpolates_within_bucket():
+    """Quantiles are interpolated inside the bucket holding the rank, like PromQL."""
+    buckets = {0.1: 50.0, 0.5: 90.0, 1.0: 100.0, float("inf"): 100.0}
+    assert histogram_quantile(buckets, 0.5) == 0.1
+    assert abs(histogram_quantile(buckets, 0.7) - 0.3) < 1e-9
+    assert histogram_quantile({float("inf"): 0.0}, 0.5) is None
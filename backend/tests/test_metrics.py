@@ -0,0 +1,13 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def test_metrics_endpoint_reports_route_latency():
+    """Requests are recorded under their route template and exposed on /metrics."""
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        body = client.get("/metrics").text
+
+    assert 'referralflow_http_request_seconds_count{method="GET",route="/health",status="200"}' in body
+    assert "referralflow_pipeline_stage_seconds" in body
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models.campaign import Contact, EmailLog
+from app.services.email_transport import EmailTransport, SendResult
+from app.services.outbox import OutboxDispatcher
+from app.utils.rate_limit import KeyedTokenBuckets, RedisTokenBuckets
+
+
+class RecordingTransport(EmailTransport):
+    def __init__(self):
+        self.sent = []
+
+    async def send_batch(self, messages):
+        self.sent.extend(messages)
+        return [SendResult(m, message_id="msg-1") for m in messages]
+
+
+def _add_logs(db, campaign, emails):
+    logs = []
+    for email in emails:
+        contact = Contact(campaign_id=campaign.id, email=email)
+        db.add(contact)
+        db.flush()
+        log = EmailLog(campaign_id=campaign.id, contact_id=contact.id, email_subject="Hi", email_body="Body")
+        db.add(log)
+        logs.append(log)
+    db.commit()
+    return logs
+
+
+@pytest.mark.asyncio
+async def test_outbox_claims_sends_and_reclaims_expired_leases(db, campaign):
+    """Pending logs are sent once; a crashed worker's lease is picked up after expiry."""
+    logs = _add_logs(db, campaign, ["a@one.com", "b@two.com", "c@three.com"])
+    logs[2].status = "sending"
+    logs[2].lease_owner = "crashed-worker"
+    logs[2].lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    transport = RecordingTransport()
+    dispatcher = OutboxDispatcher(worker_id="w1", transport=transport,
+                                  per_user_per_minute=0, per_domain_per_minute=0)
+    assert await dispatcher.dispatch_once() == 3
+    assert await dispatcher.dispatch_once() == 0
+
+    for log in logs:
+        db.refresh(log)
+        assert log.status == "sent"
+        assert log.sendgrid_message_id == "msg-1"
+    assert logs[2].lease_owner == "w1"
+
+
+@pytest.mark.asyncio
+async def test_outbox_domain_cap_defers_excess_logs(db, campaign):
+    """Logs over the per-domain cap go back to pending with a not-before time."""
+    logs = _add_logs(db, campaign, ["a@same.com", "b@same.com", "c@other.com"])
+
+    transport = RecordingTransport()
+    dispatcher = OutboxDispatcher(worker_id="w1", transport=transport,
+                                  per_user_per_minute=0, per_domain_per_minute=1)
+    assert await dispatcher.dispatch_once() == 2
+    assert sorted(m.to_email for m in transport.sent) == ["a@same.com", "c@other.com"]
+
+    db.refresh(logs[1])
+    assert logs[1].status == "pending"
+    assert logs[1].lease_owner is None
+    assert logs[1].lease_expires_at > datetime.utcnow()
+    assert logs[1].attempts == 0
+
+
+class AsyncBuckets:
+    """In-memory stand-in with the coroutine interface of RedisTokenBuckets."""
+
+    def __init__(self, per_minute):
+        self.buckets = KeyedTokenBuckets(per_minute)
+
+    async def try_acquire(self, key, tokens=1.0):
+        return self.buckets.try_acquire(key, tokens)
+
+    async def refund(self, key, tokens=1.0):
+        self.buckets.refund(key, tokens)
+
+
+def test_outbox_caps_are_shared_with_redis_backend(monkeypatch):
+    """With the redis backend every dispatcher draws from the same per-user and per-domain buckets."""
+    monkeypatch.setattr(settings, "RATE_LIMIT_BACKEND", "redis")
+    dispatcher = OutboxDispatcher(worker_id="w1", transport=RecordingTransport())
+    assert isinstance(dispatcher.user_limits, RedisTokenBuckets)
+    assert isinstance(dispatcher.domain_limits, RedisTokenBuckets)
+    assert dispatcher.user_limits.prefix != dispatcher.domain_limits.prefix
+
+
+@pytest.mark.asyncio
+async def test_outbox_throttles_with_async_limiters(db, campaign):
+    """Two dispatchers sharing one (async) domain limiter send one log per domain between them."""
+    _add_logs(db, campaign, ["a@same.com", "b@same.com"])
+    shared = AsyncBuckets(1)
+
+    transport = RecordingTransport()
+    first = OutboxDispatcher(worker_id="w1", transport=transport, batch_size=1)
+    second = OutboxDispatcher(worker_id="w2", transport=transport, batch_size=1)
+    for dispatcher in (first, second):
+        dispatcher.domain_limits, dispatcher.user_limits = shared, AsyncBuckets(0)
+
+    assert await first.dispatch_once() == 1
+    assert await second.dispatch_once() == 0
+    assert [m.to_email for m in transport.sent] == ["a@same.com"]
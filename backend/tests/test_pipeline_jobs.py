@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.models.pipeline_job import PipelineJob, PipelineStage
+from app.routes import orchestrator
+from app.services import pipeline_jobs
+from app.services.idempotency import MemoryIdempotencyStore
+from app.services.pipeline_jobs import JobEventBroadcaster, create_job, set_stage
+
+INGEST = f"{settings.API_V1_STR}/orchestrator/webhook/ingest"
+
+
+def test_job_status_and_event_stream(db, monkeypatch):
+    """An accepted ingest gets a job record whose stages can be read and streamed."""
+    monkeypatch.setattr(orchestrator, "idempotency_store", MemoryIdempotencyStore(ttl_seconds=60))
+
+    async def fake_pipeline(payload):
+        await set_stage(payload["job_id"], PipelineStage.SEARCHING)
+        await set_stage(payload["job_id"], PipelineStage.DONE, jobs=2, sent=2)
+
+    monkeypatch.setattr(orchestrator, "process_resume_job", fake_pipeline)
+    client = TestClient(app)
+
+    job_id = client.post(INGEST, json={"text": "Resume", "email": "a@example.com"}).json()["job_id"]
+    status = client.get(app.url_path_for("get_pipeline_job", job_id=job_id)).json()
+    assert status["stage"] == "done" and status["detail"] == {"jobs": 2, "sent": 2}
+
+    with client.stream("GET", app.url_path_for("stream_pipeline_job", job_id=job_id)) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+    assert body.startswith("event: stage\ndata: ")
+    assert json.loads(body.split("data: ", 1)[1])["stage"] == "done"
+
+    missing = app.url_path_for("stream_pipeline_job", job_id="00000000-0000-0000-0000-000000000000")
+    assert client.get(missing).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_delivers_local_and_polled_transitions(db, monkeypatch):
+    """Local transitions arrive immediately; ones written by another worker arrive via the poller."""
+    broadcaster = JobEventBroadcaster(poll_seconds=0.05)
+    monkeypatch.setattr(pipeline_jobs, "job_events", broadcaster)
+    job_id = "8f1c0c2e-5a0b-4f5e-9a59-2f6f1d3b8f00"
+    create_job(job_id, "a@example.com")
+
+    queue = broadcaster.subscribe(job_id)
+    await set_stage(job_id, PipelineStage.EXTRACTING)
+    assert (await asyncio.wait_for(queue.get(), 1))["stage"] == "extracting"
+
+    # Another worker moves the job on; only the database knows
+    db.query(PipelineJob).update({"stage": PipelineStage.SENDING})
+    db.commit()
+    assert (await asyncio.wait_for(queue.get(), 1))["stage"] == "sending"
+
+    broadcaster.unsubscribe(job_id, queue)
+    await asyncio.sleep(0.1)
+    assert broadcaster._poller.done()
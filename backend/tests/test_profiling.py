@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.profiling import ProfilingMiddleware, StackSampler, profile_store
+from app.routes import admin
+
+ADMIN = "/admin"
+
+
+def _busy_wait(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+def test_stack_sampler_collects_folded_stacks():
+    """Samples of a busy thread come back as 'frame;frame count' lines."""
+    worker = threading.Thread(target=_busy_wait, args=(0.3,))
+    worker.start()
+    sampler = StackSampler(0.005, worker.ident).start()
+    worker.join()
+    sampler.stop()
+
+    folded = sampler.folded()
+    assert folded
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert "_busy_wait (test_profiling.py" in stack
+    assert int(count) > 0
+
+
+def _client(monkeypatch, token="s3cret", slow_ms=0) -> TestClient:
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", token)
+    monkeypatch.setattr(settings, "PROFILER_SLOW_REQUEST_MS", slow_ms)
+    monkeypatch.setattr(settings, "PROFILER_SAMPLE_INTERVAL_MS", 2)
+    app = FastAPI()
+    app.include_router(admin.router, prefix=ADMIN)
+
+    @app.get("/busy")
+    async def busy():
+        _busy_wait(0.1)
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("configured, sent", [("s3cret", None), ("s3cret", "wrong"), ("", ""), ("", "anything")])
+def test_admin_endpoints_require_the_admin_token(monkeypatch, configured, sent):
+    """Profiles are refused without the right token, and always when none is configured."""
+    client = _client(monkeypatch, token=configured)
+    headers = {"X-Admin-Token": sent} if sent is not None else {}
+    assert client.get(f"{ADMIN}/profiles", headers=headers).status_code == 403
+    assert client.get(f"{ADMIN}/profiles/abc", headers=headers).status_code == 403
+
+
+def test_on_demand_profile_is_captured_and_served(monkeypatch):
+    """X-Profile-Request with the admin token returns an id whose profile shows the busy handler."""
+    client = _client(monkeypatch)
+    admin_headers = {"X-Admin-Token": "s3cret"}
+
+    assert "x-profile-id" not in client.get("/busy", headers={"X-Profile-Request": "1"}).headers
+    response = client.get("/busy", headers={"X-Profile-Request": "1", **admin_headers})
+    capture_id = response.headers["x-profile-id"]
+
+    profile = client.get(f"{ADMIN}/profiles/{capture_id}", headers=admin_headers)
+    assert profile.status_code == 200
+    assert "_busy_wait (test_profiling.py" in profile.text
+    assert client.get(f"{ADMIN}/profiles/missing", headers=admin_headers).status_code == 404
+
+
+def test_slow_requests_are_captured_automatically(monkeypatch):
+    """Requests over PROFILER_SLOW_REQUEST_MS are saved without any header."""
+    client = _client(monkeypatch, slow_ms=50)
+    response = client.get("/busy")
+    assert "x-profile-id" not in response.headers
+
+    captures = client.get(f"{ADMIN}/profiles", headers={"X-Admin-Token": "s3cret"}).json()
+    slow = next(c for c in captures if c["path"] == "/busy" and c["reason"] == "slow")
+    assert slow["duration_ms"] >= 50
+    assert "_busy_wait" in profile_store.get(slow["id"])["folded"]
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from app.services.body_store import load_bodies
+from app.services.provider_events import apply_provider_events
+
+
+def _event(event_type, ts, **extra):
+    return {
+        "email": "Recruiter@example.com",
+        "event": event_type,
+        "timestamp": ts,
+        "sg_message_id": "msg-123.filter0001.16648.5515E0B88.0",
+        "sg_event_id": f"{event_type}-{ts}",
+        **extra,
+    }
+
+
+def test_provider_events_apply_monotonic_transitions(db, email_log):
+    """Bounces win over late deliveries and the first open time is kept."""
+    email_log.sendgrid_message_id = "msg-123"
+    db.commit()
+
+    batch = [
+        _event("open", 1700000200),
+        _event("bounce", 1700000300, reason="mailbox full"),
+        _event("delivered", 1700000100),
+        _event("open", 1700000100),
+        {"event": "delivered", "sg_message_id": "unknown.filter0001", "timestamp": 1700000000},
+    ]
+    assert apply_provider_events(db, batch) == 1
+
+    db.refresh(email_log)
+    assert email_log.status == "bounced"
+    assert email_log.error_message == "mailbox full"
+    assert email_log.is_opened
+    assert email_log.opened_at == datetime.utcfromtimestamp(1700000100)
+
+
+def test_provider_events_are_idempotent(db, email_log):
+    """Replaying the same batch leaves the log unchanged."""
+    email_log.sendgrid_message_id = "msg-123"
+    db.commit()
+
+    batch = [_event("delivered", 1700000100), _event("reply", 1700000500, text="Let's talk")]
+    apply_provider_events(db, batch)
+    apply_provider_events(db, batch)
+
+    db.refresh(email_log)
+    assert email_log.status == "delivered"
+    assert email_log.is_replied
+    assert load_bodies(db, [email_log.reply_hash]) == {email_log.reply_hash: "Let's talk"}
+
+
+def test_out_of_range_timestamps_do_not_fail_the_batch(db, email_log):
+    """Timestamps that overflow a datetime fall back to now instead of rejecting the batch."""
+    email_log.sendgrid_message_id = "msg-123"
+    db.commit()
+
+    batch = [_event("open", 1e20), _event("delivered", float("inf")), _event("click", -1e300)]
+    assert apply_provider_events(db, batch) == 1
+
+    db.refresh(email_log)
+    assert email_log.status == "delivered"
+    assert email_log.is_opened and email_log.is_clicked
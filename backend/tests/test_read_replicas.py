@@ -0,0 +1,53 @@
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.db.database import ReplicaRouter, build_engine, engine
+
+
+def _replica(name="replica0"):
+    # The test database is not in recovery, so it reports zero lag
+    return build_engine(settings.DATABASE_URL, name, pool_size=2, max_overflow=1, pool_recycle=60, pool_timeout=5)
+
+
+def test_reads_use_fresh_replicas_and_report_pool_usage(db_engine):
+    """A caught-up replica serves reads; lag is checked once per interval and pool use is exported."""
+    replica = _replica()
+    router = ReplicaRouter(engine, [replica], max_lag_seconds=5, check_seconds=60)
+    checks = []
+    measure = router._measure_lag
+    router._measure_lag = lambda target: checks.append(target) or measure(target)
+    try:
+        assert router.pick() is replica
+        assert router.pick() is replica
+        assert len(checks) == 1
+
+        with replica.connect():
+            assert REGISTRY.get_sample_value("referralflow_db_pool_in_use", {"engine": "replica0"}) == 1
+        assert REGISTRY.get_sample_value("referralflow_db_pool_in_use", {"engine": "replica0"}) == 0
+        assert REGISTRY.get_sample_value("referralflow_db_pool_capacity", {"engine": "replica0"}) == 3
+        assert REGISTRY.get_sample_value("referralflow_db_replica_lag_seconds", {"engine": "replica0"}) == 0
+    finally:
+        replica.dispose()
+
+
+def test_lagging_or_unreachable_replicas_fall_back_to_primary(db_engine):
+    """Reads go to the primary while every replica is too far behind or down."""
+    lagging, down = _replica("replica_lagging"), _replica("replica_down")
+    router = ReplicaRouter(engine, [lagging, down], max_lag_seconds=5, check_seconds=0)
+
+    def measure(target):
+        if target is down:
+            raise ConnectionError("replica unreachable")
+        return 30.0
+
+    router._measure_lag = measure
+    before = REGISTRY.get_sample_value("referralflow_db_read_fallback_total", {"reason": "lagging"}) or 0
+    try:
+        assert router.pick() is engine
+        assert REGISTRY.get_sample_value("referralflow_db_read_fallback_total", {"reason": "lagging"}) == before + 1
+
+        router._measure_lag = lambda target: 0.5
+        assert router.pick() in (lagging, down)
+    finally:
+        lagging.dispose()
+        down.dispose()
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from app.services import hf_mcp_client
+from app.services.resume_chunker import chunk_resume, merge_entities, split_sections
+
+ROLES = "\n".join(
+    f"Senior Engineer, Company {i} ({2024 - 2 * i} - {2026 - 2 * i})\n" + "Built and ran services at scale. " * 12
+    for i in range(12)
+)
+LONG_RESUME = f"""Jane Doe
+jane@example.com
+
+EXPERIENCE
+{ROLES}
+
+Education
+B.Tech. Computer Science
+
+Technical Skills:
+Python, Go, PostgreSQL, Kubernetes
+
+References
+Available on request
+"""
+
+
+def test_long_resume_keeps_skills_and_recent_roles():
+    """Chunks cover the header, skills and newest roles first and skip references."""
+    assert [s.name for s in split_sections(LONG_RESUME)] == [
+        "header", "experience", "education", "skills", "ignored",
+    ]
+
+    chunks = chunk_resume(LONG_RESUME, max_tokens=400, max_chunks=3)
+    assert len(chunks) == 3
+    assert all(len(chunk) <= 1600 for chunk in chunks)
+    assert chunks[0].startswith("Jane Doe")
+    assert "Kubernetes" in chunks[0]
+    assert "Company 0" in chunks[0]
+    assert "Company 11" not in "".join(chunks)
+    assert "Available on request" not in "".join(chunks)
+    assert chunk_resume("Jane Doe\nPython", max_tokens=400, max_chunks=3) == ["Jane Doe\nPython"]
+
+
+UNBROKEN = " ".join(f"Built service {i} in Python and Go for team {i % 7}." for i in range(400))
+
+
+@pytest.mark.parametrize("text", [UNBROKEN, "Jane Doe\n" + UNBROKEN])
+def test_resume_without_line_breaks_or_headings_is_fully_chunked(text):
+    """A single-line (or heading-less) resume is split into full chunks covering nearly all of it."""
+    chunks = chunk_resume(text, max_tokens=750, max_chunks=10)
+    assert 1 < len(chunks) <= 10
+    assert all(len(chunk) <= 3000 for chunk in chunks)
+    assert all(len(chunk) > 2500 for chunk in chunks[:-1])
+    covered = sum(len(chunk) for chunk in chunks)
+    assert covered >= 0.98 * len(text)
+    assert chunks[0].startswith(text[:40]) and chunks[-1].endswith("team 0.")
+
+
+def test_merge_entities_is_order_stable():
+    partials = [
+        {"candidate_name": "Jane Doe", "top_skills": ["Python", "Go"], "years_of_experience": "8 years"},
+        {"candidate_name": None, "top_skills": ["python", "Kubernetes"], "years_of_experience": 12,
+         "positions": ["Staff Engineer"]},
+    ]
+    assert merge_entities(partials) == {
+        "candidate_name": "Jane Doe",
+        "top_skills": ["Python", "Go", "Kubernetes"],
+        "years_of_experience": 12,
+        "positions": ["Staff Engineer"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_extracted_concurrently_and_merged_in_order(monkeypatch):
+    """Chunks run in parallel; the merge follows chunk order, not completion order."""
+    monkeypatch.setattr(hf_mcp_client.settings, "HF_MCP_TOKEN", "token")
+    monkeypatch.setattr(hf_mcp_client.settings, "HF_CHUNK_MAX_TOKENS", 400)
+    monkeypatch.setattr(hf_mcp_client.settings, "HF_MAX_CHUNKS", 3)
+    in_flight = peak = 0
+
+    async def fake_extract(chunk, timeout=60):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        index = 0 if chunk.startswith("Jane Doe") else 1
+        await asyncio.sleep(0.05 if index == 0 else 0.01)  # first chunk finishes last
+        in_flight -= 1
+        return {"candidate_name": f"name {index}", "top_skills": [f"skill {index}"]}
+
+    monkeypatch.setattr(hf_mcp_client, "_extract_chunk", fake_extract)
+    result = await hf_mcp_client.extract_entities_from_text(LONG_RESUME)
+
+    assert peak == 3
+    assert result == {"candidate_name": "name 0", "top_skills": ["skill 0", "skill 1"]}
@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.campaign import CampaignStatus, Contact, EmailLog
+from app.services.body_store import load_bodies
+from app.services.campaign_launcher import CampaignTemplateError, launch_campaign
+from app.services.scheduler import CampaignScheduler
+
+
+def test_scheduler_heap_honours_reschedules_and_cancels():
+    """Only the latest schedule per campaign fires, in due order."""
+    scheduler = CampaignScheduler()
+    scheduler.is_leader = True
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    scheduler.on_campaign_changed("a", CampaignStatus.SCHEDULED, now + timedelta(minutes=5))
+    scheduler.on_campaign_changed("b", CampaignStatus.SCHEDULED, now + timedelta(minutes=1))
+    scheduler.on_campaign_changed("c", CampaignStatus.SCHEDULED, now + timedelta(minutes=2))
+    scheduler.on_campaign_changed("a", CampaignStatus.SCHEDULED, now + timedelta(minutes=3))
+    scheduler.on_campaign_changed("c", CampaignStatus.DRAFT, None)
+
+    assert scheduler.next_due() == now + timedelta(minutes=1)
+    assert scheduler.pop_due(now + timedelta(minutes=10)) == ["b", "a"]
+    assert scheduler.next_due() is None
+
+
+def test_launch_campaign_queues_logs_once(db, campaign):
+    """Launching a scheduled campaign queues one pending log per contact, once."""
+    campaign.status = CampaignStatus.SCHEDULED
+    campaign.email_template = "Hi {{ name }} at {{ company }}"
+    db.add(Contact(campaign_id=campaign.id, email="r@acme.com", name="Rita", company="Acme"))
+    db.commit()
+
+    assert launch_campaign(db, campaign.id, expected_status=CampaignStatus.SCHEDULED) == 1
+    assert launch_campaign(db, campaign.id, expected_status=CampaignStatus.SCHEDULED) == -1
+
+    log = db.query(EmailLog).one()
+    assert log.status == "pending"
+    assert log.email_body is None
+    assert load_bodies(db, [log.body_hash]) == {log.body_hash: "Hi Rita at Acme"}
+    db.refresh(campaign)
+    assert campaign.status == CampaignStatus.ACTIVE
+
+
+@pytest.mark.parametrize("template", [
+    "{{ ''.__class__.__mro__[1].__subclasses__() }}",
+    "Hi {{ nme }}",
+    "Hi {{ name",
+])
+def test_launch_campaign_rejects_unsafe_or_broken_templates(db, campaign, template):
+    """A template that walks into Python internals, or does not render, pauses the campaign with nothing queued."""
+    campaign.status = CampaignStatus.SCHEDULED
+    campaign.email_template = template
+    db.add(Contact(campaign_id=campaign.id, email="r@acme.com", name="Rita", company="Acme"))
+    db.commit()
+
+    with pytest.raises(CampaignTemplateError):
+        launch_campaign(db, campaign.id, expected_status=CampaignStatus.SCHEDULED)
+
+    assert db.query(EmailLog).count() == 0
+    db.refresh(campaign)
+    assert campaign.status == CampaignStatus.PAUSED
+
+
+@pytest.mark.asyncio
+async def test_scheduler_fires_due_campaign(db, campaign):
+    """A leader rebuilt from the DB launches campaigns when they come due."""
+    campaign.status = CampaignStatus.SCHEDULED
+    campaign.scheduled_time = datetime.utcnow() + timedelta(milliseconds=200)
+    db.commit()
+
+    scheduler = CampaignScheduler()
+    scheduler.start()
+    try:
+        for _ in range(50):
+            await asyncio.sleep(0.05)
+            db.expire_all()
+            if db.get(type(campaign), campaign.id).status == CampaignStatus.ACTIVE:
+                break
+    finally:
+        await scheduler.stop()
+    assert db.get(type(campaign), campaign.id).status == CampaignStatus.ACTIVE
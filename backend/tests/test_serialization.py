@@ -0,0 +1,54 @@
+from typing import List
+
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.core.security import get_current_user
+from app.db.database import get_db, get_read_db
+from app.main import app
+from app.models.campaign import Contact
+from app.models.user import User
+from app.schemas.campaign import ContactResponse
+from app.utils.serialization import rows_response, schema_columns
+
+
+def _add_contacts(db, campaign, count):
+    db.add_all(
+        Contact(campaign_id=campaign.id, email=f"r{i}@example.com", name=f"Recruiter {i}", company="Acme")
+        for i in range(count)
+    )
+    db.commit()
+
+
+def test_rows_response_matches_pydantic_output(db, campaign):
+    """The orjson fast path renders exactly what the response_model would."""
+    _add_contacts(db, campaign, 3)
+    rows = db.execute(select(*schema_columns(ContactResponse, Contact))).all()
+    contacts = db.query(Contact).all()
+
+    expected = TypeAdapter(List[ContactResponse]).dump_json(
+        [ContactResponse.model_validate(contact) for contact in contacts]
+    )
+    assert rows_response(ContactResponse, rows).body == expected
+
+
+def test_large_contact_lists_are_gzipped(db, campaign):
+    """List responses above GZIP_MIN_SIZE are compressed for clients that accept it."""
+    _add_contacts(db, campaign, 50)
+    owner = db.get(User, campaign.user_id)
+    app.dependency_overrides[get_current_user] = lambda: owner
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_read_db] = lambda: db
+    try:
+        response = TestClient(app).get(
+            app.url_path_for("get_campaign_contacts", campaign_id=str(campaign.id)),
+            headers={"Accept-Encoding": "gzip"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(response.json()) == 50
+    assert "ETag" in response.headers
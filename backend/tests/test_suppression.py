@@ -0,0 +1,96 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.security import get_current_user
+from app.db.database import get_db
+from app.main import app
+from app.models.campaign import Campaign, CampaignStatus, Contact, EmailLog
+from app.models.suppression import Suppression
+from app.models.user import User
+from app.services.campaign_launcher import launch_campaign
+from app.services.provider_events import apply_provider_events
+from app.services.suppression import SuppressionIndex, add_suppressions, suppression_index, value_hash
+from app.utils.bloom import BloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Every added key is found; unrelated keys rarely are."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    bloom.update(f"member-{i}" for i in range(1000))
+
+    assert all(f"member-{i}" in bloom for i in range(1000))
+    assert sum(f"other-{i}" in bloom for i in range(10000)) < 300
+    assert not bloom.saturated
+
+
+def test_imports_and_launches_skip_suppressed_addresses(db, campaign):
+    """Suppressed addresses and domains are skipped on import, and launches suppress who they email."""
+    owner = db.get(User, campaign.user_id)
+    add_suppressions(db, owner.id, ["Blocked@Acme.com", "@spam.example"], "manual")
+    db.commit()
+    app.dependency_overrides[get_current_user] = lambda: owner
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        client = TestClient(app)
+        response = client.post(
+            app.url_path_for("import_campaign_contacts", campaign_id=str(campaign.id)),
+            json=[{"email": "blocked@acme.com"}, {"email": "hr@spam.example"}, {"email": "rita@acme.com"}],
+        )
+        assert response.json() == {"added": 1, "suppressed": ["blocked@acme.com", "hr@spam.example"]}
+        single = client.post(
+            app.url_path_for("add_contact_to_campaign", campaign_id=str(campaign.id)),
+            json={"email": "jobs@spam.example"},
+        )
+        assert single.status_code == 409
+    finally:
+        app.dependency_overrides.clear()
+
+    assert launch_campaign(db, campaign.id) == 1
+    # The same recruiter in a second campaign is not emailed again
+    second = Campaign(user_id=owner.id, name="Second", status=CampaignStatus.DRAFT)
+    db.add(second)
+    db.flush()
+    db.add_all([Contact(campaign_id=second.id, email="rita@acme.com"),
+                Contact(campaign_id=second.id, email="new@acme.com")])
+    db.commit()
+    assert launch_campaign(db, second.id) == 1
+    assert suppression_index.suppressed(db, owner.id, ["RITA@acme.com", "new@acme.com", "x@other.com"]) == {
+        "RITA@acme.com", "new@acme.com",
+    }
+
+
+def test_bounces_and_replies_suppress_the_recipient(db, campaign, email_log):
+    """Provider bounce events add the recipient to the sender's suppression list."""
+    email_log.sendgrid_message_id = "msg-9"
+    db.commit()
+    assert not suppression_index.suppressed(db, campaign.user_id, ["recruiter@example.com"])
+
+    apply_provider_events(db, [{
+        "event": "bounce", "email": "recruiter@example.com", "sg_message_id": "msg-9.filter1", "timestamp": 1700000000,
+    }])
+
+    assert suppression_index.suppressed(db, campaign.user_id, ["recruiter@example.com"]) == {"recruiter@example.com"}
+    assert db.query(EmailLog).one().status == "bounced"
+
+
+def test_clear_checks_skip_sql_until_refresh(db, campaign):
+    """Between refreshes a miss runs no SQL; other workers' entries appear after the next refresh."""
+    index = SuppressionIndex(capacity=1000, error_rate=0.01, max_users=10, overlap_seconds=300, refresh_seconds=3600)
+    statements = []
+    bind = db.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    user_id = campaign.user_id
+    assert not index.suppressed(db, user_id, ["a@acme.com"])
+
+    # Written by "another worker": straight to the table, bypassing this index
+    db.add(Suppression(user_id=user_id, kind="email", value_hash=value_hash("b@acme.com"), reason="bounce"))
+    db.commit()
+    event.listen(bind, "before_cursor_execute", listener)
+    try:
+        assert not index.suppressed(db, user_id, ["a@acme.com", "b@acme.com"])
+    finally:
+        event.remove(bind, "before_cursor_execute", listener)
+    assert statements == []
+
+    index.refresh_seconds = 0
+    assert index.suppressed(db, user_id, ["a@acme.com", "b@acme.com"]) == {"b@acme.com"}
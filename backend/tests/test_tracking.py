@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.main import app
+from app.services.tracking import TrackingBuffer, click_path, tracking_buffer
+
+
+def test_tracking_buffer_dedupes_hits():
+    """Repeated hits for one log keep only the first timestamp."""
+    buffer = TrackingBuffer(flush_interval_ms=1000, max_events=100)
+    log_id = uuid.uuid4()
+    first = datetime(2024, 1, 1, 12, 0, 0)
+    buffer.record_open(log_id, first)
+    buffer.record_open(log_id, first + timedelta(minutes=5))
+    buffer.record_click(log_id, first + timedelta(minutes=10))
+    assert buffer.pending == 1
+    assert buffer._opens[log_id] == first
+
+
+@pytest.mark.asyncio
+async def test_tracking_buffer_flushes_batched_updates(db, email_log):
+    """Flushing marks logs opened/clicked without overwriting the first open."""
+    buffer = TrackingBuffer(flush_interval_ms=1000, max_events=100)
+    opened = datetime(2024, 1, 1, 12, 0, 0)
+    buffer.record_click(email_log.id, opened)
+    buffer.record_open(uuid.uuid4(), opened)
+    assert await buffer.flush() == 2
+
+    buffer.record_open(email_log.id, opened + timedelta(hours=1))
+    await buffer.stop()
+
+    db.refresh(email_log)
+    assert email_log.is_opened and email_log.is_clicked
+    assert email_log.opened_at == opened
+    assert buffer.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_failing_flushes_back_off_and_cap_the_buffer():
+    """While writes fail, events are kept up to the cap, new ones are dropped and retries back off."""
+    def broken_session():
+        raise RuntimeError("database down")
+
+    buffer = TrackingBuffer(flush_interval_ms=100, max_events=2, max_pending=3, session_factory=broken_session)
+    dropped = lambda: REGISTRY.get_sample_value("referralflow_tracking_events_dropped_total", {"kind": "open"}) or 0
+    before = dropped()
+    ids = [uuid.uuid4() for _ in range(4)]
+    for log_id in ids:
+        buffer.record_open(log_id)
+    assert buffer.pending == 3 and dropped() == before + 1
+
+    assert await buffer.flush() == 0
+    first_retry = buffer._retry_at
+    assert await buffer.flush() == 0
+    assert buffer._retry_at > first_retry
+    buffer.record_open(uuid.uuid4())
+    assert buffer.pending == 3 and dropped() == before + 2
+
+
+def test_click_redirects_only_signed_links():
+    """Tracked links redirect to their signed URL; an edited URL or log id is refused."""
+    client = TestClient(app)
+    log_id, other = uuid.uuid4(), uuid.uuid4()
+    path = click_path(log_id, "https://acme.com/jobs?id=1")
+
+    response = client.get(path, follow_redirects=False)
+    assert response.status_code == 302
+    assert response.headers["location"] == "https://acme.com/jobs?id=1"
+    assert log_id in tracking_buffer._clicks
+
+    assert client.get(path.replace("acme.com", "evil.example"), follow_redirects=False).status_code == 400
+    assert client.get(path.replace(str(log_id), str(other)), follow_redirects=False).status_code == 400
+    unsigned = app.url_path_for("track_click", log_id=str(log_id))
+    assert client.get(unsigned, params={"url": "https://evil.example"}, follow_redirects=False).status_code == 400
+    assert other not in tracking_buffer._clicks
@@ -75,17 +75,13 @@ async function uploadFile(file) {
 
         const result = await response.json();
 
-        progressBar.style.width = '100%';
+        progressBar.style.width = '30%';
         statusText.innerText = 'Processing started!';
 
         showNotification('File uploaded successfully!', 'success');
         addActivity('Resume Uploaded', `${file.name} is being analyzed by AI.`, 'Just now');
 
-        // Hide status after delay
-        setTimeout(() => {
-            uploadStatus.classList.add('hidden');
-            progressBar.style.width = '0%';
-        }, 3000);
+        watchJob(result.job_id, file.name);
 
     } catch (error) {
         console.error('Error:', error);
@@ -94,6 +90,50 @@ async function uploadFile(file) {
     }
 }
 
+const STAGE_PROGRESS = {
+    queued: ['Waiting in queue...', 30],
+    extracting: ['Extracting skills with AI...', 45],
+    searching: ['Searching for matching jobs...', 60],
+    drafting: ['Drafting applications...', 75],
+    sending: ['Sending applications...', 90],
+    done: ['All done!', 100],
+    failed: ['Processing failed.', 100]
+};
+
+function hideUploadStatus() {
+    setTimeout(() => {
+        uploadStatus.classList.add('hidden');
+        progressBar.style.width = '0%';
+    }, 3000);
+}
+
+// Follow the pipeline job's stages over server-sent events
+function watchJob(jobId, fileName) {
+    if (!jobId || !window.EventSource) {
+        hideUploadStatus();
+        return;
+    }
+
+    const source = new EventSource(`${API_BASE}/orchestrator/jobs/${jobId}/events`);
+    source.addEventListener('stage', (event) => {
+        const job = JSON.parse(event.data);
+        const [label, width] = STAGE_PROGRESS[job.stage] || [job.stage, 50];
+        statusText.innerText = label;
+        progressBar.style.width = `${width}%`;
+
+        if (job.stage === 'done') {
+            source.close();
+            const { sent = 0, jobs = 0 } = job.detail || {};
+            addActivity('Applications Sent', `${fileName}: ${sent} of ${jobs} applications sent.`, 'Just now');
+            hideUploadStatus();
+        } else if (job.stage === 'failed') {
+            source.close();
+            showNotification(job.error || 'Processing failed', 'error');
+            hideUploadStatus();
+        }
+    });
+}
+
 function addActivity(title, desc, time) {
     const item = document.createElement('div');
     item.className = 'activity-item';